@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Run the benchmark suite; extra arguments are passed through (e.g. --pages 1000 --output bench.json)
+PYTHONPATH=src python3 -m benchmarks.suite "$@"
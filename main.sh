@@ -1,6 +1,2 @@
-# Generate the site
-python3 src/main.py
-
-# Serve it
-cd docs && python3 -m http.server 8888
-
+# Generate the site, serve it at http://localhost:8888 and rebuild on change
+python3 src/main.py --watch --port 8888
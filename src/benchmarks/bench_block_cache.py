@@ -0,0 +1,62 @@
+"""Benchmark: full builds with and without the block cache.
+
+Builds a synthetic site in which a share of the blocks are boilerplate
+repeated across pages, once without a cache, once with a cold on-disk cache
+and once more with the warm cache left by the previous build.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_block_cache [--pages N] [--shared P]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import CorpusConfig, write_corpus
+from block_cache import BlockCache
+from file_operations import generate_pages_recursive
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare builds with and without the block cache.")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--shared", type=float, default=0.3, help="share of boilerplate blocks")
+    parser.add_argument("--maxsize", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    config = CorpusConfig(pages=args.pages, shared_density=args.shared)
+    with tempfile.TemporaryDirectory() as root:
+        content, template = write_corpus(root, config)
+        cache_path = os.path.join(root, "block_cache.json")
+        runs = [
+            ("no cache", lambda: None),
+            ("cold cache", lambda: BlockCache.load(cache_path, args.maxsize)),
+            ("warm cache", lambda: BlockCache.load(cache_path, args.maxsize)),
+        ]
+
+        print(f"{args.pages} pages, {args.shared:.0%} shared blocks")
+        for name, make_cache in runs:
+            cache = make_cache()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages_recursive(content, template, os.path.join(root, "docs"), cache=cache)
+            elapsed = time.perf_counter() - start
+            line = f"{name:<11} {elapsed * 1e3:9.1f} ms"
+            if cache is not None:
+                cache.save()
+                stats = cache.stats()
+                line += (
+                    f"  hits {stats['hits']:,} ({stats['disk_hits']:,} from disk)"
+                    f"  misses {stats['misses']:,}  hit rate {stats['hit_rate']:.1%}"
+                )
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
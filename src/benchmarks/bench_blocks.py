@@ -0,0 +1,79 @@
+"""Benchmark: block classification and conversion on list-heavy documents.
+
+Generates pages made only of long ordered and unordered lists and times the
+single-pass :func:`block_markdown.classify_block` against the previous
+classifier, which split each block and then ran one ``all(...)`` scan per
+line-based type (building an f-string per line for ordered lists). Full
+markdown-to-HTML conversion is timed as well, since the handlers now reuse
+the classifier's lines instead of splitting the block again.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_blocks [--items N] [--pages N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.corpus import CorpusConfig, generate_markdown
+from block_markdown import BlockType, classify_block, markdown_to_blocks, markdown_to_html_node
+
+
+def _three_scan_block_type(block: str) -> BlockType:
+    """The classifier this benchmark is measured against (headings and code omitted)."""
+    lines = block.split("\n")
+    if all(line.startswith(">") for line in lines):
+        return BlockType.QUOTE
+    if all(line.startswith("- ") for line in lines):
+        return BlockType.UNORDERED_LIST
+    if all(line.startswith(f"{i}. ") for i, line in enumerate(lines, start=1)):
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Time block classification on list-heavy pages.")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--items", type=int, default=5000, help="maximum items per list")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    config = CorpusConfig(
+        pages=args.pages,
+        blocks_per_page=4,
+        block_mix={"unordered_list": 1, "ordered_list": 1},
+        words_per_block=16,
+        max_list_items=args.items,
+    )
+    documents = [generate_markdown(config, index) for index in range(config.pages)]
+    blocks = [block for doc in documents for block in markdown_to_blocks(doc)]
+    items = sum(block.count("\n") + 1 for block in blocks)
+
+    three_scan = [_three_scan_block_type(block) for block in blocks]
+    single_pass = [classify_block(block)[0] for block in blocks]
+    # Headings classify the same way in both; everything else must agree.
+    assert all(a == b or b == BlockType.HEADING for a, b in zip(three_scan, single_pass))
+
+    print(f"{len(documents)} pages, {len(blocks)} blocks, {items:,} lines, best of {args.repeat}")
+    timings = {
+        "three-scan classify": lambda: [_three_scan_block_type(block) for block in blocks],
+        "single-pass classify": lambda: [classify_block(block) for block in blocks],
+        "markdown_to_html_node": lambda: [markdown_to_html_node(doc) for doc in documents],
+    }
+    for name, fn in timings.items():
+        print(f"{name:<22} {_best(fn, args.repeat) * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
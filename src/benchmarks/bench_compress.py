@@ -0,0 +1,65 @@
+"""Benchmark: precompressing a built site, cold and after a one-page edit.
+
+Builds the synthetic corpus, then times :func:`compression.compress_directory`
+three times: from scratch in-process, from scratch across a process pool,
+and again after a single page changed (which should only compress that
+page). The ratio of each available encoding is printed with the cold run.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_compress [--pages N] [--jobs N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+
+from benchmarks.corpus import CorpusConfig, page_path, write_corpus
+from build import generate_pages_parallel
+from compression import available_encodings, compress_directory, is_compressed_variant
+
+
+def _remove_variants(root: str) -> None:
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if is_compressed_variant(name):
+                os.remove(os.path.join(dirpath, name))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Time precompression of a built site.")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    config = CorpusConfig(pages=args.pages)
+    with tempfile.TemporaryDirectory() as root:
+        content, template = write_corpus(root, config)
+        docs = os.path.join(root, "docs")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_parallel(content, template, docs, jobs=args.jobs)
+        shutil.copy(template, os.path.join(docs, "index.css"))
+
+        print(f"{config.pages} pages, encodings: {', '.join(available_encodings())}")
+        cold = compress_directory(docs)
+        print(f"{'cold, 1 process':<20}{cold.seconds:8.2f} s  ({cold.report()})")
+        _remove_variants(docs)
+        pooled = compress_directory(docs, jobs=args.jobs)
+        print(f"{f'cold, {args.jobs} processes':<20}{pooled.seconds:8.2f} s")
+
+        edited = os.path.join(content, page_path(config, 0))
+        with open(edited, "a", encoding="utf-8") as f:
+            f.write("\n\nOne more paragraph.\n")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_parallel(content, template, docs, jobs=args.jobs)
+        warm = compress_directory(docs, jobs=args.jobs)
+        print(f"{'after one edit':<20}{warm.seconds:8.2f} s  ({len(warm.written)} variants written)")
+
+
+if __name__ == "__main__":
+    main()
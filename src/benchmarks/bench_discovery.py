@@ -0,0 +1,68 @@
+"""Benchmark: directory discovery with os.scandir vs listdir + isfile/isdir.
+
+Creates a tree of empty files and times the single-scan
+:meth:`discovery.Discovery.scan` against the recursive ``os.listdir`` walk
+with ``os.path.isfile`` / ``os.path.isdir`` per entry that the page generator
+and asset copier used before.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_discovery [--files N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from discovery import Discovery
+
+
+def legacy_walk(root: str) -> list[str]:
+    """The previous walk: listdir, then a stat per entry to classify it."""
+    files = []
+    for item in os.listdir(root):
+        path = os.path.join(root, item)
+        if os.path.isfile(path):
+            files.append(path)
+        elif os.path.isdir(path):
+            files.extend(legacy_walk(path))
+    return files
+
+
+def make_tree(root: str, files: int, per_dir: int) -> None:
+    for index in range(files):
+        directory = os.path.join(root, f"d{index // per_dir // per_dir}", f"d{index // per_dir}")
+        if index % per_dir == 0:
+            os.makedirs(directory, exist_ok=True)
+        open(os.path.join(directory, f"page{index}.md"), "w").close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare scandir discovery with the listdir walk.")
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--per-dir", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, args.files, args.per_dir)
+        walks = {
+            "listdir + isfile/isdir": lambda: legacy_walk(root),
+            "scandir (Discovery.scan)": lambda: Discovery().scan(root),
+            "scandir, symlinks skipped": lambda: Discovery(symlinks="skip").scan(root),
+        }
+        print(f"{args.files:,} files, best of {args.repeat}")
+        for name, walk in walks.items():
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                walk()
+                best = min(best, time.perf_counter() - start)
+            print(f"{name:<27} {best * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
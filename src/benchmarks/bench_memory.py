@@ -0,0 +1,131 @@
+"""Memory benchmark: slotted vs ``__dict__``-backed node classes.
+
+Each variant runs in a fresh interpreter so peak RSS is not shared. The
+``dict`` variant swaps in trivial subclasses of the node classes that do not
+declare ``__slots__`` (and therefore carry a per-instance ``__dict__``),
+which reproduces the memory layout from before the nodes were slotted.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_memory [--pages N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.corpus import CorpusConfig, generate_markdown, write_corpus
+
+VARIANTS = ("dict", "slots")
+
+
+def _install_dict_nodes() -> None:
+    """Replace the node classes used by the pipeline with dict-backed subclasses."""
+    import block_markdown
+    import htmlnode
+    import inline_markdown
+    import textnode
+
+    class DictTextNode(textnode.TextNode):
+        pass
+
+    class DictLeafNode(htmlnode.LeafNode):
+        pass
+
+    class DictParentNode(htmlnode.ParentNode):
+        pass
+
+    inline_markdown.TextNode = DictTextNode
+    htmlnode.LeafNode = DictLeafNode
+    block_markdown.LeafNode = DictLeafNode
+    block_markdown.ParentNode = DictParentNode
+
+
+def _instance_bytes(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def run_variant(variant: str, pages: int) -> dict:
+    """Measure one variant in the current process and return the results."""
+    if variant == "dict":
+        _install_dict_nodes()
+
+    import block_markdown
+    import inline_markdown
+    from file_operations import generate_pages_recursive
+
+    sample_text = inline_markdown.text_to_textnodes("plain **bold** [link](/x)")
+    sample_tree = block_markdown.markdown_to_html_node("# Title\n\nplain **bold**")
+
+    # Blocks held by the node tree of one large page, measured while it is alive.
+    big_page = generate_markdown(CorpusConfig(blocks_per_page=2000), 0)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tree = block_markdown.markdown_to_html_node(big_page)
+    after = tracemalloc.take_snapshot()
+    _, tree_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    tree_blocks = sum(stat.count_diff for stat in diff)
+    tree_bytes = sum(stat.size_diff for stat in diff)
+    del tree
+
+    with tempfile.TemporaryDirectory() as root:
+        content, template = write_corpus(root, CorpusConfig(pages=pages))
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(content, template, os.path.join(root, "docs"))
+        max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "variant": variant,
+        "pages": pages,
+        "textnode_bytes": _instance_bytes(sample_text[0]),
+        "leafnode_bytes": _instance_bytes(sample_tree.children[1].children[0]),
+        "tree_alloc_blocks": tree_blocks,
+        "tree_alloc_bytes": tree_bytes,
+        "tree_peak_bytes": tree_peak,
+        "build_peak_rss_kb": max_rss_kb,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000, help="pages in the synthetic site")
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.pages)))
+        return
+
+    results = []
+    for variant in VARIANTS:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_memory", "--variant", variant, "--pages", str(args.pages)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results.append(json.loads(proc.stdout))
+
+    keys = [key for key in results[0] if key not in ("variant", "pages")]
+    print(f"{args.pages} pages")
+    print(f"{'metric':<22}" + "".join(f"{r['variant']:>14}" for r in results))
+    for key in keys:
+        print(f"{key:<22}" + "".join(f"{r[key]:>14,}" for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: sequential vs pipelined page rendering.
+
+Renders the same synthetic site with :func:`build.render_pages` and with
+:func:`build.render_pages_pipelined`, in-process and across worker processes.
+The gain depends on I/O latency, so it is largest on network filesystems and
+cold caches; on a warm local disk the two modes are close.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_pipeline [--pages N] [--jobs N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import CorpusConfig, write_corpus
+from build import find_pages, render_pages
+from page_template import CompiledTemplate
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare sequential and pipelined rendering.")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        content, template_path = write_corpus(root, CorpusConfig(pages=args.pages))
+        template = CompiledTemplate.load(template_path)
+        pages = find_pages(content, os.path.join(root, "docs"))
+
+        print(f"{args.pages} pages, best of {args.repeat}")
+        for jobs in sorted({1, args.jobs}):
+            for pipeline in (False, True):
+                best = float("inf")
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        render_pages(pages, template, jobs, pipeline=pipeline)
+                    best = min(best, time.perf_counter() - start)
+                mode = "pipelined" if pipeline else "sequential"
+                print(f"jobs={jobs:<3} {mode:<11} {best * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Microbenchmark: iterative vs recursive ParentNode rendering.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_render
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from htmlnode import LeafNode, ParentNode
+
+
+def wide_tree(width: int) -> ParentNode:
+    """A ``<div>`` of *width* paragraphs, each with a few inline leaves."""
+    return ParentNode(
+        "div",
+        [
+            ParentNode("p", [LeafNode(None, "Some text "), LeafNode("b", "bold"), LeafNode("a", "x", {"href": "/y"})])
+            for _ in range(width)
+        ],
+    )
+
+
+def deep_tree(depth: int) -> ParentNode:
+    """A chain of *depth* nested ``<div>`` elements around one leaf."""
+    node = ParentNode("span", [LeafNode(None, "leaf")])
+    for _ in range(depth):
+        node = ParentNode("div", [node])
+    return node
+
+
+def render_iterative(node: ParentNode) -> str:
+    return node.to_html()
+
+
+def render_recursive(node: ParentNode) -> str:
+    buffer: list[str] = []
+    node._render_recursive(buffer.append)
+    return "".join(buffer)
+
+
+def bench(label: str, node: ParentNode, number: int) -> None:
+    results = {}
+    for name, fn in (("recursive", render_recursive), ("iterative", render_iterative)):
+        try:
+            seconds = min(timeit.repeat(lambda: fn(node), number=number, repeat=3)) / number
+        except RecursionError:
+            results[name] = None
+            continue
+        results[name] = seconds
+    cells = [
+        f"{name}={seconds * 1e3:8.3f} ms" if seconds is not None else f"{name}=RecursionError"
+        for name, seconds in results.items()
+    ]
+    print(f"{label:<22} " + "  ".join(cells))
+
+
+def main() -> None:
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+    bench("wide (10k children)", wide_tree(10_000), 20)
+    bench("deep (500 levels)", deep_tree(500), 200)
+    bench("deep (100k levels)", deep_tree(100_000), 3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: peak memory of whole-file vs streamed rendering of a huge page.
+
+Writes one large changelog-style page and renders it in a fresh process,
+once read and parsed whole (:func:`file_operations.stream_page`) and once
+block by block (:func:`file_operations.stream_page_file`), reporting the
+wall time and the peak resident set size of each. Unix only (uses
+:mod:`resource`).
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_stream [--megabytes N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.corpus import DEFAULT_TEMPLATE, CorpusConfig, generate_markdown
+from file_operations import stream_page, stream_page_file
+from page_template import CompiledTemplate
+
+
+def _write_page(path: str, megabytes: int) -> None:
+    """Write a page of roughly *megabytes* MB, built from corpus pages."""
+    config = CorpusConfig(blocks_per_page=200)
+    target = megabytes * 1024 * 1024
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Changelog\n\n")
+        index = 0
+        while written < target:
+            # Demote each page title so the document keeps a single h1.
+            chunk = "#" + generate_markdown(config, index) + "\n"
+            written += f.write(chunk)
+            index += 1
+
+
+def _render(mode: str, src_path: str, dest_path: str) -> tuple[float, int]:
+    template = CompiledTemplate(DEFAULT_TEMPLATE)
+    start = time.perf_counter()
+    if mode == "whole":
+        with open(src_path, "r", encoding="utf-8") as f:
+            stream_page(f.read(), template, dest_path)
+    else:
+        stream_page_file(src_path, template, dest_path)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return elapsed, peak if sys.platform == "darwin" else peak * 1024
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare peak memory of whole and streamed rendering.")
+    parser.add_argument("--megabytes", type=int, default=20, help="size of the generated page")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        src_path = os.path.join(root, "changelog.md")
+        _write_page(src_path, args.megabytes)
+        size = os.path.getsize(src_path)
+        print(f"page of {size / 1e6:.1f} MB")
+        for mode in ("whole", "streamed"):
+            # A fresh process per mode, so each peak is measured on its own.
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                elapsed, peak = executor.submit(
+                    _render, mode, src_path, os.path.join(root, f"{mode}.html")
+                ).result()
+            print(f"{mode:<9} {elapsed:8.2f} s  peak RSS {peak / 1e6:9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
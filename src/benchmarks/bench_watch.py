@@ -0,0 +1,81 @@
+"""Benchmark: edit-to-served latency of watch mode on a large corpus.
+
+Builds a synthetic site, starts the watcher and the development server
+in-process, then repeatedly edits one page and measures the time until the
+server returns the new content.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.bench_watch [--pages N] [--edits N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmarks.corpus import CorpusConfig, page_path, write_corpus
+from build import generate_pages_parallel
+from watch import SiteWatcher, start_server
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure watch-mode edit-to-served latency.")
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=0.05, help="watcher poll interval (s)")
+    parser.add_argument("--port", type=int, default=8899)
+    args = parser.parse_args(argv)
+
+    config = CorpusConfig(pages=args.pages)
+    with tempfile.TemporaryDirectory() as root:
+        content, template = write_corpus(root, config)
+        static = os.path.join(root, "static")
+        docs = os.path.join(root, "docs")
+        os.makedirs(static)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_parallel(content, template, docs, jobs=os.cpu_count())
+
+        watcher = SiteWatcher(content, static, template, docs)
+        server = start_server(docs, args.port, "127.0.0.1")
+        stop = threading.Event()
+        thread = threading.Thread(target=watcher.run, args=(args.interval, stop), daemon=True)
+
+        rel = page_path(config, args.pages // 2)
+        source = os.path.join(content, rel)
+        url = f"http://127.0.0.1:{args.port}/" + os.path.dirname(rel).replace(os.sep, "/") + "/index.html"
+        latencies = []
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                thread.start()
+                for edit in range(args.edits):
+                    marker = f"edit-marker-{edit}"
+                    with open(source, "a", encoding="utf-8") as f:
+                        f.write(f"\n{marker}\n")
+                    start = time.perf_counter()
+                    while True:
+                        with urllib.request.urlopen(url) as response:
+                            if marker.encode() in response.read():
+                                break
+                        time.sleep(0.002)
+                    latencies.append(time.perf_counter() - start)
+                stop.set()
+                thread.join()
+        finally:
+            stop.set()
+            server.shutdown()
+
+    print(f"{args.pages} pages, poll interval {args.interval * 1e3:.0f} ms, {args.edits} edits")
+    print(f"edit-to-served latency: median {statistics.median(latencies) * 1e3:.1f} ms, "
+          f"max {max(latencies) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
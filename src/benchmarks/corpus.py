@@ -0,0 +1,175 @@
+"""Deterministic synthetic markdown corpus for benchmarks.
+
+The same :class:`CorpusConfig` (including its seed) always produces the same
+pages byte for byte, so timings are comparable between runs and releases.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+
+BLOCK_KINDS = ("heading", "paragraph", "unordered_list", "ordered_list", "quote", "code")
+
+DEFAULT_BLOCK_MIX = {
+    "heading": 2,
+    "paragraph": 5,
+    "unordered_list": 2,
+    "ordered_list": 1,
+    "quote": 1,
+    "code": 1,
+}
+
+DEFAULT_TEMPLATE = (
+    "<!doctype html>\n<html>\n  <head>\n    <title>{{ Title }}</title>\n"
+    '    <link href="/index.css" rel="stylesheet" />\n  </head>\n'
+    "  <body>\n    <article>{{ Content }}</article>\n  </body>\n</html>\n"
+)
+
+_WORDS = (
+    "elf hobbit wizard ring shire mountain river forest tower sword king queen "
+    "road journey song star shadow light fire stone horse bridge gate hall"
+).split()
+
+
+class CorpusConfig:
+    """Parameters for a synthetic site.
+
+    Args:
+        pages: Number of markdown pages.
+        blocks_per_page: Number of blocks after the title heading.
+        depth: Directory nesting depth of each page below ``content/``.
+        fanout: Number of subdirectories per directory level.
+        block_mix: Relative weight of each kind in :data:`BLOCK_KINDS`.
+        words_per_block: Approximate words in a paragraph or list item.
+        inline_density: Probability that a word is bold, italic or code.
+        link_density: Probability that a word is replaced by a link.
+        image_density: Probability that a word is replaced by an image.
+        shared_density: Probability that a block is boilerplate drawn from a
+            small site-wide pool (disclaimers, repeated snippets) instead of
+            being generated for the page.
+        shared_pool: Number of distinct boilerplate blocks in that pool.
+        max_list_items: Upper bound on the items in a list block (at least 2).
+        seed: Random seed.
+    """
+
+    def __init__(
+        self,
+        pages: int = 200,
+        blocks_per_page: int = 20,
+        depth: int = 2,
+        fanout: int = 8,
+        block_mix: dict[str, int] | None = None,
+        words_per_block: int = 40,
+        inline_density: float = 0.1,
+        link_density: float = 0.02,
+        image_density: float = 0.01,
+        shared_density: float = 0.0,
+        shared_pool: int = 20,
+        max_list_items: int = 8,
+        seed: int = 0,
+    ) -> None:
+        self.pages = pages
+        self.blocks_per_page = blocks_per_page
+        self.depth = depth
+        self.fanout = fanout
+        self.block_mix = dict(block_mix or DEFAULT_BLOCK_MIX)
+        self.words_per_block = words_per_block
+        self.inline_density = inline_density
+        self.link_density = link_density
+        self.image_density = image_density
+        self.shared_density = shared_density
+        self.shared_pool = shared_pool
+        self.max_list_items = max_list_items
+        self.seed = seed
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def _inline_text(rng: random.Random, config: CorpusConfig, words: int) -> str:
+    parts = []
+    for _ in range(words):
+        word = rng.choice(_WORDS)
+        roll = rng.random()
+        if roll < config.image_density:
+            parts.append(f"![{word} picture](/images/{word}.png)")
+        elif roll < config.image_density + config.link_density:
+            parts.append(f"[{word}](/{rng.choice(_WORDS)}/{word})")
+        elif roll < config.image_density + config.link_density + config.inline_density:
+            style = rng.randrange(3)
+            parts.append(("**{}**", "_{}_", "`{}`")[style].format(word))
+        else:
+            parts.append(word)
+    return " ".join(parts)
+
+
+def _block(rng: random.Random, config: CorpusConfig, kind: str) -> str:
+    words = config.words_per_block
+    if kind == "heading":
+        return "#" * rng.randint(2, 6) + " " + _inline_text(rng, config, 4)
+    if kind == "paragraph":
+        lines = [_inline_text(rng, config, max(1, words // 3)) for _ in range(3)]
+        return "\n".join(lines)
+    if kind == "unordered_list":
+        items = rng.randint(2, config.max_list_items)
+        return "\n".join(f"- {_inline_text(rng, config, max(1, words // 4))}" for _ in range(items))
+    if kind == "ordered_list":
+        items = rng.randint(2, config.max_list_items)
+        return "\n".join(f"{i}. {_inline_text(rng, config, max(1, words // 4))}" for i in range(1, items + 1))
+    if kind == "quote":
+        return "\n".join(f"> {_inline_text(rng, config, max(1, words // 4))}" for _ in range(rng.randint(1, 4)))
+    if kind == "code":
+        lines = [f"    {rng.choice(_WORDS)} = {rng.randint(0, 999)}" for _ in range(rng.randint(2, 10))]
+        return "```\n" + "\n".join(lines) + "\n```"
+    raise ValueError(f"Unknown block kind: {kind}")
+
+
+def shared_block(config: CorpusConfig, number: int) -> str:
+    """Return boilerplate block *number* of the site-wide shared pool."""
+    rng = random.Random(f"{config.seed}:shared:{number}")
+    return _block(rng, config, BLOCK_KINDS[1 + number % (len(BLOCK_KINDS) - 1)])
+
+
+def generate_markdown(config: CorpusConfig, index: int) -> str:
+    """Return the markdown of page *index*; independent of other pages."""
+    rng = random.Random(f"{config.seed}:{index}")
+    kinds = [kind for kind in BLOCK_KINDS if config.block_mix.get(kind, 0) > 0]
+    weights = [config.block_mix[kind] for kind in kinds]
+    blocks = [f"# Page {index}: {_inline_text(rng, config, 3)}"]
+    for kind in rng.choices(kinds, weights, k=config.blocks_per_page):
+        # Only consult the RNG when sharing is on, so existing corpora are unchanged.
+        if config.shared_density and rng.random() < config.shared_density:
+            blocks.append(shared_block(config, rng.randrange(config.shared_pool)))
+        else:
+            blocks.append(_block(rng, config, kind))
+    return "\n\n".join(blocks) + "\n"
+
+
+def page_path(config: CorpusConfig, index: int) -> str:
+    """Return the path of page *index* relative to the content root."""
+    parts = []
+    n = index
+    for level in range(config.depth):
+        parts.append(f"d{level}-{n % config.fanout}")
+        n //= config.fanout
+    parts.append(f"page{index}")
+    return os.path.join(*parts, "index.md")
+
+
+def write_corpus(root: str, config: CorpusConfig) -> tuple[str, str]:
+    """Write the corpus under *root*.
+
+    Returns:
+        ``(content_dir, template_path)``.
+    """
+    content = os.path.join(root, "content")
+    for index in range(config.pages):
+        path = os.path.join(content, page_path(config, index))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(generate_markdown(config, index))
+    template = os.path.join(root, "template.html")
+    with open(template, "w", encoding="utf-8") as f:
+        f.write(DEFAULT_TEMPLATE)
+    return content, template
@@ -0,0 +1,124 @@
+"""Build benchmark suite with JSON output.
+
+Times each stage of the pipeline on a deterministic synthetic corpus (see
+:mod:`benchmarks.corpus`) plus a full ``generate_pages_recursive`` run, and
+writes the results as JSON so regressions can be tracked between releases.
+
+Run from the repository root::
+
+    PYTHONPATH=src python3 -m benchmarks.suite [--pages N] [--output results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.corpus import CorpusConfig, generate_markdown, write_corpus
+from block_markdown import block_to_block_type, markdown_to_blocks, markdown_to_html_node
+from file_operations import generate_pages_recursive
+from inline_markdown import text_to_textnodes
+
+SCHEMA_VERSION = 1
+
+
+def _time(fn: Callable[[], object], repeat: int) -> dict:
+    """Run *fn* *repeat* times and summarise the wall-clock durations."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "max_s": max(samples),
+    }
+
+
+def run_suite(config: CorpusConfig, repeat: int = 5) -> dict:
+    """Run every benchmark for *config* and return the JSON-ready results."""
+    documents = [generate_markdown(config, index) for index in range(config.pages)]
+    blocks = [block for doc in documents for block in markdown_to_blocks(doc)]
+    typed_blocks = [(block, block_to_block_type(block)) for block in blocks]
+    inline_texts = [
+        " ".join(block.split("\n"))
+        for block, block_type in typed_blocks
+        if block_type.value == "paragraph"
+    ]
+    trees = [markdown_to_html_node(doc) for doc in documents]
+
+    benchmarks = {
+        "markdown_to_blocks": lambda: [markdown_to_blocks(doc) for doc in documents],
+        "block_to_block_type": lambda: [block_to_block_type(block) for block in blocks],
+        "text_to_textnodes": lambda: [text_to_textnodes(text) for text in inline_texts],
+        "markdown_to_html_node": lambda: [markdown_to_html_node(doc) for doc in documents],
+        "to_html": lambda: [tree.to_html() for tree in trees],
+    }
+    results = {}
+    for name, fn in benchmarks.items():
+        results[name] = _time(fn, repeat)
+
+    with tempfile.TemporaryDirectory() as root:
+        content, template = write_corpus(root, config)
+        dest = os.path.join(root, "docs")
+
+        def full_build() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages_recursive(content, template, dest)
+
+        results["generate_pages_recursive"] = _time(full_build, max(1, repeat // 2))
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            **config.to_dict(),
+            "bytes": sum(len(doc.encode("utf-8")) for doc in documents),
+            "blocks": len(blocks),
+            "inline_texts": len(inline_texts),
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the build benchmark suite.")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--blocks-per-page", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    config = CorpusConfig(
+        pages=args.pages,
+        blocks_per_page=args.blocks_per_page,
+        depth=args.depth,
+        seed=args.seed,
+    )
+    report = run_suite(config, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        for name, result in report["results"].items():
+            print(f"{name:<26} {result['median_s'] * 1e3:10.2f} ms", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Memoisation of rendered markdown blocks, shared across the pages of a build.
+
+Sites repeat whole blocks (disclaimers, footers, code snippets) on many pages.
+:class:`BlockCache` maps ``(block text, BlockType)`` to the block's rendered
+HTML so each distinct block is parsed and rendered once per build. Each entry
+also keeps the text of the leaves the HTML was rendered from, which the search
+index reads instead of the HTML. Neither depends on the page or the basepath
+(that is applied by the template), so they can also be kept on disk between
+builds::
+
+    {
+        "version": 3,
+        "build": 12,
+        "blocks": {"<sha256 of type and text>": ["<p>rendered html</p>", "rendered html", 12], …}
+    }
+
+Each stored block carries the number of the last build that used it. Saving
+keeps the blocks of earlier builds too, so incremental and watch builds, which
+skip unchanged pages, do not drop those pages' blocks. Once the store holds
+more than its size limit, the blocks unused for the most builds go first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import os
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from collector import Collector
+
+if TYPE_CHECKING:
+    from block_markdown import BlockType
+
+CACHE_VERSION = 3
+
+# Blocks kept in the on-disk store by default.
+STORE_SIZE = 50_000
+
+# (rendered HTML, leaf text) of one block.
+CachedBlock = tuple[str, str]
+
+# (rendered HTML, leaf text, number of the last build that used it).
+StoredBlock = tuple[str, str, int]
+
+
+def _digest(type_value: str, block: str) -> str:
+    return hashlib.sha256(f"{type_value}\0{block}".encode("utf-8")).hexdigest()
+
+
+class BlockCache(Collector):
+    """Bounded LRU of rendered blocks with an optional on-disk store.
+
+    Args:
+        maxsize: Maximum number of blocks held in memory.
+        path: Location of the on-disk store, or None for an in-memory cache.
+        stored: Blocks read from *path*, keyed by digest (see :meth:`load`).
+        build: Number of the build that saved *stored*.
+        store_size: Maximum number of blocks kept in the on-disk store.
+
+    Attributes:
+        hits: Lookups answered from memory or from the on-disk store.
+        misses: Lookups that required the block to be rendered.
+        disk_hits: The subset of :attr:`hits` answered from the on-disk store.
+
+    Worker processes drain their copy after each chunk; the in-memory
+    entries are kept, only the counters and used blocks are reset.
+    """
+
+    _drained = {"hits": int, "misses": int, "disk_hits": int, "_used": OrderedDict}
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        path: str | None = None,
+        stored: dict[str, StoredBlock] | None = None,
+        build: int = 0,
+        store_size: int = STORE_SIZE,
+    ) -> None:
+        if maxsize < 1 or store_size < 1:
+            raise ValueError("maxsize and store_size must be at least 1")
+        self.maxsize = maxsize
+        self.path = path
+        self.build = build
+        self.store_size = store_size
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries: OrderedDict[tuple[str, str], CachedBlock] = OrderedDict()
+        self._stored = stored if stored is not None else {}
+        # Blocks looked up or added during this build, least recently used
+        # first; save() stamps them with this build's number.
+        self._used: OrderedDict[str, CachedBlock] = OrderedDict()
+
+    @classmethod
+    def load(cls, path: str, maxsize: int = 4096, store_size: int = STORE_SIZE) -> BlockCache:
+        """Open the on-disk store at *path*.
+
+        A missing, unreadable or out-of-date store yields an empty cache.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(maxsize, path, store_size=store_size)
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return cls(maxsize, path, store_size=store_size)
+        try:
+            stored = {
+                digest: (html, text, int(build))
+                for digest, (html, text, build) in data.get("blocks", {}).items()
+            }
+            build = int(data.get("build", 0))
+        except (AttributeError, TypeError, ValueError):
+            return cls(maxsize, path, store_size=store_size)
+        return cls(maxsize, path, stored, build, store_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, block: str, block_type: BlockType) -> CachedBlock | None:
+        """Return the cached ``(html, text)`` of *block*, or None if it must be rendered."""
+        key = (block_type.value, block)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if self._stored:
+            digest = _digest(*key)
+            stored = self._stored.get(digest)
+            if stored is not None:
+                entry = stored[:2]
+                self._insert(key, entry)
+                self._mark_used(digest, entry)
+                self.hits += 1
+                self.disk_hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def put(self, block: str, block_type: BlockType, html: str, text: str = "") -> None:
+        """Remember the rendered *html* of *block* and the *text* of its leaves."""
+        key = (block_type.value, block)
+        entry = (html, text)
+        self._insert(key, entry)
+        if self.path is not None:
+            self._mark_used(_digest(*key), entry)
+
+    def _mark_used(self, digest: str, entry: CachedBlock) -> None:
+        self._used[digest] = entry
+        self._used.move_to_end(digest)
+        if len(self._used) > self.store_size:
+            self._used.popitem(last=False)
+
+    def _insert(self, key: tuple[str, str], entry: CachedBlock) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def _merge(self, name: str, value: Any) -> None:
+        if name == "_used":
+            for digest, entry in value.items():
+                self._mark_used(digest, entry)
+        else:
+            super()._merge(name, value)
+
+    def save(self) -> None:
+        """Atomically write the store to :attr:`path` as the next build's.
+
+        The blocks used by this build are stamped with its number and join
+        those already stored; beyond :attr:`store_size` blocks, the ones
+        least recently used are dropped.
+        """
+        if self.path is None:
+            return
+        build = self.build + 1
+        blocks = {digest: list(stored) for digest, stored in self._stored.items() if digest not in self._used}
+        blocks.update((digest, [*entry, build]) for digest, entry in self._used.items())
+        if len(blocks) > self.store_size:
+            kept = heapq.nlargest(self.store_size, blocks, key=lambda digest: blocks[digest][2])
+            blocks = {digest: blocks[digest] for digest in kept}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "build": build, "blocks": blocks}, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def __repr__(self) -> str:
+        return (
+            f"BlockCache(size={len(self._entries)}, maxsize={self.maxsize}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import itertools
 from enum import Enum
+from time import perf_counter
+from typing import TYPE_CHECKING, Iterable, Iterator
 
-from htmlnode import LeafNode, ParentNode, text_node_to_html_node
+from htmlnode import LeafNode, ParentNode, RawHTMLNode, node_text, text_node_to_html_node
 from inline_markdown import text_to_textnodes
 from textnode import TextNode, TextType
 
+if TYPE_CHECKING:
+    from block_cache import BlockCache
+    from htmlnode import HTMLNode
+    from profiling import PageProfile
+
 
 # ---------------------------------------------------------------------------
 # Block type enum
@@ -28,11 +36,192 @@ class BlockType(Enum):
 # Block splitting
 # ---------------------------------------------------------------------------
 
+class Block:
+    """One top-level block and where it sits in the source document.
+
+    Attributes:
+        text: The block with surrounding whitespace stripped.
+        start_line: 1-based line number of the block's first line.
+        end_line: 1-based line number of the block's last line.
+        start_byte: Offset of the block's first byte in the UTF-8 source.
+        end_byte: Offset just past the block's last byte in the UTF-8 source.
+    """
+
+    __slots__ = ("text", "start_line", "end_line", "start_byte", "end_byte")
+
+    def __init__(self, text: str, start_line: int, end_line: int, start_byte: int, end_byte: int) -> None:
+        self.text = text
+        self.start_line = start_line
+        self.end_line = end_line
+        self.start_byte = start_byte
+        self.end_byte = end_byte
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Block):
+            return NotImplemented
+        return (
+            self.text == other.text
+            and self.start_line == other.start_line
+            and self.end_line == other.end_line
+            and self.start_byte == other.start_byte
+            and self.end_byte == other.end_byte
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Block({self.text!r}, lines {self.start_line}-{self.end_line}, "
+            f"bytes {self.start_byte}-{self.end_byte})"
+        )
+
+
+_FENCE = "```"
+
+
+def _count_fence_lines(markdown: str, start: int, end: int) -> int:
+    """Count the code fence lines that begin in ``markdown[start:end]``.
+
+    *start* must be at the beginning of a line (or at the newline ending the
+    previous one). A line that opens with ```` ``` ```` and closes on itself
+    (inline code such as ```` ```x``` ````) is not a fence.
+    """
+    if markdown.find(_FENCE, start, end) == -1:
+        return 0
+    if markdown.startswith(_FENCE, start):
+        line_start = start
+    else:
+        line_start = markdown.find("\n" + _FENCE, start, end) + 1
+        if not line_start:
+            return 0
+    count = 0
+    while True:
+        line_end = markdown.find("\n", line_start, end)
+        if line_end == -1:
+            line_end = end
+        if markdown.find(_FENCE, line_start + len(_FENCE), line_end) == -1:
+            count += 1
+        line_start = markdown.find("\n" + _FENCE, line_end, end) + 1
+        if not line_start:
+            return count
+
+
+def iter_blocks(markdown: str) -> Iterator[Block]:
+    """Lazily yield the top-level blocks of *markdown* with their source positions.
+
+    Blocks are separated by blank lines (``\n\n``), as in
+    :func:`markdown_to_blocks`, except inside a fenced code block: a blank
+    line between an opening ```` ``` ```` line and its closing line does not
+    end the block. The document is scanned once; each block is sliced and
+    stripped a single time.
+
+    Args:
+        markdown: Full markdown document string.
+
+    Yields:
+        A :class:`Block` for each non-empty block, in document order.
+    """
+    length = len(markdown)
+    ascii_only = markdown.isascii()
+    pos = 0
+    line = 1  # line number at pos
+    byte = 0  # UTF-8 offset of pos
+    while pos < length:
+        end = markdown.find("\n\n", pos)
+        if end == -1:
+            end = length
+        # Fence lines seen so far in this block; an odd count means a code
+        # fence is still open, so the blank line belongs to the block.
+        fences = _count_fence_lines(markdown, pos, end)
+        while fences % 2 and end < length:
+            next_end = markdown.find("\n\n", end + 1)
+            if next_end == -1:
+                next_end = length
+            fences += _count_fence_lines(markdown, end, next_end)
+            end = next_end
+
+        raw = markdown[pos:end]
+        text = raw.strip()
+        if text:
+            start = pos + raw.index(text[0])
+            start_line = line + markdown.count("\n", pos, start)
+            if ascii_only:
+                start_byte = byte + (start - pos)
+                end_byte = start_byte + len(text)
+            else:
+                start_byte = byte + len(markdown[pos:start].encode("utf-8"))
+                end_byte = start_byte + len(text.encode("utf-8"))
+            yield Block(text, start_line, start_line + text.count("\n"), start_byte, end_byte)
+
+        next_pos = min(end + 2, length)
+        line += markdown.count("\n", pos, next_pos)
+        byte += next_pos - pos if ascii_only else len(markdown[pos:next_pos].encode("utf-8"))
+        pos = next_pos
+
+
+def iter_line_blocks(lines: Iterable[str]) -> Iterator[Block]:
+    """Yield the blocks of a document read line by line, as from a text file.
+
+    Produces the same blocks and positions as :func:`iter_blocks` on the
+    joined lines, but holds only the current block in memory, so documents
+    far larger than memory can be processed. Each line must keep its
+    trailing ``\n`` (as file iteration does).
+
+    Args:
+        lines: The document's lines, in order.
+
+    Yields:
+        A :class:`Block` for each non-empty block, in document order.
+    """
+    pending: list[str] = []
+    fences = 0
+    line = 1  # line number of the next line read
+    byte = 0  # UTF-8 offset of the next line read
+    block_line = block_byte = 0
+    for text in lines:
+        if text == "\n" and not fences % 2:
+            if pending:
+                block = _line_block(pending, block_line, block_byte)
+                if block is not None:
+                    yield block
+                pending = []
+                fences = 0
+        else:
+            if not pending:
+                block_line, block_byte = line, byte
+            pending.append(text)
+            if text.startswith(_FENCE) and text.find(_FENCE, len(_FENCE)) == -1:
+                fences += 1
+        line += 1
+        byte += len(text) if text.isascii() else len(text.encode("utf-8"))
+    if pending:
+        block = _line_block(pending, block_line, block_byte)
+        if block is not None:
+            yield block
+
+
+def _line_block(lines: list[str], line: int, byte: int) -> Block | None:
+    """Build the :class:`Block` for *lines* starting at *line* and UTF-8 offset *byte*."""
+    raw = "".join(lines)
+    text = raw.strip()
+    if not text:
+        return None
+    lead = raw.index(text[0])
+    start_line = line + raw.count("\n", 0, lead)
+    if raw.isascii():
+        start_byte = byte + lead
+        end_byte = start_byte + len(text)
+    else:
+        start_byte = byte + len(raw[:lead].encode("utf-8"))
+        end_byte = start_byte + len(text.encode("utf-8"))
+    return Block(text, start_line, start_line + text.count("\n"), start_byte, end_byte)
+
+
 def markdown_to_blocks(markdown: str) -> list[str]:
     """Split a markdown document into its top-level blocks.
 
-    Blocks are separated by blank lines (``\n\n``). Leading/trailing
-    whitespace is stripped from each block and empty blocks are discarded.
+    Blocks are separated by blank lines (``\n\n``), except inside fenced
+    code blocks. Leading/trailing whitespace is stripped from each block and
+    empty blocks are discarded. Use :func:`iter_blocks` to also get each
+    block's source position.
 
     Args:
         markdown: Full markdown document string.
@@ -40,8 +229,10 @@ def markdown_to_blocks(markdown: str) -> list[str]:
     Returns:
         Ordered list of non-empty block strings.
     """
-    blocks = markdown.split("\n\n")
-    return [block.strip() for block in blocks if block.strip()]
+    if _FENCE not in markdown:
+        # No fences: a plain split gives the same blocks without the offsets.
+        return [text for block in markdown.split("\n\n") if (text := block.strip())]
+    return [block.text for block in iter_blocks(markdown)]
 
 
 # ---------------------------------------------------------------------------
@@ -57,83 +248,251 @@ def block_to_block_type(block: str) -> BlockType:
     Returns:
         The matching BlockType for the block.
     """
+    return classify_block(block)[0]
+
+
+def classify_block(block: str) -> tuple[BlockType, list[str] | None]:
+    """Classify a markdown block and return its lines for the HTML handlers.
+
+    The first line decides which line-based type is possible at all (a line
+    cannot open a quote, an unordered list and an ordered list at once), so
+    the remaining lines are checked in a single pass against that one type,
+    stopping at the first line that does not fit.
+
+    Args:
+        block: A single stripped markdown block.
+
+    Returns:
+        A ``(block_type, lines)`` tuple. *lines* is ``block.split("\n")`` for
+        paragraphs, quotes and lists, and ``None`` for headings and code,
+        which are classified without splitting.
+    """
     # Heading: 1-6 leading '#' characters followed by a space
     if block.startswith("#"):
-        count = 0
-        for char in block:
-            if char == "#":
-                count += 1
-            else:
-                break
-        if 1 <= count <= 6 and len(block) > count and block[count] == " ":
-            return BlockType.HEADING
+        count = len(block) - len(block.lstrip("#"))
+        if count <= 6 and len(block) > count and block[count] == " ":
+            return BlockType.HEADING, None
 
     # Fenced code block
     if block.startswith("```") and block.endswith("```") and len(block) > 6:
-        return BlockType.CODE
+        return BlockType.CODE, None
 
     lines = block.split("\n")
+    first = lines[0]
+
+    # Each check below is one pass over the lines that stops at the first
+    # line that does not fit; ``map`` keeps the per-line loop in C.
+    if first.startswith(">"):
+        # Blockquote: every line starts with '>'
+        if all(map(str.startswith, lines, itertools.repeat(">"))):
+            return BlockType.QUOTE, lines
+    elif first.startswith("- "):
+        # Unordered list: every line starts with '- '
+        if all(map(str.startswith, lines, itertools.repeat("- "))):
+            return BlockType.UNORDERED_LIST, lines
+    elif first.startswith("1. "):
+        # Ordered list: lines start with sequential '1. ', '2. ', …; each
+        # prefix is made only when the line before it has matched.
+        prefixes = (f"{i}. " for i in itertools.count(1))
+        if all(map(str.startswith, lines, prefixes)):
+            return BlockType.ORDERED_LIST, lines
+
+    return BlockType.PARAGRAPH, lines
 
-    # Blockquote: every line starts with '>'
-    if all(line.startswith(">") for line in lines):
-        return BlockType.QUOTE
 
-    # Unordered list: every line starts with '- '
-    if all(line.startswith("- ") for line in lines):
-        return BlockType.UNORDERED_LIST
+# ---------------------------------------------------------------------------
+# HTML conversion
+# ---------------------------------------------------------------------------
 
-    # Ordered list: lines start with sequential '1. ', '2. ', …
-    is_ordered = all(line.startswith(f"{i}. ") for i, line in enumerate(lines, start=1))
-    if is_ordered:
-        return BlockType.ORDERED_LIST
+class BlockError(ValueError):
+    """Raised when a block cannot be converted to HTML.
 
-    return BlockType.PARAGRAPH
+    The message is the original error followed by the block's line range.
 
+    Attributes:
+        block: The :class:`Block` that failed, with its source position.
+    """
+
+    def __init__(self, message: str, block: Block) -> None:
+        self.block = block
+        if block.start_line == block.end_line:
+            where = f"line {block.start_line}"
+        else:
+            where = f"lines {block.start_line}-{block.end_line}"
+        super().__init__(f"{message} ({where})")
 
-# ---------------------------------------------------------------------------
-# HTML conversion
-# ---------------------------------------------------------------------------
 
-def markdown_to_html_node(markdown: str) -> ParentNode:
+def markdown_to_html_node(
+    markdown: str, profile: PageProfile | None = None, cache: BlockCache | None = None
+) -> ParentNode:
     """Convert a full markdown document to an HTML node tree.
 
     Args:
         markdown: Full markdown document string.
+        profile: Optional page profile that receives block splitting,
+            classification, inline parsing and tree construction timings.
+        cache: Optional block cache. Blocks found in it are not parsed
+            again, and every block becomes a :class:`RawHTMLNode` holding its
+            rendered HTML and text instead of a subtree; the page renders
+            and indexes identically.
 
     Returns:
         A ``<div>`` ParentNode containing one child node per block.
     """
+    if profile is not None:
+        return _markdown_to_html_node_profiled(markdown, profile, cache)
     blocks = markdown_to_blocks(markdown)
-    block_nodes = [_block_to_html_node(block, block_to_block_type(block)) for block in blocks]
-    return ParentNode("div", block_nodes)
-
-
-def _block_to_html_node(block: str, block_type: BlockType) -> ParentNode:
-    """Route a block to the appropriate HTML conversion function."""
-    handlers = {
-        BlockType.PARAGRAPH: _paragraph_to_html_node,
-        BlockType.HEADING: _heading_to_html_node,
-        BlockType.CODE: _code_to_html_node,
-        BlockType.QUOTE: _quote_to_html_node,
-        BlockType.UNORDERED_LIST: _unordered_list_to_html_node,
-        BlockType.ORDERED_LIST: _ordered_list_to_html_node,
-    }
-    if block_type not in handlers:
+    classified = [classify_block(block) for block in blocks]
+    return ParentNode("div", _convert_blocks(markdown, blocks, classified, cache))
+
+
+def _convert_blocks(
+    markdown: str,
+    blocks: list[str],
+    classified: list[tuple[BlockType, list[str] | None]],
+    cache: BlockCache | None = None,
+    profile: PageProfile | None = None,
+) -> list:
+    """Convert every block to a node, reporting failures with their source lines."""
+    nodes = []
+    try:
+        if cache is not None:
+            for block, (block_type, lines) in zip(blocks, classified):
+                nodes.append(_cached_block_node(block, block_type, cache, profile, lines))
+        else:
+            for block, (block_type, lines) in zip(blocks, classified):
+                nodes.append(_block_to_html_node(block, block_type, profile, lines))
+    except ValueError as e:
+        # Positions are only worked out on failure, keeping the happy path
+        # on the plain split. Both splitters yield the same blocks in order.
+        failed = next(itertools.islice(iter_blocks(markdown), len(nodes), None))
+        raise BlockError(str(e), failed) from e
+    return nodes
+
+
+def iter_html_blocks(blocks: Iterable[Block], cache: BlockCache | None = None) -> Iterator[HTMLNode]:
+    """Convert *blocks* to HTML nodes one at a time.
+
+    Rendering each node before pulling the next block keeps only one block's
+    tree alive, unlike :func:`markdown_to_html_node`, which builds the tree
+    of the whole document. The nodes are the children that
+    :func:`markdown_to_html_node` would put in its ``<div>``.
+
+    Args:
+        blocks: Blocks from :func:`iter_blocks` or :func:`iter_line_blocks`.
+        cache: Optional block cache, as for :func:`markdown_to_html_node`.
+
+    Yields:
+        One node per block, in order.
+
+    Raises:
+        BlockError: If a block cannot be converted.
+    """
+    for block in blocks:
+        block_type, lines = classify_block(block.text)
+        try:
+            if cache is not None:
+                node = _cached_block_node(block.text, block_type, cache, None, lines)
+            else:
+                node = _block_to_html_node(block.text, block_type, None, lines)
+        except ValueError as e:
+            raise BlockError(str(e), block) from e
+        yield node
+
+
+def _cached_block_node(
+    block: str,
+    block_type: BlockType,
+    cache: BlockCache,
+    profile: PageProfile | None = None,
+    lines: list[str] | None = None,
+) -> RawHTMLNode:
+    """Return a raw node with the HTML and text of *block*, rendering it only on a cache miss."""
+    entry = cache.get(block, block_type)
+    if entry is None:
+        node = _block_to_html_node(block, block_type, profile, lines)
+        entry = (node.to_html(), node_text(node))
+        cache.put(block, block_type, *entry)
+    return RawHTMLNode(*entry)
+
+
+def _markdown_to_html_node_profiled(
+    markdown: str, profile: PageProfile, cache: BlockCache | None = None
+) -> ParentNode:
+    """Staged equivalent of :func:`markdown_to_html_node` that records timings."""
+    start = perf_counter()
+    blocks = markdown_to_blocks(markdown)
+    split_done = perf_counter()
+    classified = [classify_block(block) for block in blocks]
+    classify_done = perf_counter()
+    profile.add_time("blocks", split_done - start)
+    profile.add_time("classify", classify_done - split_done)
+
+    # Inline parsing runs inside the block handlers; its time is accumulated
+    # separately and subtracted so "tree" covers only node construction.
+    inline_before = profile.stages["inline"]
+    block_nodes = _convert_blocks(markdown, blocks, classified, cache, profile)
+    node = ParentNode("div", block_nodes)
+    inline_spent = profile.stages["inline"] - inline_before
+    profile.add_time("tree", perf_counter() - classify_done - inline_spent)
+
+    for block_type, _ in classified:
+        profile.count_block(block_type.value)
+    profile.html_nodes += _count_nodes(node)
+    return node
+
+
+def _count_nodes(root: ParentNode) -> int:
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children)
+    return count
+
+
+def _block_to_html_node(
+    block: str,
+    block_type: BlockType,
+    profile: PageProfile | None = None,
+    lines: list[str] | None = None,
+) -> ParentNode:
+    """Route a block to the appropriate HTML conversion function.
+
+    *lines* is the block already split on newlines, as returned by
+    :func:`classify_block`; it is split here when not given.
+    """
+    handler = _BLOCK_HANDLERS.get(block_type)
+    if handler is None:
         raise ValueError(f"Unsupported block type: {block_type}")
-    return handlers[block_type](block)
+    if lines is None and block_type in _LINE_BLOCK_TYPES:
+        lines = block.split("\n")
+    return handler(block, lines, profile)
 
 
-def _text_to_children(text: str) -> list:
+def _text_to_children(text: str, profile: PageProfile | None = None) -> list:
     """Convert inline markdown text to a list of HTML leaf nodes."""
-    return [text_node_to_html_node(node) for node in text_to_textnodes(text)]
+    if profile is None:
+        return [text_node_to_html_node(node) for node in text_to_textnodes(text)]
+    start = perf_counter()
+    text_nodes = text_to_textnodes(text)
+    profile.add_time("inline", perf_counter() - start)
+    profile.text_nodes += len(text_nodes)
+    return [text_node_to_html_node(node) for node in text_nodes]
 
 
-def _paragraph_to_html_node(block: str) -> ParentNode:
-    text = " ".join(block.split("\n"))
-    return ParentNode("p", _text_to_children(text))
+def _paragraph_to_html_node(
+    block: str, lines: list[str], profile: PageProfile | None = None
+) -> ParentNode:
+    text = " ".join(lines)
+    return ParentNode("p", _text_to_children(text, profile))
 
 
-def _heading_to_html_node(block: str) -> ParentNode:
+def _heading_to_html_node(
+    block: str, lines: list[str] | None, profile: PageProfile | None = None
+) -> ParentNode:
     level = 0
     for char in block:
         if char == "#":
@@ -141,31 +500,50 @@ def _heading_to_html_node(block: str) -> ParentNode:
         else:
             break
     text = block[level + 1:]
-    return ParentNode(f"h{level}", _text_to_children(text))
+    return ParentNode(f"h{level}", _text_to_children(text, profile))
 
 
-def _code_to_html_node(block: str) -> ParentNode:
+def _code_to_html_node(
+    block: str, lines: list[str] | None, profile: PageProfile | None = None
+) -> ParentNode:
     code = block[4:-3]
     return ParentNode("pre", [LeafNode("code", code)])
 
 
-def _quote_to_html_node(block: str) -> ParentNode:
-    lines = block.split("\n")
+def _quote_to_html_node(
+    block: str, lines: list[str], profile: PageProfile | None = None
+) -> ParentNode:
     cleaned = [line[2:] if line.startswith("> ") else line[1:] for line in lines]
-    return ParentNode("blockquote", _text_to_children("\n".join(cleaned)))
+    return ParentNode("blockquote", _text_to_children("\n".join(cleaned), profile))
 
 
-def _unordered_list_to_html_node(block: str) -> ParentNode:
-    items = [
-        ParentNode("li", _text_to_children(line[2:].lstrip()))
-        for line in block.split("\n")
-    ]
+def _unordered_list_to_html_node(
+    block: str, lines: list[str], profile: PageProfile | None = None
+) -> ParentNode:
+    items = [ParentNode("li", _text_to_children(line[2:].lstrip(), profile)) for line in lines]
     return ParentNode("ul", items)
 
 
-def _ordered_list_to_html_node(block: str) -> ParentNode:
+def _ordered_list_to_html_node(
+    block: str, lines: list[str], profile: PageProfile | None = None
+) -> ParentNode:
     items = [
-        ParentNode("li", _text_to_children(line.split(". ", 1)[1].lstrip()))
-        for line in block.split("\n")
+        ParentNode("li", _text_to_children(line[line.index(". ") + 2:].lstrip(), profile))
+        for line in lines
     ]
     return ParentNode("ol", items)
+
+
+_BLOCK_HANDLERS = {
+    BlockType.PARAGRAPH: _paragraph_to_html_node,
+    BlockType.HEADING: _heading_to_html_node,
+    BlockType.CODE: _code_to_html_node,
+    BlockType.QUOTE: _quote_to_html_node,
+    BlockType.UNORDERED_LIST: _unordered_list_to_html_node,
+    BlockType.ORDERED_LIST: _ordered_list_to_html_node,
+}
+
+# Block types whose handlers work on the block's lines.
+_LINE_BLOCK_TYPES = frozenset(
+    (BlockType.PARAGRAPH, BlockType.QUOTE, BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST)
+)
@@ -0,0 +1,853 @@
+"""Site build orchestration: page discovery, parallel rendering and incremental builds."""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator
+
+from block_cache import BlockCache
+from catalog import PageCatalog, PageInfo
+from collector import absorb_all, drain_all
+from discovery import DEFAULT_DISCOVERY, Discovery
+from file_operations import (
+    STREAM_THRESHOLD,
+    PageCollectors,
+    profile_page,
+    render_page,
+    render_page_file,
+    stream_page_file,
+    write_page,
+)
+from front_matter import FrontMatter, published_pages, read_front_matter
+from links import LinkIndex
+from manifest import BuildManifest, OutputChanges, hash_file, hash_text
+from page_template import CompiledTemplate
+from profiling import BuildProfiler, PageProfile
+from search_index import SearchIndex
+
+
+# ---------------------------------------------------------------------------
+# Page discovery
+# ---------------------------------------------------------------------------
+
+def find_pages(
+    dir_path_content: str,
+    dest_dir_path: str,
+    discovery: Discovery | None = None,
+    drafts: bool = True,
+) -> list[tuple[str, str]]:
+    """Return every ``(source, destination)`` page pair under *dir_path_content*.
+
+    Destinations mirror the layout used by
+    :func:`file_operations.generate_pages_recursive`. Pairs are sorted by
+    source path so builds are deterministic.
+
+    Args:
+        dir_path_content: Root directory of markdown source files.
+        dest_dir_path: Root directory for generated HTML output.
+        discovery: Ignore patterns and symlink policy for the walk
+            (default: :data:`discovery.DEFAULT_DISCOVERY`).
+        drafts: Include pages whose front matter marks them as drafts. When
+            False, the header of every page is read (and nothing more) to
+            leave drafts out.
+
+    Returns:
+        Sorted list of ``(markdown_path, html_path)`` tuples.
+    """
+    pages = (discovery or DEFAULT_DISCOVERY).pages(dir_path_content, dest_dir_path)
+    return pages if drafts else published_pages(pages)
+
+
+# ---------------------------------------------------------------------------
+# Page rendering (serial or across a process pool)
+# ---------------------------------------------------------------------------
+
+class BuildError(Exception):
+    """Raised when one or more pages fail to render.
+
+    Attributes:
+        failures: ``(source_path, message)`` pairs sorted by source path, so
+            the report is identical however the work was scheduled.
+        rendered: Output hashes of the pages that did render, keyed by source.
+    """
+
+    def __init__(
+        self, failures: list[tuple[str, str]], rendered: dict[str, str] | None = None
+    ) -> None:
+        self.failures = sorted(failures)
+        self.rendered = rendered or {}
+        lines = [f"{len(self.failures)} page(s) failed to render:"]
+        lines.extend(f"  {src}: {message}" for src, message in self.failures)
+        super().__init__("\n".join(lines))
+
+
+# Per-process state installed by _init_worker so that the compiled template is
+# sent to each worker once instead of once per chunk.
+_worker_template: CompiledTemplate | None = None
+_worker_profiling: bool = False
+_worker_cache: BlockCache | None = None
+_worker_stream_threshold: int | None = STREAM_THRESHOLD
+_worker_changes: OutputChanges | None = None
+_worker_links: LinkIndex | None = None
+_worker_search: SearchIndex | None = None
+_worker_catalog: PageCatalog | None = None
+_worker_known_hashes: dict[str, str] = {}
+
+# (output_hash, error, profile) for one page; exactly one of hash/error is set.
+_PageResult = tuple[str | None, str | None, dict | None]
+
+
+def _init_worker(
+    template: CompiledTemplate,
+    profiling: bool = False,
+    cache: BlockCache | None = None,
+    stream_threshold: int | None = STREAM_THRESHOLD,
+    changes: OutputChanges | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
+    known_hashes: dict[str, str] | None = None,
+) -> None:
+    global _worker_template, _worker_profiling, _worker_cache, _worker_stream_threshold, _worker_changes
+    global _worker_links, _worker_search, _worker_catalog, _worker_known_hashes
+    _worker_template = template
+    _worker_profiling = profiling
+    _worker_cache = cache
+    _worker_stream_threshold = stream_threshold
+    _worker_changes = changes
+    _worker_links = links
+    _worker_search = search
+    _worker_catalog = catalog
+    _worker_known_hashes = known_hashes or {}
+
+
+def _render_one(src_path: str, dest_path: str) -> _PageResult:
+    """Render a single page, capturing any error as a message."""
+    profile = PageProfile(src_path) if _worker_profiling else None
+    try:
+        collectors = PageCollectors.for_build(src_path, _worker_links, _worker_search, _worker_catalog)
+        known_hash = _worker_known_hashes.get(dest_path)
+        if profile is not None:
+            output_hash = profile_page(
+                src_path, _worker_template, dest_path, profile, _worker_cache, _worker_changes,
+                collectors, known_hash,
+            )
+        else:
+            output_hash = render_page_file(
+                src_path, _worker_template, dest_path, _worker_cache, _worker_stream_threshold,
+                _worker_changes, collectors, known_hash,
+            )
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", None
+    collectors.record(dest_path, _worker_links, _worker_search, _worker_catalog)
+    return output_hash, None, profile.to_dict() if profile is not None else None
+
+
+def _render_chunk(chunk: list[tuple[str, str]]) -> tuple[list[_PageResult], tuple]:
+    """Render *chunk*, returning its results and the deltas drained from the worker's collectors."""
+    results = [_render_one(src_path, dest_path) for src_path, dest_path in chunk]
+    return results, drain_all(
+        (_worker_cache, _worker_changes, _worker_links, _worker_search, _worker_catalog)
+    )
+
+
+def _chunked(items: list, size: int) -> list[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def render_pages(
+    pages: list[tuple[str, str]],
+    template: CompiledTemplate,
+    jobs: int = 1,
+    profiler: BuildProfiler | None = None,
+    cache: BlockCache | None = None,
+    pipeline: bool = False,
+    stream_threshold: int | None = STREAM_THRESHOLD,
+    changes: OutputChanges | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
+    known_hashes: dict[str, str] | None = None,
+) -> dict[str, str]:
+    """Render and write every ``(source, destination)`` pair in *pages*.
+
+    With ``jobs > 1`` the pages are split into chunks and rendered across a
+    :class:`~concurrent.futures.ProcessPoolExecutor`. Each page is rendered
+    by exactly the same code as a serial build (:func:`render_page_file`), so output is byte-identical.
+    Progress is printed by the parent process in page order.
+
+    Args:
+        pages: Page pairs, typically from :func:`find_pages`.
+        template: Compiled page template, including the basepath.
+        jobs: Number of worker processes; ``1`` renders in-process.
+        profiler: Optional build profiler; workers profile each page and the
+            results are merged here in page order.
+        cache: Optional block cache. Each worker process renders with its
+            own copy; their hit/miss counters and used blocks are merged
+            back into *cache* so it can be saved afterwards.
+        pipeline: Overlap reading, rendering and writing with
+            :func:`render_pages_pipelined`. Cannot be combined with
+            *profiler*, since the stages no longer run one after another.
+        stream_threshold: Source size in bytes from which a page is rendered
+            block by block (see :func:`file_operations.render_page_file`).
+            Profiled pages are always read whole.
+        changes: Optional record of which outputs were rewritten and which
+            already held the same HTML; merged back from worker processes
+            like *cache*.
+        links: Optional link index that receives the links of every page
+            rendered successfully; merged back from worker processes too.
+        search: Optional search index that receives the text of every page
+            rendered successfully, merged back like *links*.
+        catalog: Optional site catalog that receives the metadata of every
+            page rendered successfully, merged back like *links*.
+        known_hashes: SHA-256 hashes that existing outputs are known to
+            hold, keyed by destination path; those outputs are compared
+            against the hash instead of being read back.
+
+    Returns:
+        Mapping of source path to the SHA-256 hash of its rendered HTML.
+
+    Raises:
+        BuildError: If any page failed. Every page is still attempted, and
+            the failures are reported sorted by source path.
+        ValueError: If both *pipeline* and *profiler* are given.
+    """
+    if pipeline:
+        if profiler is not None:
+            raise ValueError("profiling is not supported in pipelined mode")
+        return render_pages_pipelined(
+            pages, template, jobs, cache, stream_threshold=stream_threshold, changes=changes,
+            links=links, search=search, catalog=catalog, known_hashes=known_hashes,
+        )
+
+    if jobs > 1 and len(pages) > 1:
+        # Several chunks per worker keeps the pool busy when page sizes vary,
+        # while still amortising the per-task pickling overhead.
+        chunk_size = max(1, -(-len(pages) // (jobs * 4)))
+        chunks = _chunked(pages, chunk_size)
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(
+                template, profiler is not None, cache, stream_threshold, changes, links, search, catalog,
+                known_hashes,
+            ),
+        ) as executor:
+            results = []
+            for chunk_results, deltas in executor.map(_render_chunk, chunks):
+                results.extend(chunk_results)
+                absorb_all((cache, changes, links, search, catalog), deltas)
+    else:
+        _init_worker(
+            template, profiler is not None, cache, stream_threshold, changes, links, search, catalog,
+            known_hashes,
+        )
+        results = [_render_one(src_path, dest_path) for src_path, dest_path in pages]
+
+    return _collect_results(pages, results, profiler)
+
+
+def _collect_results(
+    pages: list[tuple[str, str]],
+    results: list[_PageResult],
+    profiler: BuildProfiler | None = None,
+) -> dict[str, str]:
+    """Report *results* in page order and return the output hashes.
+
+    Raises:
+        BuildError: If any page failed.
+    """
+    hashes: dict[str, str] = {}
+    failures: list[tuple[str, str]] = []
+    for (src_path, dest_path), (output_hash, error, profile) in zip(pages, results):
+        if error is not None:
+            failures.append((src_path, error))
+            continue
+        if profiler is not None:
+            profiler.add(PageProfile.from_dict(profile))
+        print(f"Generated page from {src_path} to {dest_path}")
+        hashes[src_path] = output_hash
+    if failures:
+        raise BuildError(failures, hashes)
+    return hashes
+
+
+# ---------------------------------------------------------------------------
+# Pipelined rendering
+# ---------------------------------------------------------------------------
+
+# Threads per I/O stage and the number of pages each queue may hold. The
+# bounded queues are the backpressure: a stage that gets ahead blocks until
+# the next one catches up, so memory use does not grow with the site.
+PIPELINE_READERS = 4
+PIPELINE_WRITERS = 4
+PIPELINE_DEPTH = 32
+
+
+def _pipeline_reader(
+    pages: queue.SimpleQueue, sources: queue.Queue, stream_threshold: int | None = STREAM_THRESHOLD
+) -> None:
+    """Read pages until the ``None`` sentinel, queueing ``(src, dest, text, error)``.
+
+    Sources of at least *stream_threshold* bytes are not read: they are
+    queued with neither text nor error, to be streamed by the render stage.
+    """
+    while (page := pages.get()) is not None:
+        src_path, dest_path = page
+        try:
+            with open(src_path, "r", encoding="utf-8") as f:
+                if stream_threshold is not None and os.fstat(f.fileno()).st_size >= stream_threshold:
+                    markdown_content = None
+                else:
+                    markdown_content = f.read()
+        except Exception as e:
+            sources.put((src_path, dest_path, None, f"{type(e).__name__}: {e}"))
+        else:
+            sources.put((src_path, dest_path, markdown_content, None))
+
+
+def _pipeline_writer(
+    outputs: queue.Queue,
+    results: dict[str, tuple[str | None, str | None]],
+    changes: OutputChanges | None = None,
+    known_hashes: dict[str, str] | None = None,
+) -> None:
+    """Write rendered pages until the ``None`` sentinel, recording each outcome."""
+    known_hashes = known_hashes or {}
+    while (item := outputs.get()) is not None:
+        src_path, dest_path, html = item
+        try:
+            # Distinct keys per page, so writers never race on an entry.
+            results[src_path] = (write_page(dest_path, html, changes, known_hashes.get(dest_path)), None)
+        except Exception as e:
+            results[src_path] = (None, f"{type(e).__name__}: {e}")
+
+
+def _render_text(
+    src_path: str, dest_path: str, markdown_content: str
+) -> tuple[str | None, str | None]:
+    """Render *markdown_content*, read from *src_path*, with the worker template, capturing any error.
+
+    The page's links, text and metadata are recorded under *dest_path* in
+    the worker's link and search indexes and catalog.
+    """
+    try:
+        collectors = PageCollectors.for_build(src_path, _worker_links, _worker_search, _worker_catalog)
+        html = render_page(markdown_content, _worker_template, _worker_cache, collectors)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    collectors.record(dest_path, _worker_links, _worker_search, _worker_catalog)
+    return html, None
+
+
+def _render_text_in_worker(
+    src_path: str, dest_path: str, markdown_content: str
+) -> tuple[str | None, str | None, tuple]:
+    html, error = _render_text(src_path, dest_path, markdown_content)
+    return html, error, drain_all((_worker_cache, _worker_links, _worker_search, _worker_catalog))
+
+
+def render_pages_pipelined(
+    pages: list[tuple[str, str]],
+    template: CompiledTemplate,
+    jobs: int = 1,
+    cache: BlockCache | None = None,
+    readers: int = PIPELINE_READERS,
+    writers: int = PIPELINE_WRITERS,
+    depth: int = PIPELINE_DEPTH,
+    stream_threshold: int | None = STREAM_THRESHOLD,
+    changes: OutputChanges | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
+    known_hashes: dict[str, str] | None = None,
+) -> dict[str, str]:
+    """Render *pages* with reading, rendering and writing overlapped.
+
+    A pool of reader threads prefetches markdown sources, the pages are
+    rendered in this process (or across *jobs* worker processes), and a pool
+    of writer threads writes the outputs. Each hand-off goes through a queue
+    of at most *depth* pages, and at most *depth* pages are rendering at
+    once, so memory stays bounded however large the site is. Pages of at
+    least *stream_threshold* bytes skip the queues and are streamed straight
+    from source to output in this process. Output is byte-identical to
+    :func:`render_pages`.
+
+    Args:
+        pages: Page pairs, typically from :func:`find_pages`.
+        template: Compiled page template, including the basepath.
+        jobs: Number of render processes; ``1`` renders in-process.
+        cache: Optional block cache, shared with workers as in
+            :func:`render_pages`.
+        readers: Number of reader threads.
+        writers: Number of writer threads.
+        depth: Capacity of each queue between stages.
+        stream_threshold: Source size in bytes from which a page is
+            streamed; ``None`` reads every page whole.
+        changes: Optional record of which outputs were rewritten; pages
+            are written in this process, so workers do not touch it.
+        links: Optional link index, merged back from workers as in
+            :func:`render_pages`.
+        search: Optional search index, merged back like *links*.
+        catalog: Optional site catalog, merged back like *links*.
+        known_hashes: Hashes existing outputs are known to hold, as in
+            :func:`render_pages`.
+
+    Returns:
+        Mapping of source path to the SHA-256 hash of its rendered HTML.
+
+    Raises:
+        BuildError: If any page failed to read, render or write.
+    """
+    tasks: queue.SimpleQueue = queue.SimpleQueue()
+    for page in pages:
+        tasks.put(page)
+    for _ in range(readers):
+        tasks.put(None)
+    sources: queue.Queue = queue.Queue(maxsize=depth)
+    outputs: queue.Queue = queue.Queue(maxsize=depth)
+    outcomes: dict[str, tuple[str | None, str | None]] = {}
+    known_hashes = known_hashes or {}
+
+    reader_threads = [
+        threading.Thread(target=_pipeline_reader, args=(tasks, sources, stream_threshold), daemon=True)
+        for _ in range(readers)
+    ]
+    writer_threads = [
+        threading.Thread(
+            target=_pipeline_writer, args=(outputs, outcomes, changes, known_hashes), daemon=True
+        )
+        for _ in range(writers)
+    ]
+    for thread in reader_threads + writer_threads:
+        thread.start()
+
+    def emit(src_path: str, dest_path: str, html: str | None, error: str | None) -> None:
+        if error is not None:
+            outcomes[src_path] = (None, error)
+        else:
+            outputs.put((src_path, dest_path, html))
+
+    def stream(src_path: str, dest_path: str) -> None:
+        try:
+            collectors = PageCollectors.for_build(src_path, links, search, catalog)
+            output_hash = stream_page_file(
+                src_path, template, dest_path, cache, changes, collectors, known_hashes.get(dest_path)
+            )
+        except Exception as e:
+            outcomes[src_path] = (None, f"{type(e).__name__}: {e}")
+            return
+        outcomes[src_path] = (output_hash, None)
+        collectors.record(dest_path, links, search, catalog)
+
+    def received() -> Iterator[tuple[str, str, str | None, str | None]]:
+        return (sources.get() for _ in range(len(pages)))
+
+    try:
+        if jobs > 1 and len(pages) > 1:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(template, False, cache, STREAM_THRESHOLD, None, links, search, catalog),
+            ) as executor:
+                in_flight: deque[tuple[str, str, Future]] = deque()
+
+                def finish_oldest() -> None:
+                    src_path, dest_path, future = in_flight.popleft()
+                    html, error, deltas = future.result()
+                    absorb_all((cache, links, search, catalog), deltas)
+                    emit(src_path, dest_path, html, error)
+
+                for src_path, dest_path, markdown_content, error in received():
+                    if error is not None:
+                        emit(src_path, dest_path, None, error)
+                        continue
+                    if markdown_content is None:
+                        stream(src_path, dest_path)
+                        continue
+                    in_flight.append(
+                        (
+                            src_path,
+                            dest_path,
+                            executor.submit(_render_text_in_worker, src_path, dest_path, markdown_content),
+                        )
+                    )
+                    if len(in_flight) >= depth:
+                        finish_oldest()
+                while in_flight:
+                    finish_oldest()
+        else:
+            _init_worker(template, False, cache, links=links, search=search, catalog=catalog)
+            for src_path, dest_path, markdown_content, error in received():
+                if error is None and markdown_content is None:
+                    stream(src_path, dest_path)
+                    continue
+                html = None
+                if error is None:
+                    html, error = _render_text(src_path, dest_path, markdown_content)
+                emit(src_path, dest_path, html, error)
+    finally:
+        for _ in writer_threads:
+            outputs.put(None)
+        for thread in writer_threads:
+            thread.join()
+
+    results = [(*outcomes[src_path], None) for src_path, _ in pages]
+    return _collect_results(pages, results)
+
+
+def generate_pages_parallel(
+    dir_path_content: str,
+    template_path: str,
+    dest_dir_path: str,
+    basepath: str = "/",
+    jobs: int | None = None,
+    profiler: BuildProfiler | None = None,
+    cache: BlockCache | None = None,
+    pipeline: bool = False,
+    discovery: Discovery | None = None,
+    stream_threshold: int | None = STREAM_THRESHOLD,
+    changes: OutputChanges | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
+    drafts: bool = False,
+) -> dict[str, str]:
+    """Discover every page under *dir_path_content* and render them in parallel.
+
+    Args:
+        dir_path_content: Root directory of markdown source files.
+        template_path: Path to the HTML template file.
+        dest_dir_path: Root directory for generated HTML output.
+        basepath: URL base path prefix compiled into the page template.
+        jobs: Number of worker processes (default: ``os.cpu_count()``).
+        profiler: Optional build profiler forwarded to :func:`render_pages`.
+        cache: Optional block cache forwarded to :func:`render_pages`.
+        pipeline: Overlap reading, rendering and writing (see
+            :func:`render_pages_pipelined`).
+        discovery: Ignore patterns and symlink policy for finding pages.
+        stream_threshold: Source size from which pages are streamed,
+            forwarded to :func:`render_pages`.
+        changes: Optional record of rewritten outputs, forwarded to
+            :func:`render_pages`.
+        links: Optional link index, forwarded to :func:`render_pages`.
+        search: Optional search index, forwarded to :func:`render_pages`.
+        catalog: Optional site catalog, forwarded to :func:`render_pages`.
+        drafts: Also render pages whose front matter marks them as drafts.
+
+    Returns:
+        Mapping of source path to the hash of its rendered HTML.
+    """
+    template = CompiledTemplate.load(template_path, basepath)
+    pages = find_pages(dir_path_content, dest_dir_path, discovery, drafts)
+    return render_pages(
+        pages, template, jobs or os.cpu_count() or 1, profiler, cache, pipeline,
+        stream_threshold, changes, links, search, catalog,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Incremental builds
+# ---------------------------------------------------------------------------
+
+# Inputs of a page being re-rendered: (source, stat, source hash, template
+# hash, output, destination path, front matter).
+_PendingPage = tuple[str, os.stat_result, str, str | None, str, str, FrontMatter]
+
+
+class IncrementalResult:
+    """Summary of an incremental build.
+
+    Attributes:
+        rendered: Source paths that were (re-)rendered.
+        skipped: Source paths whose inputs were unchanged.
+        removed: Output paths deleted because their source disappeared.
+    """
+
+    def __init__(self) -> None:
+        self.rendered: list[str] = []
+        self.skipped: list[str] = []
+        self.removed: list[str] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"IncrementalResult(rendered={len(self.rendered)}, "
+            f"skipped={len(self.skipped)}, removed={len(self.removed)})"
+        )
+
+
+def generate_pages_incremental(
+    dir_path_content: str,
+    template_path: str,
+    dest_dir_path: str,
+    basepath: str = "/",
+    manifest_path: str = ".build_manifest.json",
+    jobs: int = 1,
+    profiler: BuildProfiler | None = None,
+    cache: BlockCache | None = None,
+    pipeline: bool = False,
+    discovery: Discovery | None = None,
+    stream_threshold: int | None = STREAM_THRESHOLD,
+    changes: OutputChanges | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
+    drafts: bool = False,
+) -> IncrementalResult:
+    """Re-render only the pages whose inputs changed since the last build.
+
+    A page is re-rendered when its markdown content, its template (the site
+    template or the one its front matter names), or *basepath* differs from
+    what the manifest recorded, or when its output file is missing. Outputs
+    whose source was deleted, or became a draft, are removed. Front matter
+    is taken from the manifest for unchanged sources; other sources have
+    their header read to find drafts and template overrides. The
+    manifest is rewritten at the end of the build.
+
+    Args:
+        dir_path_content: Root directory of markdown source files.
+        template_path: Path to the HTML template file.
+        dest_dir_path: Root directory for generated HTML output.
+        basepath: URL base path prefix compiled into the page template.
+        manifest_path: Location of the persistent build manifest.
+        jobs: Number of worker processes used to render changed pages.
+        profiler: Optional build profiler for the pages that are rendered.
+        cache: Optional block cache for the pages that are rendered.
+        pipeline: Overlap reading, rendering and writing of those pages.
+        discovery: Ignore patterns and symlink policy for finding pages.
+            Outputs of pages that become ignored are removed like those of
+            deleted pages.
+        stream_threshold: Source size from which pages are streamed,
+            forwarded to :func:`render_pages`.
+        changes: Optional record of rewritten outputs; removed stale pages
+            are added to it too.
+        links: Optional link index covering every page, not only the ones
+            rendered: the links of unchanged pages come from the manifest.
+            Pages whose links the manifest does not hold yet are rendered.
+        search: Optional search index, normally loaded from the previous
+            build's output (see :meth:`search_index.SearchIndex.load`).
+            Unchanged pages it already holds are kept, others are rendered,
+            and pages that no longer exist are dropped from it.
+        catalog: Optional site catalog covering every page: the titles of
+            unchanged pages come from the manifest, and pages whose title
+            the manifest does not hold yet are rendered.
+        drafts: Also render pages whose front matter marks them as drafts.
+
+    Returns:
+        An :class:`IncrementalResult` describing what the build did.
+    """
+    manifest = BuildManifest.load(manifest_path)
+    result = IncrementalResult()
+
+    template = CompiledTemplate.load(template_path, basepath)
+    # Hash of each template pages render with, keyed by front matter name.
+    template_hashes: dict[str | None, str | None] = {None: hash_text(template.source)}
+
+    seen: set[str] = set()
+    outputs: set[str] = set()
+    dirty: list[tuple[str, str]] = []
+    # Recorded hashes of the dirty pages' outputs that are unchanged on disk.
+    known_hashes: dict[str, str] = {}
+    # Inputs of each dirty page, recorded in the manifest once it renders.
+    pending: dict[str, _PendingPage] = {}
+    for src_path, dest_path in find_pages(dir_path_content, dest_dir_path, discovery):
+        source = os.path.relpath(src_path, dir_path_content)
+        stat = os.stat(src_path)
+        front_matter = manifest.front_matter(source, stat)
+        if front_matter is None:
+            try:
+                front_matter = read_front_matter(src_path)
+            except (OSError, ValueError):
+                # Rendered anyway, so that the error is reported with the page.
+                front_matter = FrontMatter()
+        if front_matter.draft and not drafts:
+            continue
+        seen.add(source)
+        outputs.add(dest_path)
+        template_hash = _template_hash(template, front_matter.template, template_hashes)
+
+        source_hash = manifest.cached_source_hash(source, stat)
+        if source_hash is None:
+            source_hash = hash_file(src_path)
+
+        recorded_links = manifest.links(source) if links is not None else None
+        recorded_title = manifest.title(source) if catalog is not None else None
+        if (
+            manifest.is_fresh(source, source_hash, template_hash, basepath, dest_path)
+            and (links is None or recorded_links is not None)
+            and (search is None or dest_path in search.pages)
+            and (catalog is None or recorded_title is not None)
+        ):
+            manifest.touch(source, stat)
+            if links is not None:
+                links.record(dest_path, recorded_links)
+            if catalog is not None:
+                info = PageInfo(stat.st_mtime)
+                info.describe(recorded_title, front_matter)
+                catalog.record(dest_path, info)
+            result.skipped.append(src_path)
+            continue
+
+        dirty.append((src_path, dest_path))
+        known_hash = manifest.output_hash(source, dest_path)
+        if known_hash is not None:
+            known_hashes[dest_path] = known_hash
+        pending[src_path] = (
+            source, stat, source_hash, template_hash, os.path.relpath(dest_path, dest_dir_path),
+            dest_path, front_matter,
+        )
+
+    try:
+        output_hashes = render_pages(
+            dirty, template, jobs, profiler, cache, pipeline, stream_threshold, changes, links, search,
+            catalog, known_hashes,
+        )
+    except BuildError as e:
+        # Record the pages that did render so the next build does not redo them.
+        _record_rendered(manifest, result, e.rendered, pending, basepath, links, catalog)
+        manifest.save()
+        raise
+    _record_rendered(manifest, result, output_hashes, pending, basepath, links, catalog)
+
+    if search is not None:
+        # Pages deleted or ignored since the index was written.
+        for page in set(search.pages) - outputs:
+            del search.pages[page]
+
+    for source in sorted(set(manifest.pages) - seen):
+        entry = manifest.pages.pop(source)
+        output_path = os.path.join(dest_dir_path, entry["output"])
+        if os.path.isfile(output_path):
+            print(f"Removing stale page: {output_path}")
+            os.remove(output_path)
+            _remove_empty_dirs(os.path.dirname(output_path), dest_dir_path)
+            if changes is not None:
+                changes.removed.append(output_path)
+        result.removed.append(output_path)
+
+    manifest.save()
+    return result
+
+
+def rerender_pages(
+    pages: list[tuple[str, str]],
+    manifest: BuildManifest,
+    template: CompiledTemplate,
+    dir_path_content: str,
+    dest_dir_path: str,
+    basepath: str = "/",
+    cache: BlockCache | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
+) -> IncrementalResult:
+    """Render *pages* and record them in *manifest*, as an incremental build would.
+
+    For callers that already know which pages changed, such as watch mode:
+    the pages are rendered without checking whether they are fresh, and
+    nothing else is looked at. The manifest is not saved.
+
+    Args:
+        pages: ``(source, destination)`` pairs to render, drafts already left out.
+        manifest: The manifest of the last build, updated in place.
+        template: Compiled site template, including the basepath.
+        dir_path_content: Root directory of markdown source files.
+        dest_dir_path: Root directory for generated HTML output.
+        basepath: URL base path prefix compiled into *template*.
+        cache: Optional block cache.
+        links: Optional link index, updated with the rendered pages.
+        search: Optional search index, updated with the rendered pages.
+        catalog: Optional site catalog, updated with the rendered pages.
+
+    Returns:
+        An :class:`IncrementalResult` whose :attr:`~IncrementalResult.rendered`
+        lists the pages that rendered.
+
+    Raises:
+        BuildError: If pages failed to render, once the others are recorded.
+    """
+    result = IncrementalResult()
+    template_hashes: dict[str | None, str | None] = {None: hash_text(template.source)}
+    known_hashes: dict[str, str] = {}
+    pending: dict[str, _PendingPage] = {}
+    for src_path, dest_path in pages:
+        source = os.path.relpath(src_path, dir_path_content)
+        stat = os.stat(src_path)
+        try:
+            front_matter = read_front_matter(src_path)
+        except (OSError, ValueError):
+            front_matter = FrontMatter()
+        known_hash = manifest.output_hash(source, dest_path)
+        if known_hash is not None:
+            known_hashes[dest_path] = known_hash
+        pending[src_path] = (
+            source, stat, hash_file(src_path), _template_hash(template, front_matter.template, template_hashes),
+            os.path.relpath(dest_path, dest_dir_path), dest_path, front_matter,
+        )
+    try:
+        output_hashes = render_pages(
+            pages, template, cache=cache, links=links, search=search, catalog=catalog,
+            known_hashes=known_hashes,
+        )
+    except BuildError as e:
+        _record_rendered(manifest, result, e.rendered, pending, basepath, links, catalog)
+        raise
+    _record_rendered(manifest, result, output_hashes, pending, basepath, links, catalog)
+    return result
+
+
+def _template_hash(
+    template: CompiledTemplate, name: str | None, hashes: dict[str | None, str | None]
+) -> str | None:
+    """Return the hash of the template named *name* by a page's front matter, memoised in *hashes*.
+
+    None if it cannot be read: the page is then rendered, which reports why.
+    """
+    if name not in hashes:
+        try:
+            hashes[name] = hash_text(template.for_page(name).source)
+        except OSError:
+            hashes[name] = None
+    return hashes[name]
+
+
+def _record_rendered(
+    manifest: BuildManifest,
+    result: IncrementalResult,
+    output_hashes: dict[str, str],
+    pending: dict[str, _PendingPage],
+    basepath: str,
+    links: LinkIndex | None = None,
+    catalog: PageCatalog | None = None,
+) -> None:
+    """Store manifest entries for every pending page that rendered successfully."""
+    for src_path, (source, stat, source_hash, template_hash, output, dest_path, front_matter) in (
+        pending.items()
+    ):
+        output_hash = output_hashes.get(src_path)
+        if output_hash is None:
+            continue
+        manifest.record(
+            source, stat, source_hash, template_hash, basepath, output, output_hash,
+            links.pages.get(dest_path) if links is not None else None,
+            catalog.pages[dest_path].title if catalog is not None else None,
+            front_matter,
+            os.stat(dest_path),
+        )
+        result.rendered.append(src_path)
+
+
+def _remove_empty_dirs(directory: str, root: str) -> None:
+    """Remove *directory* and its empty parents, stopping at *root*."""
+    root = os.path.abspath(root)
+    directory = os.path.abspath(directory)
+    while directory != root and directory.startswith(root + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            return
+        directory = os.path.dirname(directory)
@@ -0,0 +1,481 @@
+"""Site catalog: page metadata gathered while rendering, and the collection outputs built from it.
+
+Each rendered page contributes its title (from its front matter, or the
+one :func:`extract_title` finds while the page renders), its front matter
+date and tags, and the modification time of its source, keyed by output
+path. Parallel workers fill their own catalogs and the
+parent merges them, as for the link and search indexes. Once every page
+is known, three kinds of output are written from the catalog alone,
+without re-reading any page:
+
+- ``sitemap.xml``, listing every page with its last modification time.
+  Above :data:`SITEMAP_URL_LIMIT` URLs (the limit of the sitemap
+  protocol), the URLs are split into ``sitemap-1.xml``, ``sitemap-2.xml``,
+  … and ``sitemap.xml`` becomes the sitemap index pointing to them.
+- ``<collection>/feed.xml``, an Atom feed of the newest pages of a
+  collection (the pages under ``blog/`` by default). Pages are ordered by
+  their front matter date, or their modification time if they have none.
+- ``<collection>/page/<n>/index.html``, the collection's pages listed
+  newest first, :data:`INDEX_PAGE_SIZE` per page, rendered with the site
+  template.
+- ``<collection>/tags/<tag>/index.html``, the collection's pages with a
+  front matter tag, newest first, one page per tag (see :func:`tag_slug`).
+
+The index and tag pages are listed in the sitemap along with the pages.
+
+The XML is written line by line as it is produced, so a sitemap of any
+size is never held in memory as a document. Outputs are replaced only when
+their content changed, and sitemap shards and index pages that are no
+longer needed are removed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import time
+from html import escape
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import urlsplit
+
+from collector import Collector
+from discovery import page_url
+from manifest import OutputFile, atomic_output
+
+if TYPE_CHECKING:
+    from front_matter import FrontMatter
+    from manifest import OutputChanges
+    from page_template import CompiledTemplate
+
+# URLs per sitemap file allowed by the sitemap protocol.
+SITEMAP_URL_LIMIT = 50_000
+
+# Newest pages listed in a collection's Atom feed.
+FEED_ENTRIES = 20
+
+# Pages listed on each generated collection index page.
+INDEX_PAGE_SIZE = 10
+
+DEFAULT_COLLECTION = "blog"
+
+_SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+_ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+_OUTPUT_PATTERN = re.compile(r"sitemap(-\d+)?\.xml|(.+/)?feed\.xml")
+_SLUG_PATTERN = re.compile(r"\W+")
+
+
+def is_catalog_output(rel_path: str) -> bool:
+    """Return True if *rel_path*, relative to the output root, is a sitemap or feed."""
+    return _OUTPUT_PATTERN.fullmatch(rel_path.replace(os.sep, "/")) is not None
+
+
+class PageInfo:
+    """Metadata of one page, collected while it renders.
+
+    Attributes:
+        updated: Modification time of the page's source, in seconds.
+        title: The page title, set by the renderer.
+        published: The front matter ``date`` in seconds, if the page has one.
+        tags: The front matter tags.
+    """
+
+    def __init__(
+        self,
+        updated: float,
+        title: str = "",
+        published: float | None = None,
+        tags: list[str] | None = None,
+    ) -> None:
+        self.updated = updated
+        self.title = title
+        self.published = published
+        self.tags = tags if tags is not None else []
+
+    @property
+    def date(self) -> float:
+        """The time the page is listed under: its front matter date, else its modification time."""
+        return self.published if self.published is not None else self.updated
+
+    def describe(self, title: str, front_matter: FrontMatter) -> None:
+        """Set the title, and the date and tags of the page's *front_matter*."""
+        self.title = title
+        self.published = front_matter.published
+        self.tags = front_matter.tags
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PageInfo):
+            return NotImplemented
+        return (
+            self.updated == other.updated
+            and self.title == other.title
+            and self.published == other.published
+            and self.tags == other.tags
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"PageInfo(updated={self.updated!r}, title={self.title!r}, "
+            f"published={self.published!r}, tags={self.tags!r})"
+        )
+
+
+
+class PageCatalog(Collector):
+    """The metadata of every page rendered (or, in incremental builds, kept) by a build.
+
+    Attributes:
+        pages: Metadata of each page, keyed by the page's output path.
+    """
+
+    _drained = {"pages": dict}
+
+    def __init__(self) -> None:
+        self.pages: dict[str, PageInfo] = {}
+
+    def record(self, page: str, info: PageInfo) -> None:
+        """Set the metadata of output *page*, replacing any recorded before."""
+        self.pages[page] = info
+
+    def collection(self, root: str, name: str = DEFAULT_COLLECTION) -> list[tuple[str, PageInfo]]:
+        """Return ``(output, info)`` of the pages under *name*/, newest first.
+
+        The collection's own index page (*name*/``index.html``) is not part
+        of it. Pages are ordered by :attr:`PageInfo.date`, then output path.
+        """
+        prefix = f"{name.strip('/')}/"
+        pages = [
+            (output, info)
+            for output, info in self._outputs(root)
+            if output.startswith(prefix) and output != f"{prefix}index.html"
+        ]
+        pages.sort(key=lambda page: -page[1].date)
+        return pages
+
+    def write(
+        self,
+        root: str,
+        template: CompiledTemplate,
+        site_url: str,
+        collection: str = DEFAULT_COLLECTION,
+        changes: OutputChanges | None = None,
+    ) -> dict:
+        """Write the sitemap, the collection's feed and its index and tag pages under *root*.
+
+        Args:
+            root: The output directory the pages were written to.
+            template: Compiled page template for the index pages; its
+                basepath is also the base path of every URL.
+            site_url: Scheme and host the site is served from (e.g.
+                ``https://example.com``), as sitemaps and feeds need
+                absolute URLs.
+            collection: Directory, relative to *root*, of the collection.
+            changes: Optional record of written and removed outputs.
+
+        Returns:
+            The number of URLs and sitemap files, feed entries, index pages
+            and tag pages.
+        """
+        base_url = site_url.rstrip("/") + template.basepath.rstrip("/") + "/"
+        pages = self.collection(root, collection)
+        title = self._title(root, collection)
+        entries = write_feed(root, base_url, collection, title, pages, changes)
+        index_pages = write_index_pages(root, template, collection, title, pages, changes)
+        tag_pages = write_tag_pages(root, template, collection, title, pages, changes)
+        outputs = self._outputs(root) + index_pages + tag_pages
+        sitemaps = write_sitemap(root, base_url, outputs, changes)
+        return {
+            "urls": len(outputs),
+            "sitemaps": sitemaps,
+            "entries": entries,
+            "index_pages": len(index_pages),
+            "tag_pages": len(tag_pages),
+        }
+
+    def _outputs(self, root: str) -> list[tuple[str, PageInfo]]:
+        """Return ``(output, info)`` of every page, sorted by output path relative to *root*."""
+        return sorted(
+            (os.path.relpath(page, root).replace(os.sep, "/"), info) for page, info in self.pages.items()
+        )
+
+    def _title(self, root: str, collection: str) -> str:
+        """Return the title of *collection*'s own index page, or its capitalised name."""
+        info = self.pages.get(os.path.join(root, collection, "index.html"))
+        return info.title if info is not None and info.title else collection.strip("/").capitalize()
+
+    def __repr__(self) -> str:
+        return f"PageCatalog(pages={len(self.pages)})"
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+
+def timestamp(seconds: float) -> str:
+    """Format *seconds* since the epoch as an RFC 3339 UTC timestamp."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+def tag_slug(tag: str) -> str:
+    """Return the directory name of *tag*'s page: lower case, runs of other characters as ``-``.
+
+    Tags that differ only in case or punctuation share a page. A tag
+    without letters or digits has no page and gives ``""``.
+    """
+    return _SLUG_PATTERN.sub("-", tag.lower()).strip("-_")
+
+
+def write_sitemap(
+    root: str,
+    base_url: str,
+    pages: list[tuple[str, PageInfo]],
+    changes: OutputChanges | None = None,
+    limit: int = SITEMAP_URL_LIMIT,
+) -> int:
+    """Write ``sitemap.xml`` for *pages*, sharded into files of at most *limit* URLs.
+
+    Args:
+        root: The output directory.
+        base_url: Absolute URL of the site root, ending in ``/``.
+        pages: ``(output, info)`` of every page, in the order to list them.
+        changes: Optional record of written and removed sitemap files.
+        limit: URLs per sitemap file.
+
+    Returns:
+        The number of files holding URLs.
+    """
+    shards = [pages[i:i + limit] for i in range(0, len(pages), limit)] or [[]]
+    if len(shards) == 1:
+        with atomic_output(os.path.join(root, "sitemap.xml"), changes) as f:
+            _write_urlset(f, base_url, shards[0])
+        names = {"sitemap.xml"}
+    else:
+        names = {"sitemap.xml"}
+        with atomic_output(os.path.join(root, "sitemap.xml"), changes) as index:
+            index.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            index.write(f'<sitemapindex xmlns="{_SITEMAP_NAMESPACE}">\n')
+            for number, shard in enumerate(shards, 1):
+                name = f"sitemap-{number}.xml"
+                names.add(name)
+                with atomic_output(os.path.join(root, name), changes) as f:
+                    _write_urlset(f, base_url, shard)
+                updated = max(info.updated for _, info in shard)
+                index.write(
+                    f"<sitemap><loc>{escape(base_url + name)}</loc>"
+                    f"<lastmod>{timestamp(updated)}</lastmod></sitemap>\n"
+                )
+            index.write("</sitemapindex>\n")
+    # Shards left over from a larger site.
+    for name in sorted(os.listdir(root)):
+        if name not in names and re.fullmatch(r"sitemap-\d+\.xml", name):
+            _remove(os.path.join(root, name), changes)
+    return len(shards)
+
+
+def _write_urlset(f: OutputFile, base_url: str, pages: list[tuple[str, PageInfo]]) -> None:
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write(f'<urlset xmlns="{_SITEMAP_NAMESPACE}">\n')
+    for output, info in pages:
+        f.write(
+            f"<url><loc>{escape(base_url + page_url(output))}</loc>"
+            f"<lastmod>{timestamp(info.updated)}</lastmod></url>\n"
+        )
+    f.write("</urlset>\n")
+
+
+def write_feed(
+    root: str,
+    base_url: str,
+    collection: str,
+    title: str,
+    pages: list[tuple[str, PageInfo]],
+    changes: OutputChanges | None = None,
+    entries: int = FEED_ENTRIES,
+) -> int:
+    """Write the Atom feed of *collection*, listing its newest *entries* pages.
+
+    An empty collection has no feed; one written before is removed.
+
+    Args:
+        root: The output directory.
+        base_url: Absolute URL of the site root, ending in ``/``.
+        collection: Directory of the collection, relative to *root*.
+        title: Title of the feed.
+        pages: ``(output, info)`` of the collection's pages, newest first.
+        changes: Optional record of the written or removed feed.
+        entries: Maximum number of entries.
+
+    Returns:
+        The number of entries written.
+    """
+    path = os.path.join(root, collection, "feed.xml")
+    if not pages:
+        if os.path.isfile(path):
+            _remove(path, changes)
+        return 0
+    collection_url = base_url + collection.strip("/") + "/"
+    with atomic_output(path, changes) as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        f.write(f'<feed xmlns="{_ATOM_NAMESPACE}">\n')
+        f.write(f"<title>{escape(title)}</title>\n")
+        f.write(f"<id>{escape(collection_url)}</id>\n")
+        f.write(f'<link href="{escape(collection_url)}"/>\n')
+        f.write(f'<link rel="self" href="{escape(collection_url)}feed.xml"/>\n')
+        f.write(f"<updated>{timestamp(max(info.updated for _, info in pages))}</updated>\n")
+        f.write(f"<author><name>{escape(urlsplit(base_url).hostname or title)}</name></author>\n")
+        for output, info in pages[:entries]:
+            url = escape(base_url + page_url(output))
+            f.write(
+                f"<entry><title>{escape(info.title)}</title><id>{url}</id>"
+                f'<link href="{url}"/><updated>{timestamp(info.updated)}</updated>'
+            )
+            if info.published is not None:
+                f.write(f"<published>{timestamp(info.published)}</published>")
+            for tag in info.tags:
+                f.write(f'<category term="{escape(tag)}"/>')
+            f.write("</entry>\n")
+        f.write("</feed>\n")
+    return min(len(pages), entries)
+
+
+def write_index_pages(
+    root: str,
+    template: CompiledTemplate,
+    collection: str,
+    title: str,
+    pages: list[tuple[str, PageInfo]],
+    changes: OutputChanges | None = None,
+    page_size: int = INDEX_PAGE_SIZE,
+) -> list[tuple[str, PageInfo]]:
+    """Write *collection*/``page/<n>/index.html``, listing *pages* *page_size* at a time.
+
+    Each index page links to its newer and older neighbours. Index pages
+    beyond the last one needed are removed.
+
+    Args:
+        root: The output directory.
+        template: Compiled page template.
+        collection: Directory of the collection, relative to *root*.
+        title: Title of the collection.
+        pages: ``(output, info)`` of the collection's pages, newest first.
+        changes: Optional record of written and removed index pages.
+        page_size: Pages listed on each index page.
+
+    Returns:
+        ``(output, info)`` of each index page, for the sitemap.
+    """
+    directory = os.path.join(root, collection, "page")
+    prefix = f"/{collection.strip('/')}/page/"
+    count = -(-len(pages) // page_size)
+    written = []
+    for number in range(1, count + 1):
+        listed = pages[(number - 1) * page_size:number * page_size]
+        nav = []
+        if number > 1:
+            nav.append(f'<a href="{prefix}{number - 1}/" rel="prev">Newer</a>')
+        if number < count:
+            nav.append(f'<a href="{prefix}{number + 1}/" rel="next">Older</a>')
+        page_title = f"{title} (page {number} of {count})"
+        output = f"{collection.strip('/')}/page/{number}/index.html"
+        written.append(
+            _write_listing(root, template, output, collection, title, page_title, listed, nav, changes)
+        )
+    _remove_stale(directory, lambda name: name.isdigit() and int(name) > count, changes)
+    return written
+
+
+def write_tag_pages(
+    root: str,
+    template: CompiledTemplate,
+    collection: str,
+    title: str,
+    pages: list[tuple[str, PageInfo]],
+    changes: OutputChanges | None = None,
+) -> list[tuple[str, PageInfo]]:
+    """Write *collection*/``tags/<tag>/index.html`` for each tag of *pages*.
+
+    Each tag page lists every page with that tag. Pages of tags no longer
+    used are removed.
+
+    Args:
+        root: The output directory.
+        template: Compiled page template.
+        collection: Directory of the collection, relative to *root*.
+        title: Title of the collection.
+        pages: ``(output, info)`` of the collection's pages, newest first.
+        changes: Optional record of written and removed tag pages.
+
+    Returns:
+        ``(output, info)`` of each tag page, for the sitemap.
+    """
+    tagged: dict[str, tuple[str, list[tuple[str, PageInfo]]]] = {}
+    for output, info in pages:
+        for tag in info.tags:
+            slug = tag_slug(tag)
+            if not slug:
+                continue
+            listed = tagged.setdefault(slug, (tag, []))[1]
+            if not listed or listed[-1][0] != output:
+                listed.append((output, info))
+    written = []
+    for slug, (tag, listed) in sorted(tagged.items()):
+        output = f"{collection.strip('/')}/tags/{slug}/index.html"
+        page_title = f"{title}: {tag}"
+        written.append(
+            _write_listing(root, template, output, collection, page_title, page_title, listed, [], changes)
+        )
+    _remove_stale(os.path.join(root, collection, "tags"), lambda name: name not in tagged, changes)
+    return written
+
+
+def _write_listing(
+    root: str,
+    template: CompiledTemplate,
+    output: str,
+    collection: str,
+    heading: str,
+    page_title: str,
+    listed: list[tuple[str, PageInfo]],
+    nav: list[str],
+    changes: OutputChanges | None,
+) -> tuple[str, PageInfo]:
+    """Write the listing of *listed* pages to *output*, and return its sitemap entry."""
+    tags_prefix = f"/{collection.strip('/')}/tags/"
+    parts = [f"<h1>{escape(heading)}</h1><ul>"]
+    for page, info in listed:
+        day = time.strftime("%Y-%m-%d", time.gmtime(info.date))
+        parts.append(
+            f'<li><a href="/{escape(page_url(page))}">{escape(info.title)}</a> '
+            f'<time datetime="{timestamp(info.date)}">{day}</time>'
+        )
+        for tag in info.tags:
+            if tag_slug(tag):
+                parts.append(f' <a href="{tags_prefix}{escape(tag_slug(tag))}/" rel="tag">{escape(tag)}</a>')
+        parts.append("</li>")
+    parts.append("</ul><nav>")
+    parts.extend(nav)
+    parts.append("</nav>")
+    with atomic_output(os.path.join(root, output), changes) as f:
+        f.write(template.render(escape(page_title), "".join(parts)))
+    return output, PageInfo(max(info.updated for _, info in listed), page_title)
+
+
+def _remove_stale(directory: str, stale: Callable[[str], bool], changes: OutputChanges | None) -> None:
+    """Remove the ``<name>/index.html`` listings in *directory* whose name is *stale*."""
+    if not os.path.isdir(directory):
+        return
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name, "index.html")
+        if stale(name) and os.path.isfile(path):
+            _remove(path, changes)
+            with contextlib.suppress(OSError):
+                os.rmdir(os.path.dirname(path))
+    with contextlib.suppress(OSError):
+        os.rmdir(directory)
+
+
+def _remove(path: str, changes: OutputChanges | None = None) -> None:
+    os.remove(path)
+    if changes is not None:
+        changes.removed.append(path)
@@ -0,0 +1,63 @@
+"""Build-wide state that worker processes gather and the parent merges back.
+
+The link index, search index, catalog, record of changed outputs and block
+cache are each sent to the worker processes of a parallel build as a copy.
+A worker drains its copy after each unit of work and the parent absorbs the
+delta, so every page is reported to the parent's object exactly once.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, ClassVar, Iterable
+
+
+class Collector:
+    """Base for objects whose recorded state is drained in workers and absorbed in the parent.
+
+    Subclasses list the attributes that hold recorded state in
+    :attr:`_drained`, each with the factory of its empty value. Copies
+    sent to worker processes start with those attributes empty, so draining
+    them never reports the parent's state a second time.
+    """
+
+    # Attribute name -> factory of its empty value, in delta order.
+    _drained: ClassVar[dict[str, Callable[[], Any]]] = {}
+
+    def drain(self) -> tuple:
+        """Return and reset the state recorded so far (see :meth:`absorb`)."""
+        delta = tuple(getattr(self, name) for name in self._drained)
+        for name, empty in self._drained.items():
+            setattr(self, name, empty())
+        return delta
+
+    def absorb(self, delta: tuple) -> None:
+        """Merge state drained from a copy of this object in a worker process."""
+        for name, value in zip(self._drained, delta):
+            self._merge(name, value)
+
+    def _merge(self, name: str, value: Any) -> None:
+        """Merge one drained attribute: dicts are updated, lists extended and counters added."""
+        current = getattr(self, name)
+        if isinstance(current, dict):
+            current.update(value)
+        elif isinstance(current, list):
+            current.extend(value)
+        else:
+            setattr(self, name, current + value)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update((name, empty()) for name, empty in self._drained.items())
+        return state
+
+
+def drain_all(collectors: Iterable[Collector | None]) -> tuple:
+    """Drain each of *collectors*; None stands in for those a build does not keep."""
+    return tuple(collector.drain() if collector is not None else None for collector in collectors)
+
+
+def absorb_all(collectors: Iterable[Collector | None], deltas: tuple) -> None:
+    """Absorb *deltas*, from :func:`drain_all`, into the matching *collectors*."""
+    for collector, delta in zip(collectors, deltas):
+        if collector is not None:
+            collector.absorb(delta)
@@ -0,0 +1,216 @@
+"""Pre-compressed ``.gz``/``.br`` variants of the built site, for static serving.
+
+Servers such as nginx (``gzip_static``/``brotli_static``) send ``page.html.gz``
+in place of ``page.html`` when it exists, so compressing once at build time
+saves doing it on every request. Brotli is used when the optional ``brotli``
+module is installed; gzip is always available.
+
+Each variant is given the modification time of its source, which is how a
+later build tells that it is still up to date. Because unchanged pages keep
+their modification time (see :func:`file_operations.write_page`), only pages
+whose HTML changed are compressed again.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterable
+
+from discovery import Discovery
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+if TYPE_CHECKING:
+    from manifest import OutputChanges
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js")
+
+# File suffix of each supported encoding.
+ENCODING_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Walks the output as it is on disk, never following links out of it.
+_OUTPUT_FILES = Discovery(symlinks="skip")
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Return the encodings this interpreter can produce, gzip first."""
+    return ("gzip", "br") if brotli is not None else ("gzip",)
+
+
+def is_compressed_variant(rel_path: str) -> bool:
+    """Return True if *rel_path* is a ``.gz``/``.br`` variant of a compressible file."""
+    base, suffix = os.path.splitext(rel_path)
+    return suffix in ENCODING_SUFFIXES.values() and base.endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the output byte-identical for identical input.
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+class CompressionResult:
+    """Summary of a :func:`compress_directory` run.
+
+    Attributes:
+        written: Variant paths that were (re)written.
+        up_to_date: Variant paths already matching their source.
+        removed: Variant paths deleted because their source is gone.
+        bytes_in: Bytes of source compressed, per encoding.
+        bytes_out: Bytes of compressed output written, per encoding.
+        seconds: Wall time of the run.
+    """
+
+    def __init__(self, encodings: Iterable[str] = ()) -> None:
+        self.written: list[str] = []
+        self.up_to_date: list[str] = []
+        self.removed: list[str] = []
+        self.bytes_in: dict[str, int] = dict.fromkeys(encodings, 0)
+        self.bytes_out: dict[str, int] = dict.fromkeys(encodings, 0)
+        self.seconds = 0.0
+
+    def ratio(self, encoding: str) -> float:
+        """Return compressed size over original size for *encoding* (0.0 if nothing ran)."""
+        return self.bytes_out[encoding] / self.bytes_in[encoding] if self.bytes_in[encoding] else 0.0
+
+    def report(self) -> str:
+        """Return a one-line summary with the ratio of each encoding."""
+        line = (
+            f"Compression: {len(self.written)} written, {len(self.up_to_date)} up to date, "
+            f"{len(self.removed)} removed in {self.seconds:.2f}s"
+        )
+        ratios = [
+            f"{encoding} {self.bytes_in[encoding]:,} -> {self.bytes_out[encoding]:,} bytes "
+            f"({self.ratio(encoding):.1%})"
+            for encoding in self.bytes_in
+            if self.bytes_in[encoding]
+        ]
+        return "; ".join([line, *ratios])
+
+    def __repr__(self) -> str:
+        return (
+            f"CompressionResult(written={len(self.written)}, up_to_date={len(self.up_to_date)}, "
+            f"removed={len(self.removed)})"
+        )
+
+
+# (source path, encodings to produce) for one file, and what was written for it.
+_Task = tuple[str, tuple[str, ...]]
+_TaskResult = list[tuple[str, str, int, int]]
+
+
+def _compress_one(task: _Task) -> _TaskResult:
+    """Write the variants of one file; return ``(encoding, path, in, out)`` for each."""
+    src_path, encodings = task
+    # Stat first: if the file changes while being read, the variant gets the
+    # older mtime and is redone by the next build.
+    stat = os.stat(src_path)
+    with open(src_path, "rb") as f:
+        data = f.read()
+    written = []
+    for encoding in encodings:
+        variant_path = src_path + ENCODING_SUFFIXES[encoding]
+        compressed = _compress(data, encoding)
+        tmp_path = f"{variant_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, variant_path)
+        written.append((encoding, variant_path, len(data), len(compressed)))
+    return written
+
+
+def _compress_chunk(chunk: list[_Task]) -> list[_TaskResult]:
+    return [_compress_one(task) for task in chunk]
+
+
+def _is_up_to_date(src_stat: os.stat_result, variant_path: str) -> bool:
+    try:
+        return os.stat(variant_path).st_mtime_ns == src_stat.st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def compress_directory(
+    root: str,
+    jobs: int = 1,
+    encodings: Iterable[str] | None = None,
+    changes: OutputChanges | None = None,
+) -> CompressionResult:
+    """Write compressed variants of every HTML, CSS and JS file under *root*.
+
+    Files whose variants already carry their modification time are skipped,
+    and variants whose source no longer exists are removed. The remaining
+    files are compressed in chunks across a process pool.
+
+    Args:
+        root: Output directory to compress (typically ``docs/``).
+        jobs: Number of worker processes; ``1`` compresses in-process.
+        encodings: Encodings to produce (default: :func:`available_encodings`).
+        changes: Optional record of written and removed variants.
+
+    Returns:
+        A :class:`CompressionResult` with the sizes and time spent.
+
+    Raises:
+        ValueError: If an encoding is unknown or its module is not installed.
+    """
+    encodings = tuple(encodings) if encodings is not None else available_encodings()
+    for encoding in encodings:
+        if encoding not in available_encodings():
+            raise ValueError(f"Unsupported or unavailable encoding: {encoding}")
+
+    start = time.perf_counter()
+    result = CompressionResult(encodings)
+    files = _OUTPUT_FILES.scan(root).files
+    present = set(files)
+    tasks: list[_Task] = []
+    for rel_path in files:
+        path = os.path.join(root, rel_path)
+        if is_compressed_variant(rel_path):
+            if os.path.splitext(rel_path)[0] not in present:
+                os.remove(path)
+                result.removed.append(path)
+                if changes is not None:
+                    changes.removed.append(path)
+            continue
+        if not rel_path.endswith(COMPRESSIBLE_EXTENSIONS):
+            continue
+        src_stat = os.stat(path)
+        stale = []
+        for encoding in encodings:
+            variant_path = path + ENCODING_SUFFIXES[encoding]
+            if _is_up_to_date(src_stat, variant_path):
+                result.up_to_date.append(variant_path)
+            else:
+                stale.append(encoding)
+        if stale:
+            tasks.append((path, tuple(stale)))
+
+    if jobs > 1 and len(tasks) > 1:
+        chunk_size = max(1, -(-len(tasks) // (jobs * 4)))
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            outcomes = [item for chunk in executor.map(_compress_chunk, chunks) for item in chunk]
+    else:
+        outcomes = _compress_chunk(tasks)
+
+    for written in outcomes:
+        for encoding, variant_path, size_in, size_out in written:
+            result.written.append(variant_path)
+            result.bytes_in[encoding] += size_in
+            result.bytes_out[encoding] += size_out
+            if changes is not None:
+                changes.record(variant_path, True)
+    result.seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,176 @@
+"""Directory discovery shared by page generation and asset copying.
+
+One :func:`os.scandir` walk per tree produces a flat, sorted plan of files and
+directories. ``scandir`` reports each entry's type from the directory listing
+itself, so, unlike ``os.listdir`` followed by ``os.path.isfile`` and
+``os.path.isdir``, classifying an entry costs no extra ``stat`` call. Only
+directories are stat'ed, and only when following symlinks (to detect loops).
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from typing import Iterable
+
+SYMLINK_POLICIES = ("follow", "skip")
+
+
+def page_destination(src_path: str, dir_path_content: str, dest_dir_path: str) -> str:
+    """Return the HTML output path for the markdown file *src_path*."""
+    rel_path = os.path.relpath(src_path, dir_path_content)
+    return os.path.join(dest_dir_path, rel_path).replace(".md", ".html")
+
+
+def page_url(output: str) -> str:
+    """Return the URL path of *output*, relative to the base path.
+
+    *output* is relative to the output root, with ``/`` separators. Index
+    pages are served as their directory (``blog/index.html`` -> ``blog/``);
+    other files, ``myindex.html`` included, keep their name.
+    """
+    if output == "index.html" or output.endswith("/index.html"):
+        return output[: -len("index.html")]
+    return output
+
+
+class TreeScan:
+    """Everything found under one root by :meth:`Discovery.scan`.
+
+    Attributes:
+        root: The directory that was scanned.
+        files: File paths relative to *root*, sorted.
+        dirs: Directory paths relative to *root*, sorted (parents first).
+        stats: ``(mtime_ns, size)`` of each file, keyed like :attr:`files`;
+            empty unless the scan was asked for them.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        files: list[str],
+        dirs: list[str],
+        stats: dict[str, tuple[int, int]] | None = None,
+    ) -> None:
+        self.root = root
+        self.files = files
+        self.dirs = dirs
+        self.stats = stats if stats is not None else {}
+
+    def __repr__(self) -> str:
+        return f"TreeScan({self.root!r}, files={len(self.files)}, dirs={len(self.dirs)})"
+
+
+class Discovery:
+    """Walks source trees, applying ignore patterns and a symlink policy.
+
+    Args:
+        ignore: Glob patterns (``fnmatch`` syntax). An entry is skipped when
+            a pattern matches its name or its ``/``-separated path relative to
+            the root; ignored directories are not descended into.
+        symlinks: ``"follow"`` treats links as the file or directory they
+            point to (links that would loop back into an ancestor are
+            skipped); ``"skip"`` leaves every symlink out.
+
+    Raises:
+        ValueError: If *symlinks* is not one of :data:`SYMLINK_POLICIES`.
+    """
+
+    def __init__(self, ignore: Iterable[str] = (), symlinks: str = "follow") -> None:
+        if symlinks not in SYMLINK_POLICIES:
+            raise ValueError(f"Unknown symlink policy: {symlinks}")
+        self.ignore = tuple(ignore)
+        self.symlinks = symlinks
+        # All patterns folded into one regex, so each entry is matched once.
+        self._ignore_match = (
+            re.compile("|".join(fnmatch.translate(pattern) for pattern in self.ignore)).match
+            if self.ignore
+            else None
+        )
+
+    def _ignored(self, name: str, rel_path: str) -> bool:
+        if self._ignore_match is None:
+            return False
+        if os.sep != "/":
+            rel_path = rel_path.replace(os.sep, "/")
+        return self._ignore_match(name) is not None or self._ignore_match(rel_path) is not None
+
+    def is_ignored(self, rel_path: str) -> bool:
+        """Return True if :meth:`scan` would leave out *rel_path* (relative to its root)."""
+        parts = os.path.normpath(rel_path).split(os.sep)
+        return any(
+            self._ignored(parts[i], os.path.join(*parts[:i + 1])) for i in range(len(parts))
+        )
+
+    def scan(self, root: str, stats: bool = False) -> TreeScan:
+        """Walk *root* once and return its files and directories.
+
+        Args:
+            root: The directory to walk.
+            stats: Also record the modification time and size of each file,
+                as watch mode needs to spot changes; one ``stat`` per file.
+        """
+        follow = self.symlinks == "follow"
+        files: list[str] = []
+        dirs: list[str] = []
+        file_stats: dict[str, tuple[int, int]] = {}
+        root_stat = os.stat(root)
+        stack: list[tuple[str, frozenset]] = [("", frozenset([(root_stat.st_dev, root_stat.st_ino)]))]
+        while stack:
+            rel_dir, ancestors = stack.pop()
+            try:
+                entries = os.scandir(os.path.join(root, rel_dir))
+            except FileNotFoundError:
+                # Removed after its parent was listed: sources may change while
+                # a watcher scans them.
+                if not rel_dir:
+                    raise
+                continue
+            with entries:
+                for entry in entries:
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    if self._ignored(entry.name, rel_path):
+                        continue
+                    if not follow and entry.is_symlink():
+                        continue
+                    if entry.is_dir():
+                        if follow:
+                            stat = entry.stat()
+                            identity = (stat.st_dev, stat.st_ino)
+                            if identity in ancestors:
+                                continue
+                            stack.append((rel_path, ancestors | {identity}))
+                        else:
+                            stack.append((rel_path, ancestors))
+                        dirs.append(rel_path)
+                    elif entry.is_file():
+                        if stats:
+                            try:
+                                stat = entry.stat()
+                            except FileNotFoundError:
+                                continue
+                            file_stats[rel_path] = (stat.st_mtime_ns, stat.st_size)
+                        files.append(rel_path)
+        files.sort()
+        dirs.sort()
+        return TreeScan(root, files, dirs, file_stats)
+
+    def pages(self, dir_path_content: str, dest_dir_path: str) -> list[tuple[str, str]]:
+        """Return every ``(markdown, html)`` page pair, sorted by source path."""
+        pages = []
+        for rel_path in self.scan(dir_path_content).files:
+            if rel_path.endswith(".md"):
+                pages.append((
+                    os.path.join(dir_path_content, rel_path),
+                    os.path.join(dest_dir_path, rel_path).replace(".md", ".html"),
+                ))
+        return pages
+
+    def __repr__(self) -> str:
+        return f"Discovery(ignore={self.ignore!r}, symlinks={self.symlinks!r})"
+
+
+# Used when callers do not pass their own: nothing ignored, symlinks followed,
+# which matches what os.path.isfile / os.path.isdir walks did before.
+DEFAULT_DISCOVERY = Discovery()
@@ -1,20 +1,47 @@
-"""File operations: directory copying, title extraction, and HTML page generation."""
+"""File operations: directory copying and syncing, title extraction, and HTML page generation."""
 
 from __future__ import annotations
 
 import os
+import re
 import shutil
-
-from block_markdown import markdown_to_html_node
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Iterable, TextIO
+
+from block_markdown import iter_html_blocks, iter_line_blocks, markdown_to_html_node
+from catalog import PageInfo
+from discovery import DEFAULT_DISCOVERY, Discovery
+from front_matter import FrontMatter, published_pages, split_front_matter, split_front_matter_lines
+from links import collect_links
+from manifest import atomic_output, hash_file
+from page_template import CompiledTemplate
+from profiling import PageProfile
+from search_index import PageText
+
+if TYPE_CHECKING:
+    from block_cache import BlockCache
+    from catalog import PageCatalog
+    from htmlnode import HTMLNode, ParentNode
+    from links import Link, LinkIndex
+    from search_index import SearchIndex
+    from manifest import OutputChanges
+    from profiling import BuildProfiler
 
 
 # ---------------------------------------------------------------------------
 # Title extraction
 # ---------------------------------------------------------------------------
 
+# Start of a line that may be an h1; whitespace other than newlines may precede it.
+_H1_PATTERN = re.compile(r"^[^\S\n]*# ", re.MULTILINE)
+
+
 def extract_title(markdown: str) -> str:
     """Return the text of the first h1 heading in *markdown*.
 
+    The document is searched up to that heading only; it is never split
+    into lines.
+
     Args:
         markdown: Full markdown document string.
 
@@ -24,7 +51,17 @@ def extract_title(markdown: str) -> str:
     Raises:
         Exception: If no h1 heading (``# Title``) is found.
     """
-    for line in markdown.split("\n"):
+    for match in _H1_PATTERN.finditer(markdown):
+        end = markdown.find("\n", match.end())
+        line = markdown[match.start():end if end != -1 else len(markdown)].strip()
+        # "# " followed by nothing but whitespace strips to "#", which is not a heading.
+        if line.startswith("# "):
+            return line[2:].strip()
+    raise Exception("No h1 header found in markdown")
+
+
+def _title_from_lines(lines: Iterable[str]) -> str:
+    for line in lines:
         stripped = line.strip()
         if stripped.startswith("# "):
             return stripped[2:].strip()
@@ -35,47 +72,322 @@ def extract_title(markdown: str) -> str:
 # Directory copying
 # ---------------------------------------------------------------------------
 
-def copy_directory(src: str, dst: str) -> None:
+def copy_directory(
+    src: str,
+    dst: str,
+    clean: bool = True,
+    discovery: Discovery | None = None,
+    changes: OutputChanges | None = None,
+) -> None:
     """Recursively copy *src* directory to *dst*, replacing *dst* if it exists.
 
     Args:
         src: Path to the source directory.
         dst: Path to the destination directory (will be recreated from scratch).
+        clean: When False, *dst* is kept and files are copied over it, so
+            previously generated pages survive (used by incremental builds).
+        discovery: Ignore patterns and symlink policy for walking *src*.
+        changes: Optional record that every copied file was written.
     """
-    if os.path.exists(dst):
+    if clean and os.path.exists(dst):
         shutil.rmtree(dst)
-    os.mkdir(dst)
-    _copy_contents(src, dst)
+    os.makedirs(dst, exist_ok=True)
+    scan = (discovery or DEFAULT_DISCOVERY).scan(src)
+    for rel_dir in scan.dirs:
+        dst_path = os.path.join(dst, rel_dir)
+        print(f"Creating directory: {dst_path}")
+        os.makedirs(dst_path, exist_ok=True)
+    for rel_path in scan.files:
+        src_path = os.path.join(src, rel_path)
+        dst_path = os.path.join(dst, rel_path)
+        print(f"Copying file: {src_path} -> {dst_path}")
+        shutil.copy(src_path, dst_path)
+        if changes is not None:
+            changes.record(dst_path, True)
+
+
+# ---------------------------------------------------------------------------
+# Incremental asset sync
+# ---------------------------------------------------------------------------
+
+# ioctl request number for FICLONE (reflink) on Linux: _IOW(0x94, 9, int).
+_FICLONE = 0x40049409
+
+# Walks the destination as it is on disk, never following links out of it.
+_EXISTING_FILES = Discovery(symlinks="skip")
+
+
+class SyncResult:
+    """Summary of a :func:`sync_directory` run.
+
+    Attributes:
+        copied: Destination paths that were (re)written.
+        unchanged: Destination paths already up to date.
+        removed: Destination paths deleted because their source is gone.
+    """
+
+    def __init__(self) -> None:
+        self.copied: list[str] = []
+        self.unchanged: list[str] = []
+        self.removed: list[str] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"SyncResult(copied={len(self.copied)}, unchanged={len(self.unchanged)}, "
+            f"removed={len(self.removed)})"
+        )
+
+
+def is_generated_page(rel_path: str) -> bool:
+    """Default protection rule for :func:`sync_directory`: keep generated HTML."""
+    return rel_path.endswith(".html")
+
+
+def protect_any(*rules: Callable[[str], bool]) -> Callable[[str], bool]:
+    """Combine protection rules for :func:`sync_directory`: keep what any of *rules* keeps.
+
+    Callers pass the output names of the stages they run (compressed
+    variants, the search index, sitemaps and feeds); those stages remove
+    what they no longer need themselves.
+    """
+    return lambda rel_path: any(rule(rel_path) for rule in rules)
 
 
-def _copy_contents(src: str, dst: str) -> None:
-    """Recursively copy the contents of *src* into *dst*."""
-    for item in os.listdir(src):
-        src_path = os.path.join(src, item)
-        dst_path = os.path.join(dst, item)
+def sync_directory(
+    src: str,
+    dst: str,
+    compare: str = "mtime",
+    link: bool = False,
+    protect: Callable[[str], bool] | None = is_generated_page,
+    discovery: Discovery | None = None,
+) -> SyncResult:
+    """Make *dst* mirror the files of *src*, copying only what changed.
 
-        if os.path.isfile(src_path):
-            print(f"Copying file: {src_path} -> {dst_path}")
-            shutil.copy(src_path, dst_path)
-        elif os.path.isdir(src_path):
-            print(f"Creating directory: {dst_path}")
-            os.mkdir(dst_path)
-            _copy_contents(src_path, dst_path)
+    Unlike :func:`copy_directory`, *dst* is never wiped: unchanged assets
+    are left in place and files in *dst* without a counterpart in *src* are
+    deleted unless *protect* says they belong to someone else (by default,
+    generated ``.html`` pages).
+
+    Args:
+        src: Path to the source directory.
+        dst: Path to the destination directory.
+        compare: ``"mtime"`` treats a file as unchanged when size and
+            modification time match; ``"hash"`` compares SHA-256 digests.
+        link: Hardlink files instead of copying them where the filesystem
+            allows it (falls back to copying across devices).
+        protect: Predicate on the path relative to *dst*; matching orphan
+            files are kept. ``None`` removes every orphan.
+        discovery: Ignore patterns and symlink policy for walking *src*.
+            *dst* is always walked in full without following symlinks.
+
+    Returns:
+        A :class:`SyncResult` describing what was done.
+
+    Raises:
+        ValueError: If *compare* is not ``"mtime"`` or ``"hash"``.
+    """
+    if compare not in ("mtime", "hash"):
+        raise ValueError(f"Unknown compare mode: {compare}")
+
+    result = SyncResult()
+    os.makedirs(dst, exist_ok=True)
+    wanted: set[str] = set()
+    for rel_path in (discovery or DEFAULT_DISCOVERY).scan(src).files:
+        wanted.add(rel_path)
+        src_path = os.path.join(src, rel_path)
+        dst_path = os.path.join(dst, rel_path)
+        if _is_up_to_date(src_path, dst_path, compare):
+            result.unchanged.append(dst_path)
+            continue
+        print(f"Syncing file: {src_path} -> {dst_path}")
+        sync_file(src_path, dst_path, link)
+        result.copied.append(dst_path)
+
+    existing = _EXISTING_FILES.scan(dst)
+    for rel_path in existing.files:
+        if rel_path in wanted or (protect is not None and protect(rel_path)):
+            continue
+        dst_path = os.path.join(dst, rel_path)
+        print(f"Removing orphaned file: {dst_path}")
+        os.remove(dst_path)
+        result.removed.append(dst_path)
+    # Reverse sorted order visits children before their parents.
+    for rel_dir in reversed(existing.dirs):
+        dir_path = os.path.join(dst, rel_dir)
+        if not os.listdir(dir_path):
+            os.rmdir(dir_path)
+    return result
+
+
+def _is_up_to_date(src_path: str, dst_path: str, compare: str) -> bool:
+    try:
+        dst_stat = os.stat(dst_path)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if compare == "mtime":
+        return src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+    return hash_file(src_path) == hash_file(dst_path)
+
+
+def sync_file(src_path: str, dst_path: str, link: bool = False) -> None:
+    """Atomically put a copy (or hardlink) of *src_path* at *dst_path*.
+
+    Copies keep the source's modification time, which is what
+    :func:`sync_directory` compares on the next run.
+    """
+    os.makedirs(os.path.dirname(dst_path) or ".", exist_ok=True)
+    tmp_path = f"{dst_path}.sync-tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    if link:
+        try:
+            os.link(src_path, tmp_path)
+        except OSError:
+            link = False
+    if not link:
+        _fast_copy(src_path, tmp_path)
+        shutil.copystat(src_path, tmp_path)
+    os.replace(tmp_path, dst_path)
+
+
+def _fast_copy(src_path: str, dst_path: str) -> None:
+    """Copy file data using a reflink or ``copy_file_range`` when available."""
+    with open(src_path, "rb") as fsrc, open(dst_path, "wb") as fdst:
+        try:
+            import fcntl
+
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return
+        except (ImportError, OSError):
+            pass
+        copy_file_range = getattr(os, "copy_file_range", None)
+        if copy_file_range is not None:
+            size = os.fstat(fsrc.fileno()).st_size
+            try:
+                copied = 0
+                while copied < size:
+                    sent = copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+                if copied == size:
+                    return
+            except OSError:
+                pass
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst)
+
+
+# ---------------------------------------------------------------------------
+# Per-page collectors
+# ---------------------------------------------------------------------------
+
+class PageCollectors:
+    """What rendering one page gathers for the build's link index, search index and catalog.
+
+    A collector is None when the build does not keep the matching index.
+
+    Attributes:
+        links: Receives the ``(tag, url)`` of every link and image in the
+            page body (see :func:`links.collect_links`).
+        text: Collects the page's title and words, for the search index
+            (see :class:`search_index.PageText`).
+        info: Metadata of the page for the site catalog; its title, date
+            and tags are set (see :class:`catalog.PageInfo`).
+    """
+
+    __slots__ = ("links", "text", "info")
+
+    def __init__(
+        self,
+        links: list[Link] | None = None,
+        text: PageText | None = None,
+        info: PageInfo | None = None,
+    ) -> None:
+        self.links = links
+        self.text = text
+        self.info = info
+
+    @classmethod
+    def for_build(
+        cls,
+        src_path: str,
+        links: LinkIndex | None = None,
+        search: SearchIndex | None = None,
+        catalog: PageCatalog | None = None,
+    ) -> PageCollectors:
+        """Return fresh collectors for the indexes a build keeps, to render *src_path*."""
+        return cls(
+            [] if links is not None else None,
+            PageText() if search is not None else None,
+            PageInfo(os.stat(src_path).st_mtime) if catalog is not None else None,
+        )
+
+    def add(self, node: HTMLNode) -> None:
+        """Collect the links and words of *node*, the page body or one of its blocks."""
+        if self.links is not None:
+            collect_links(node, self.links)
+        if self.text is not None:
+            self.text.add(node)
+
+    def describe(self, title: str, front_matter: FrontMatter) -> None:
+        """Set the page's *title*, and its date and tags from *front_matter*."""
+        if self.text is not None:
+            self.text.title = title
+        if self.info is not None:
+            self.info.describe(title, front_matter)
+
+    def record(
+        self,
+        dest_path: str,
+        links: LinkIndex | None = None,
+        search: SearchIndex | None = None,
+        catalog: PageCatalog | None = None,
+    ) -> None:
+        """Record what was gathered in the build's indexes, under *dest_path*."""
+        if links is not None:
+            links.record(dest_path, self.links)
+        if search is not None:
+            search.record(dest_path, self.text)
+        if catalog is not None:
+            catalog.record(dest_path, self.info)
 
 
 # ---------------------------------------------------------------------------
 # Page generation
 # ---------------------------------------------------------------------------
 
+# Sources at least this large (in bytes) are rendered block by block with
+# stream_page_file instead of being read and parsed whole.
+STREAM_THRESHOLD = 64 * 1024 * 1024
+
+
 def generate_page(
-    from_path: str, template_path: str, dest_path: str, basepath: str = "/"
+    from_path: str,
+    template_path: str,
+    dest_path: str,
+    basepath: str = "/",
+    template: CompiledTemplate | None = None,
+    profiler: BuildProfiler | None = None,
+    cache: BlockCache | None = None,
+    stream_threshold: int | None = STREAM_THRESHOLD,
+    changes: OutputChanges | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
 ) -> None:
     """Convert a single markdown file to HTML using a template.
 
     Reads the markdown from *from_path* and the HTML template from
     *template_path*, converts the markdown, substitutes ``{{ Title }}`` and
     ``{{ Content }}`` placeholders, adjusts absolute paths for *basepath*,
-    then writes the result to *dest_path*.
+    then writes the result to *dest_path* unless it already holds exactly
+    that HTML.
 
     Args:
         from_path: Path to the source ``.md`` file.
@@ -83,30 +395,306 @@ def generate_page(
         dest_path: Destination path for the generated HTML file.
         basepath: URL base path prefix for ``href="/..."`` and ``src="/..."``
             attributes (default ``"/"``).
+        template: Already compiled template for *template_path* and
+            *basepath*. When omitted the template is read and compiled here.
+        profiler: Optional build profiler; when given, the page is rendered
+            in separately timed stages and its profile is added.
+        cache: Optional block cache shared between pages.
+        stream_threshold: Source size in bytes from which the page is
+            rendered by :func:`stream_page_file` (default
+            :data:`STREAM_THRESHOLD`). ``None`` never streams.
+        changes: Optional record of whether *dest_path* was rewritten.
+        links: Optional link index; the page's links and images are
+            recorded in it under *dest_path*.
+        search: Optional search index; the page's text is recorded in it
+            under *dest_path*.
+        catalog: Optional site catalog; the page's title and source
+            modification time are recorded in it under *dest_path*.
     """
     print(f"Generating page from {from_path} using template {template_path} to {dest_path}")
 
+    if template is None:
+        template = CompiledTemplate.load(template_path, basepath)
+
+    collectors = PageCollectors.for_build(from_path, links, search, catalog)
+    if profiler is not None:
+        profile = PageProfile(from_path)
+        profile_page(from_path, template, dest_path, profile, cache, changes, collectors)
+        profiler.add(profile)
+    else:
+        render_page_file(from_path, template, dest_path, cache, stream_threshold, changes, collectors)
+    collectors.record(dest_path, links, search, catalog)
+
+
+def _parse_page(
+    markdown_content: str,
+    template: CompiledTemplate,
+    cache: BlockCache | None = None,
+    collectors: PageCollectors | None = None,
+    profile: PageProfile | None = None,
+) -> tuple[CompiledTemplate, str, ParentNode]:
+    """Parse a whole markdown document and fill *collectors* from it.
+
+    Returns:
+        The template its front matter selects, its title and the root node
+        of its body.
+    """
+    front_matter, markdown_content = split_front_matter(markdown_content)
+    template = template.for_page(front_matter.template)
+    html_node = markdown_to_html_node(markdown_content, profile, cache)
+    title = front_matter.title or extract_title(markdown_content)
+    if collectors is not None:
+        collectors.add(html_node)
+        collectors.describe(title, front_matter)
+    return template, title, html_node
+
+
+def render_page(
+    markdown_content: str,
+    template: CompiledTemplate,
+    cache: BlockCache | None = None,
+    collectors: PageCollectors | None = None,
+) -> str:
+    """Render *markdown_content* into *template* and return the HTML.
+
+    This is the in-memory counterpart of :func:`stream_page`: no files are
+    read or written.
+
+    Args:
+        markdown_content: Full markdown document string, optionally starting
+            with front matter (see :mod:`front_matter`).
+        template: Compiled page template; its basepath is applied to
+            absolute ``href``/``src`` values. Front matter may name another
+            template (see :meth:`CompiledTemplate.for_page`).
+        cache: Optional block cache passed to :func:`markdown_to_html_node`.
+        collectors: Optional per-page collectors that receive the page's
+            links, words and metadata (see :class:`PageCollectors`).
+
+    Returns:
+        The final HTML document.
+    """
+    template, title, html_node = _parse_page(markdown_content, template, cache, collectors)
+    return template.render(title, html_node.to_html())
+
+
+def render_page_file(
+    from_path: str,
+    template: CompiledTemplate,
+    dest_path: str,
+    cache: BlockCache | None = None,
+    stream_threshold: int | None = STREAM_THRESHOLD,
+    changes: OutputChanges | None = None,
+    collectors: PageCollectors | None = None,
+    known_hash: str | None = None,
+) -> str:
+    """Render the markdown file *from_path* to *dest_path*.
+
+    Sources smaller than *stream_threshold* bytes are read whole and
+    rendered by :func:`stream_page`; larger ones go through
+    :func:`stream_page_file`. Both produce the same file.
+
+    Args:
+        from_path: Path to the source ``.md`` file.
+        template: Compiled page template.
+        dest_path: Destination path for the generated HTML file.
+        cache: Optional block cache.
+        stream_threshold: Size in bytes from which the page is streamed;
+            ``0`` streams every page and ``None`` none.
+        changes: Optional record of whether *dest_path* was rewritten.
+        collectors: Optional per-page collectors for the build's indexes.
+        known_hash: SHA-256 *dest_path* is known to hold already, compared
+            instead of reading it back (see :func:`manifest.atomic_output`).
+
+    Returns:
+        The hex SHA-256 digest of the rendered HTML (UTF-8 encoded).
+    """
+    if stream_threshold is not None and os.path.getsize(from_path) >= stream_threshold:
+        return stream_page_file(from_path, template, dest_path, cache, changes, collectors, known_hash)
     with open(from_path, "r", encoding="utf-8") as f:
         markdown_content = f.read()
+    return stream_page(markdown_content, template, dest_path, cache, changes, collectors, known_hash)
 
-    with open(template_path, "r", encoding="utf-8") as f:
-        template_content = f.read()
 
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-    title = extract_title(markdown_content)
+def write_page(
+    dest_path: str, html: str, changes: OutputChanges | None = None, known_hash: str | None = None
+) -> str:
+    """Write the rendered *html* to *dest_path* if it differs from the file there.
 
-    final_html = template_content.replace("{{ Title }}", title)
-    final_html = final_html.replace("{{ Content }}", html_content)
-    final_html = final_html.replace('href="/', f'href="{basepath}')
-    final_html = final_html.replace('src="/', f'src="{basepath}')
+    Args:
+        dest_path: Destination path for the HTML file.
+        html: The page HTML.
+        changes: Optional record of whether *dest_path* was rewritten.
+        known_hash: SHA-256 *dest_path* is known to hold already, compared
+            instead of reading it back (see :func:`manifest.atomic_output`).
 
-    dest_dir = os.path.dirname(dest_path)
-    if dest_dir:
-        os.makedirs(dest_dir, exist_ok=True)
+    Returns:
+        The hex SHA-256 digest of the HTML (UTF-8 encoded).
+    """
+    with atomic_output(dest_path, changes, known_hash) as out:
+        out.write(html)
+    return out.digest.hexdigest()
+
+
+def stream_page(
+    markdown_content: str,
+    template: CompiledTemplate,
+    dest_path: str,
+    cache: BlockCache | None = None,
+    changes: OutputChanges | None = None,
+    collectors: PageCollectors | None = None,
+    known_hash: str | None = None,
+) -> str:
+    """Render *markdown_content* into *template* and stream it to *dest_path*.
+
+    The body is written fragment by fragment between the template segments
+    instead of being built as one string first. Output goes to a temporary
+    file that replaces *dest_path* only once complete, so readers (such as
+    the watch-mode server) never see a partial page, and only if the HTML
+    changed, so unchanged pages keep their modification time.
 
-    with open(dest_path, "w", encoding="utf-8") as f:
-        f.write(final_html)
+    Args:
+        markdown_content: Full markdown document string.
+        template: Compiled page template.
+        dest_path: Destination path for the generated HTML file.
+        cache: Optional block cache passed to :func:`markdown_to_html_node`.
+        changes: Optional record of whether *dest_path* was rewritten.
+        collectors: Optional per-page collectors for the build's indexes.
+        known_hash: SHA-256 *dest_path* is known to hold already, compared
+            instead of reading it back (see :func:`manifest.atomic_output`).
+
+    Returns:
+        The hex SHA-256 digest of the rendered HTML (UTF-8 encoded).
+    """
+    template, title, html_node = _parse_page(markdown_content, template, cache, collectors)
+    with atomic_output(dest_path, changes, known_hash) as out:
+        template.render_to(out, title, html_node)
+    return out.digest.hexdigest()
+
+
+class _MarkdownFileBody:
+    """Page body that parses and renders a markdown file block by block.
+
+    Stands in for the root node in :meth:`CompiledTemplate.render_to`; the
+    file is read when the content slot is written.
+    """
+
+    def __init__(
+        self, path: str, cache: BlockCache | None = None, collectors: PageCollectors | None = None
+    ) -> None:
+        self.path = path
+        self.cache = cache
+        self.collectors = collectors
+
+    def render_to(self, writer: TextIO | list[str]) -> None:
+        write = writer.append if isinstance(writer, list) else writer.write
+        write("<div>")
+        with open(self.path, "r", encoding="utf-8") as f:
+            _, lines = split_front_matter_lines(f)
+            for node in iter_html_blocks(iter_line_blocks(lines), self.cache):
+                if self.collectors is not None:
+                    self.collectors.add(node)
+                node.render_to(writer)
+        write("</div>")
+
+
+def stream_page_file(
+    from_path: str,
+    template: CompiledTemplate,
+    dest_path: str,
+    cache: BlockCache | None = None,
+    changes: OutputChanges | None = None,
+    collectors: PageCollectors | None = None,
+    known_hash: str | None = None,
+) -> str:
+    """Render the markdown file *from_path* to *dest_path* one block at a time.
+
+    Unlike :func:`stream_page`, the document is never held in memory: the
+    front matter and title are found by reading lines up to the end of the
+    header or the first h1, then the file is read again, and each block is
+    parsed, rendered and written before the next is read. Peak memory is
+    proportional to the largest block, not the file. The output is identical
+    to :func:`stream_page` on the file's text.
+
+    Args:
+        from_path: Path to the source ``.md`` file.
+        template: Compiled page template.
+        dest_path: Destination path for the generated HTML file.
+        cache: Optional block cache.
+        changes: Optional record of whether *dest_path* was rewritten.
+        collectors: Optional per-page collectors; links and words are
+            collected block by block.
+        known_hash: SHA-256 *dest_path* is known to hold already, compared
+            instead of reading it back (see :func:`manifest.atomic_output`).
+
+    Returns:
+        The hex SHA-256 digest of the rendered HTML (UTF-8 encoded).
+
+    Raises:
+        block_markdown.BlockError: If a block cannot be converted; the
+            message names its line range.
+    """
+    with open(from_path, "r", encoding="utf-8") as f:
+        front_matter, lines = split_front_matter_lines(f)
+        title = front_matter.title or _title_from_lines(lines)
+    template = template.for_page(front_matter.template)
+    if collectors is not None:
+        collectors.describe(title, front_matter)
+
+    with atomic_output(dest_path, changes, known_hash) as out:
+        template.render_to(out, title, _MarkdownFileBody(from_path, cache, collectors))
+    return out.digest.hexdigest()
+
+
+def profile_page(
+    from_path: str,
+    template: CompiledTemplate,
+    dest_path: str,
+    profile: PageProfile,
+    cache: BlockCache | None = None,
+    changes: OutputChanges | None = None,
+    collectors: PageCollectors | None = None,
+    known_hash: str | None = None,
+) -> str:
+    """Render *from_path* to *dest_path* in separately timed stages.
+
+    Produces the same file as :func:`stream_page`, but builds the body and
+    the final document as strings so that rendering, template substitution
+    and writing can be timed on their own.
+
+    Args:
+        from_path: Path to the source ``.md`` file.
+        template: Compiled page template.
+        dest_path: Destination path for the generated HTML file.
+        profile: Receives the stage timings and counters.
+        cache: Optional block cache passed to :func:`markdown_to_html_node`.
+        changes: Optional record of whether *dest_path* was rewritten.
+        collectors: Optional per-page collectors for the build's indexes.
+        known_hash: SHA-256 *dest_path* is known to hold already, compared
+            instead of reading it back (see :func:`manifest.atomic_output`).
+
+    Returns:
+        The hex SHA-256 digest of the rendered HTML (UTF-8 encoded).
+    """
+    start = perf_counter()
+    with open(from_path, "r", encoding="utf-8") as f:
+        markdown_content = f.read()
+    profile.add_time("read", perf_counter() - start)
+    profile.bytes_in += len(markdown_content.encode("utf-8"))
+    template, title, html_node = _parse_page(markdown_content, template, cache, collectors, profile)
+
+    start = perf_counter()
+    html_content = html_node.to_html()
+    rendered = perf_counter()
+    final_html = template.render(title, html_content)
+    substituted = perf_counter()
+    profile.add_time("render", rendered - start)
+    profile.add_time("template", substituted - rendered)
+
+    with atomic_output(dest_path, changes, known_hash) as out:
+        out.write(final_html)
+    profile.add_time("write", perf_counter() - substituted)
+    profile.bytes_out += out.size
+    return out.digest.hexdigest()
 
 
 def generate_pages_recursive(
@@ -114,25 +702,53 @@ def generate_pages_recursive(
     template_path: str,
     dest_dir_path: str,
     basepath: str = "/",
+    template: CompiledTemplate | None = None,
+    profiler: BuildProfiler | None = None,
+    cache: BlockCache | None = None,
+    discovery: Discovery | None = None,
+    stream_threshold: int | None = STREAM_THRESHOLD,
+    changes: OutputChanges | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
+    drafts: bool = False,
 ) -> None:
     """Recursively convert all markdown files under *dir_path_content* to HTML.
 
     Mirrors the directory structure of *dir_path_content* inside *dest_dir_path*,
-    converting each ``.md`` file to a corresponding ``.html`` file.
+    converting each ``.md`` file to a corresponding ``.html`` file. Pages are
+    found in one walk and generated in sorted order. The template is
+    compiled once and shared by every page.
 
     Args:
         dir_path_content: Root directory of markdown source files.
         template_path: Path to the HTML template file.
         dest_dir_path: Root directory for generated HTML output.
         basepath: URL base path prefix forwarded to :func:`generate_page`.
+        template: Already compiled template for *template_path* and *basepath*.
+        profiler: Optional build profiler forwarded to :func:`generate_page`.
+        cache: Optional block cache forwarded to :func:`generate_page`.
+        discovery: Ignore patterns and symlink policy for finding pages.
+        stream_threshold: Source size from which pages are streamed,
+            forwarded to :func:`generate_page`.
+        changes: Optional record of which pages were rewritten.
+        links: Optional link index that receives every page's links, for
+            :meth:`links.LinkIndex.check` once the build is done.
+        search: Optional search index that receives every page's text, for
+            :meth:`search_index.SearchIndex.write` once the build is done.
+        catalog: Optional site catalog that receives every page's metadata,
+            for :meth:`catalog.PageCatalog.write` once the build is done.
+        drafts: Also generate pages whose front matter marks them as drafts.
+            Otherwise they are skipped, found by reading headers only.
     """
-    for item in os.listdir(dir_path_content):
-        src_path = os.path.join(dir_path_content, item)
-        dest_path = os.path.join(dest_dir_path, item)
-
-        if os.path.isfile(src_path):
-            if src_path.endswith(".md"):
-                dest_path = dest_path.replace(".md", ".html")
-                generate_page(src_path, template_path, dest_path, basepath)
-        elif os.path.isdir(src_path):
-            generate_pages_recursive(src_path, template_path, dest_path, basepath)
+    if template is None:
+        template = CompiledTemplate.load(template_path, basepath)
+
+    pages = (discovery or DEFAULT_DISCOVERY).pages(dir_path_content, dest_dir_path)
+    if not drafts:
+        pages = published_pages(pages)
+    for src_path, dest_path in pages:
+        generate_page(
+            src_path, template_path, dest_path, basepath, template, profiler, cache,
+            stream_threshold, changes, links, search, catalog,
+        )
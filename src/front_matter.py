@@ -0,0 +1,303 @@
+"""Front matter: per-page metadata in a ``---`` delimited header.
+
+A page may start with a header of ``key: value`` lines between two ``---``
+lines::
+
+    ---
+    title: "Tom Bombadil"
+    date: 2024-03-01
+    tags: [tolkien, characters]
+    draft: false
+    template: post.html
+    ---
+
+    # Why Tom Bombadil Was a Mistake
+
+Values are a YAML subset: plain or quoted strings, ``true``/``false``,
+flow lists (``[a, "b c"]``) and block lists (``- item`` lines under an
+empty ``key:``). Blank lines and ``#`` comments are skipped. The keys the
+build understands are ``title`` (used instead of the first h1), ``date``
+(ISO 8601, a date or date and time), ``tags``, ``draft`` (drafts are not
+built unless asked for) and ``template`` (a template file, relative to the
+directory of the site template). Other keys are kept as they are.
+
+:func:`read_front_matter` reads the header alone: it stops at the closing
+``---`` (or after :data:`MAX_HEADER_BYTES`), so listings and draft
+filtering across many pages never read or parse their bodies.
+
+The header is replaced with blank lines when the body is rendered, so
+line numbers in conversion errors still match the file.
+"""
+
+from __future__ import annotations
+
+import calendar
+import re
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterable, Iterator
+
+# Largest header looked for, in UTF-8 bytes before the closing ``---``; a file
+# whose closing ``---`` comes later has no front matter.
+MAX_HEADER_BYTES = 64 * 1024
+
+Value = str | bool | list[str]
+
+_DELIMITER = "---"
+_DELIMITER_PATTERN = re.compile(r"---[ \t]*\n?")
+_CLOSING_PATTERN = re.compile(r"^---[ \t]*$", re.MULTILINE)
+_KEY_PATTERN = re.compile(r"([A-Za-z_][\w-]*)[ \t]*:(?:[ \t]+(.*))?$")
+
+# The kind of value each known key takes.
+_KINDS: dict[str, type] = {"title": str, "date": str, "template": str, "draft": bool}
+_KIND_NAMES = {str: "a string", bool: "true or false"}
+
+
+class FrontMatterError(ValueError):
+    """Raised when a front matter header cannot be parsed.
+
+    Attributes:
+        line: Line number of the offending line in the file.
+    """
+
+    def __init__(self, message: str, line: int) -> None:
+        self.line = line
+        super().__init__(f"{message} (front matter, line {line})")
+
+
+class FrontMatter:
+    """The parsed header of one page; empty for pages without one.
+
+    Args:
+        fields: Parsed values by key, as checked by the parser.
+        lines: Number of lines the header takes up, delimiters included.
+    """
+
+    def __init__(self, fields: dict[str, Value] | None = None, lines: int = 0) -> None:
+        self.fields = fields if fields is not None else {}
+        self.lines = lines
+
+    @property
+    def title(self) -> str | None:
+        """The page title, if the header sets one."""
+        return self.fields.get("title") or None
+
+    @property
+    def tags(self) -> list[str]:
+        """The page's tags; a plain string is read as comma-separated tags."""
+        tags = self.fields.get("tags", [])
+        if isinstance(tags, str):
+            return [tag.strip() for tag in tags.split(",") if tag.strip()]
+        return list(tags) if isinstance(tags, list) else []
+
+    @property
+    def published(self) -> float | None:
+        """The ``date`` in seconds since the epoch, if the header sets one."""
+        date = self.fields.get("date")
+        return _parse_date(date) if isinstance(date, str) else None
+
+    @property
+    def draft(self) -> bool:
+        """True if the page is a draft."""
+        return self.fields.get("draft") is True
+
+    @property
+    def template(self) -> str | None:
+        """The template file the page is rendered with instead of the site template."""
+        return self.fields.get("template") or None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrontMatter):
+            return NotImplemented
+        return self.fields == other.fields and self.lines == other.lines
+
+    def __repr__(self) -> str:
+        return f"FrontMatter({self.fields!r}, lines={self.lines})"
+
+
+def split_front_matter(markdown: str) -> tuple[FrontMatter, str]:
+    """Split *markdown* into its front matter and body.
+
+    Lines end at ``\\n`` only, as in :func:`split_front_matter_lines`, and
+    the header is limited to :data:`MAX_HEADER_BYTES` the same way.
+
+    Args:
+        markdown: Full markdown document string.
+
+    Returns:
+        The front matter and the body, whose header lines are blank. A
+        document without a header is returned unchanged.
+
+    Raises:
+        FrontMatterError: If the header cannot be parsed.
+    """
+    if not markdown.startswith(_DELIMITER):
+        return FrontMatter(), markdown
+    first_end = markdown.find("\n")
+    if first_end == -1 or not _is_delimiter(markdown[:first_end]):
+        return FrontMatter(), markdown
+    closing = _CLOSING_PATTERN.search(markdown, first_end + 1)
+    # A character is at least one byte, so the first test spares encoding a long document.
+    if (
+        closing is None
+        or closing.start() > MAX_HEADER_BYTES
+        or len(markdown[:closing.start()].encode("utf-8")) > MAX_HEADER_BYTES
+    ):
+        return FrontMatter(), markdown
+    # Each header line ends with "\n", so the split leaves an empty string last.
+    header = markdown[first_end + 1:closing.start()].split("\n")[:-1]
+    front_matter = _parse(header)
+    return front_matter, "\n" * front_matter.lines + markdown[closing.end() + 1:]
+
+
+def split_front_matter_lines(lines: Iterable[str]) -> tuple[FrontMatter, Iterator[str]]:
+    """Split a document read line by line into its front matter and body lines.
+
+    Only the header is consumed from *lines*; the body is left to the
+    returned iterator, so a file is read no further than its header until
+    the body is needed.
+
+    Args:
+        lines: The document's lines, each keeping its trailing ``\\n``.
+
+    Returns:
+        The front matter and an iterator over the document's lines with the
+        header lines blank.
+
+    Raises:
+        FrontMatterError: If the header cannot be parsed.
+    """
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return FrontMatter(), iter(())
+    if not _is_delimiter(first):
+        return FrontMatter(), chain((first,), lines)
+    header: list[str] = []
+    size = len(first.encode("utf-8"))
+    for line in lines:
+        if _is_delimiter(line):
+            front_matter = _parse(header)
+            return front_matter, chain(("\n",) * front_matter.lines, lines)
+        header.append(line)
+        size += len(line.encode("utf-8"))
+        if size > MAX_HEADER_BYTES:
+            break
+    return FrontMatter(), chain((first,), header, lines)
+
+
+def read_front_matter(path: str) -> FrontMatter:
+    """Read the front matter of the markdown file at *path*, without reading its body.
+
+    Raises:
+        FrontMatterError: If the header cannot be parsed.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return split_front_matter_lines(f)[0]
+
+
+def published_pages(pages: Iterable[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Return the ``(source, destination)`` pairs of *pages* that are not drafts.
+
+    Only headers are read. Pages whose header cannot be read or parsed are
+    kept, so that rendering them reports the error.
+    """
+    published = []
+    for page in pages:
+        try:
+            if read_front_matter(page[0]).draft:
+                continue
+        except (OSError, ValueError):
+            pass
+        published.append(page)
+    return published
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+
+def _is_delimiter(line: str) -> bool:
+    """Return True if *line*, with or without its ``\\n``, is a ``---`` delimiter line."""
+    return _DELIMITER_PATTERN.fullmatch(line) is not None
+
+
+def _parse(header: list[str]) -> FrontMatter:
+    """Parse the lines between the delimiters; line 1 of the file is the opening ``---``."""
+    fields: dict[str, Value] = {}
+    key_lines: dict[str, int] = {}
+    key = None
+    for number, line in enumerate(header, 2):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") or stripped == "-":
+            items = fields.get(key) if key is not None else None
+            if not isinstance(items, list) or line[:1] not in (" ", "\t", "-"):
+                raise FrontMatterError("list item outside a list", number)
+            items.append(_scalar(stripped[1:].strip()))
+            continue
+        match = _KEY_PATTERN.match(stripped)
+        if match is None:
+            raise FrontMatterError(f"expected 'key: value', got {stripped!r}", number)
+        key, value = match.group(1), (match.group(2) or "").strip()
+        try:
+            fields[key] = _value(value) if value else []
+        except ValueError as e:
+            raise FrontMatterError(str(e), number) from None
+        key_lines[key] = number
+    # Checked once block lists are complete: their items follow the key line.
+    for key, number in key_lines.items():
+        try:
+            _check(key, fields[key])
+        except ValueError as e:
+            raise FrontMatterError(str(e), number) from None
+    return FrontMatter(fields, len(header) + 2)
+
+
+def _check(key: str, value: Value) -> None:
+    """Raise ValueError if *value* is not valid for the known *key*."""
+    kind = _KINDS.get(key)
+    # A key with no value and no list items is left unset.
+    if kind is None or value == []:
+        return
+    if not isinstance(value, kind):
+        raise ValueError(f"{key!r} must be {_KIND_NAMES[kind]}, got {value!r}")
+    if key == "date":
+        try:
+            _parse_date(value)
+        except ValueError:
+            raise ValueError(f"invalid date {value!r}, expected ISO 8601 (2024-03-01)") from None
+
+
+def _value(text: str) -> Value:
+    plain = _strip_comment(text)
+    if plain.startswith("["):
+        if not plain.endswith("]"):
+            raise ValueError(f"unterminated list {text!r}")
+        inner = plain[1:-1].strip()
+        return [_scalar(item.strip()) for item in inner.split(",")] if inner else []
+    if plain in ("true", "false"):
+        return plain == "true"
+    return _scalar(text)
+
+
+def _scalar(text: str) -> str:
+    if text[:1] in ("\"", "'"):
+        end = text.find(text[0], 1)
+        if end != -1:
+            return text[1:end]
+    return _strip_comment(text)
+
+
+def _strip_comment(text: str) -> str:
+    return text.split(" #", 1)[0].rstrip()
+
+
+def _parse_date(text: str) -> float:
+    """Return the epoch seconds of an ISO 8601 date or date and time; naive values are UTC."""
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        return float(calendar.timegm(moment.timetuple()))
+    return moment.astimezone(timezone.utc).timestamp()
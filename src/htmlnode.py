@@ -1,12 +1,25 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import re
+from typing import TYPE_CHECKING, Callable
 
 from textnode import TextType
 
 if TYPE_CHECKING:
+    from typing import TextIO
+
     from textnode import TextNode
 
+# An HTML tag, replaced by a space when the text of raw HTML is read.
+_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+
+def _writer_function(writer: TextIO | list[str]) -> Callable[[str], object]:
+    """Return the callable that appends a fragment to *writer*."""
+    if isinstance(writer, list):
+        return writer.append
+    return writer.write
+
 
 class HTMLNode:
     """Base class for HTML DOM nodes.
@@ -18,6 +31,10 @@ class HTMLNode:
         props: HTML attributes as a dict (e.g. {"href": "..."}).
     """
 
+    # Builds create huge numbers of short-lived nodes; slots drop the
+    # per-instance __dict__. Subclasses declare empty slots to keep it so.
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(
         self,
         tag: str | None = None,
@@ -34,6 +51,20 @@ class HTMLNode:
         """Render this node to an HTML string. Must be implemented by subclasses."""
         raise NotImplementedError("to_html method must be implemented by subclasses")
 
+    def render_to(self, writer: TextIO | list[str]) -> None:
+        """Stream this node's HTML to *writer* fragment by fragment.
+
+        Args:
+            writer: A text file-like object (anything with ``write``) or a
+                list that fragments are appended to.
+        """
+        self._render(_writer_function(writer))
+
+    def _render(self, write: Callable[[str], object]) -> None:
+        # Leaves (and custom nodes that only implement to_html) are written
+        # as one fragment; ParentNode overrides this to stream its children.
+        write(self.to_html())
+
     def props_to_html(self) -> str:
         """Render the node's props dict as an HTML attribute string."""
         if not self.props:
@@ -59,6 +90,8 @@ class LeafNode(HTMLNode):
         props: Optional HTML attributes.
     """
 
+    __slots__ = ()
+
     def __init__(self, tag: str | None, value: str, props: dict[str, str] | None = None) -> None:
         super().__init__(tag, value, None, props)
 
@@ -73,6 +106,29 @@ class LeafNode(HTMLNode):
         return f"LeafNode(tag={self.tag!r}, value={self.value!r}, props={self.props!r})"
 
 
+class RawHTMLNode(LeafNode):
+    """Already rendered HTML, with the text of the leaves it was rendered from.
+
+    Blocks served by the block cache become raw nodes; :attr:`text` lets the
+    search index read their words without parsing the HTML back.
+
+    Args:
+        html: The rendered HTML, written out as it is.
+        text: The text of the original leaves, as returned by
+            :func:`node_text`. When None, the text is *html* with its tags
+            replaced by spaces.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, html: str, text: str | None = None) -> None:
+        super().__init__(None, html)
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"RawHTMLNode(value={self.value!r}, text={self.text!r})"
+
+
 class ParentNode(HTMLNode):
     """An HTML node that contains child nodes.
 
@@ -82,6 +138,8 @@ class ParentNode(HTMLNode):
         props: Optional HTML attributes.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         tag: str | None,
@@ -91,17 +149,72 @@ class ParentNode(HTMLNode):
         super().__init__(tag, None, children, props)
 
     def to_html(self) -> str:
+        buffer: list[str] = []
+        self._render(buffer.append)
+        return "".join(buffer)
+
+    def _render(self, write: Callable[[str], object]) -> None:
+        # Explicit stack of child iterators instead of recursion: nesting depth
+        # is bounded by memory, not by the interpreter's recursion limit.
+        self._check()
+        write(f"<{self.tag}{self.props_to_html()}>")
+        iterators = [iter(self.children)]
+        closing_tags = [f"</{self.tag}>"]
+        while iterators:
+            for child in iterators[-1]:
+                if isinstance(child, ParentNode):
+                    child._check()
+                    write(f"<{child.tag}{child.props_to_html()}>")
+                    iterators.append(iter(child.children))
+                    closing_tags.append(f"</{child.tag}>")
+                    break
+                child._render(write)
+            else:
+                iterators.pop()
+                write(closing_tags.pop())
+
+    def _render_recursive(self, write: Callable[[str], object]) -> None:
+        """Recursive equivalent of :meth:`_render`, kept for benchmarking."""
+        self._check()
+        write(f"<{self.tag}{self.props_to_html()}>")
+        for child in self.children:
+            if isinstance(child, ParentNode):
+                child._render_recursive(write)
+            else:
+                child._render(write)
+        write(f"</{self.tag}>")
+
+    def _check(self) -> None:
         if self.tag is None:
             raise ValueError("ParentNode must have a tag")
         if not self.children:
             raise ValueError("ParentNode must have children")
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
 
     def __repr__(self) -> str:
         return f"ParentNode(tag={self.tag!r}, children={self.children!r}, props={self.props!r})"
 
 
+def node_text(node: HTMLNode) -> str:
+    """Return the text of the leaves under *node*, space-separated, in document order.
+
+    Leaf values are text as written, so ``a<b>c`` in a code span stays
+    three words. :class:`RawHTMLNode` leaves contribute the text they were
+    rendered from, or else their HTML with the tags replaced by spaces.
+    """
+    texts = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.children:
+            stack.extend(reversed(node.children))
+        elif isinstance(node, RawHTMLNode):
+            texts.append(node.text if node.text is not None else _TAG_PATTERN.sub(" ", node.value))
+        elif node.value:
+            texts.append(node.value)
+    # The separator keeps the words of neighbouring leaves apart.
+    return " ".join(texts)
+
+
 def text_node_to_html_node(text_node: TextNode) -> LeafNode:
     """Convert a TextNode into the corresponding LeafNode HTML element.
 
@@ -11,6 +11,13 @@ from textnode import TextNode, TextType
 # Regex-based extraction
 # ---------------------------------------------------------------------------
 
+# Compiled once at import; every extractor and splitter below shares them.
+_IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+_LINK_PATTERN = re.compile(r"(?<!\!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+# Images and links in one alternation; group 1/2 is an image, group 3/4 a link.
+_IMAGE_OR_LINK_PATTERN = re.compile(f"{_IMAGE_PATTERN.pattern}|{_LINK_PATTERN.pattern}")
+
+
 def extract_markdown_images(text: str) -> list[tuple[str, str]]:
     """Extract all markdown image references from *text*.
 
@@ -20,8 +27,7 @@ def extract_markdown_images(text: str) -> list[tuple[str, str]]:
     Returns:
         List of (alt_text, url) tuples for each ``![alt](url)`` found.
     """
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return _IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text: str) -> list[tuple[str, str]]:
@@ -33,8 +39,7 @@ def extract_markdown_links(text: str) -> list[tuple[str, str]]:
     Returns:
         List of (anchor_text, url) tuples for each ``[text](url)`` found.
     """
-    pattern = r"(?<!\!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return _LINK_PATTERN.findall(text)
 
 
 # ---------------------------------------------------------------------------
@@ -96,81 +101,167 @@ def split_nodes_image(old_nodes: list[TextNode]) -> list[TextNode]:
     Returns:
         Expanded list where ``![alt](url)`` sequences become IMAGE nodes.
     """
-    new_nodes: list[TextNode] = []
-    for node in old_nodes:
-        if node.text_type != TextType.TEXT:
-            new_nodes.append(node)
-            continue
+    return _split_nodes_by_pattern(old_nodes, _IMAGE_PATTERN, TextType.IMAGE)
 
-        images = extract_markdown_images(node.text)
-        if not images:
-            new_nodes.append(node)
-            continue
 
-        remaining_text = node.text
-        for alt_text, url in images:
-            parts = remaining_text.split(f"![{alt_text}]({url})", 1)
-            if parts[0]:
-                new_nodes.append(TextNode(parts[0], TextType.TEXT))
-            new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
-            remaining_text = parts[1] if len(parts) > 1 else ""
+def split_nodes_link(old_nodes: list[TextNode]) -> list[TextNode]:
+    """Replace inline link markdown in TEXT nodes with LINK TextNode instances.
+
+    Args:
+        old_nodes: Input list of TextNode instances.
 
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
+    Returns:
+        Expanded list where ``[text](url)`` sequences become LINK nodes.
+    """
+    return _split_nodes_by_pattern(old_nodes, _LINK_PATTERN, TextType.LINK)
 
-    return new_nodes
 
+def split_nodes_image_and_link(old_nodes: list[TextNode]) -> list[TextNode]:
+    """Replace inline images and links in TEXT nodes in a single pass.
 
-def split_nodes_link(old_nodes: list[TextNode]) -> list[TextNode]:
-    """Replace inline link markdown in TEXT nodes with LINK TextNode instances.
+    Equivalent to ``split_nodes_link(split_nodes_image(old_nodes))``, but each
+    TEXT node is scanned once by a combined pattern and the nodes are cut
+    straight from the match spans.
 
     Args:
         old_nodes: Input list of TextNode instances.
 
     Returns:
-        Expanded list where ``[text](url)`` sequences become LINK nodes.
+        Expanded list with IMAGE and LINK nodes in place of their markdown.
     """
     new_nodes: list[TextNode] = []
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
-            continue
+        else:
+            _scan_images_and_links(node.text, new_nodes)
+    return new_nodes
+
 
-        links = extract_markdown_links(node.text)
-        if not links:
+def _split_nodes_by_pattern(
+    old_nodes: list[TextNode], pattern: re.Pattern, text_type: TextType
+) -> list[TextNode]:
+    """Split TEXT nodes at every match of *pattern*, cutting on the match spans."""
+    new_nodes: list[TextNode] = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
 
-        remaining_text = node.text
-        for anchor_text, url in links:
-            parts = remaining_text.split(f"[{anchor_text}]({url})", 1)
-            if parts[0]:
-                new_nodes.append(TextNode(parts[0], TextType.TEXT))
-            new_nodes.append(TextNode(anchor_text, TextType.LINK, url))
-            remaining_text = parts[1] if len(parts) > 1 else ""
+        text = node.text
+        pos = 0
+        for match in pattern.finditer(text):
+            start = match.start()
+            if start > pos:
+                new_nodes.append(TextNode(text[pos:start], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            pos = match.end()
 
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
+        if pos == 0:
+            new_nodes.append(node)
+        elif pos < len(text):
+            new_nodes.append(TextNode(text[pos:], TextType.TEXT))
 
     return new_nodes
 
 
+# ---------------------------------------------------------------------------
+# Single-pass scanner
+# ---------------------------------------------------------------------------
+
+# Delimiters in the order the legacy cascade applies them. A segment enclosed
+# by an earlier delimiter is final and never re-split by a later one.
+_DELIMITER_CASCADE: tuple[tuple[str, TextType], ...] = (
+    ("**", TextType.BOLD),
+    ("*", TextType.ITALIC),
+    ("_", TextType.ITALIC),
+    ("`", TextType.CODE),
+)
+
+
+class _UnbalancedDelimiter(Exception):
+    """Internal signal that a segment holds an unclosed delimiter."""
+
+
+def _scan_delimiters(text: str, level: int, out: list[TextNode]) -> None:
+    """Emit the nodes for plain-text *text* starting at cascade *level*."""
+    while level < len(_DELIMITER_CASCADE):
+        delimiter, text_type = _DELIMITER_CASCADE[level]
+        level += 1
+        if delimiter not in text:
+            continue
+        parts = text.split(delimiter)
+        if len(parts) % 2 == 0:
+            raise _UnbalancedDelimiter
+        for i, part in enumerate(parts):
+            if not part:
+                continue
+            if i % 2 == 0:
+                _scan_delimiters(part, level, out)
+            else:
+                out.append(TextNode(part, text_type))
+        return
+    _scan_images_and_links(text, out)
+
+
+def _scan_images_and_links(text: str, out: list[TextNode]) -> None:
+    """Emit TEXT, IMAGE and LINK nodes for *text* from regex match spans."""
+    if "[" not in text:
+        out.append(TextNode(text, TextType.TEXT))
+        return
+    pos = 0
+    for match in _IMAGE_OR_LINK_PATTERN.finditer(text):
+        start = match.start()
+        if start > pos:
+            out.append(TextNode(text[pos:start], TextType.TEXT))
+        if match.group(2) is not None:
+            out.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        else:
+            out.append(TextNode(match.group(3), TextType.LINK, match.group(4)))
+        pos = match.end()
+    if pos < len(text):
+        out.append(TextNode(text[pos:], TextType.TEXT))
+
+
 # ---------------------------------------------------------------------------
 # Full inline pipeline
 # ---------------------------------------------------------------------------
 
-def text_to_textnodes(text: str) -> list[TextNode]:
+def text_to_textnodes(text: str, legacy: bool = False) -> list[TextNode]:
     """Convert a plain text string into a list of TextNode instances.
 
     Applies all inline markdown transformations in order:
     bold → italic (``*``) → italic (``_``) → code → images → links.
 
+    By default a single-pass scanner walks the text once per delimiter level
+    and appends straight to one output list, instead of rebuilding the node
+    list for every ``split_nodes_*`` pass. Both paths yield the same nodes.
+
     Args:
         text: Raw inline markdown text.
+        legacy: Use the original ``split_nodes_*`` cascade (for differential
+            testing).
 
     Returns:
         List of TextNode instances representing the parsed inline content.
+
+    Raises:
+        ValueError: If the text contains an unclosed delimiter.
     """
+    if legacy:
+        return _text_to_textnodes_legacy(text)
+    nodes: list[TextNode] = []
+    if not text:
+        return nodes
+    try:
+        _scan_delimiters(text, 0, nodes)
+    except _UnbalancedDelimiter:
+        # Re-run the cascade so the error names the same segment as before.
+        return _text_to_textnodes_legacy(text)
+    return nodes
+
+
+def _text_to_textnodes_legacy(text: str) -> list[TextNode]:
     nodes = [TextNode(text, TextType.TEXT)]
     nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
     nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
@@ -0,0 +1,268 @@
+"""Site-wide link index and dead-link checking, built while pages render.
+
+Every rendered page contributes the URL of each ``<a href>`` and ``<img src>``
+in its body, taken from the HTML node tree the page was rendered from (or
+from the rendered HTML of blocks served by the block cache). No file is read
+or parsed again: at the end of the build the collected URLs are resolved
+against the generated pages and the static assets, and those that point
+nowhere are reported.
+
+Links are resolved the way a static host serves ``docs/``: ``/blog/tom``
+finds ``blog/tom``, ``blog/tom/index.html`` or ``blog/tom.html``, and
+relative URLs are resolved against the page's own URL. Links with a scheme
+or host (``https://``, ``mailto:``) and same-page fragments are external
+and never checked.
+
+The resolved links also give a :class:`DependencyGraph`, saved between
+builds, mapping each page and asset to the pages that reference it::
+
+    {
+        "version": 1,
+        "dependents": {"images/tom.png": ["blog/tom/index.html"], …}
+    }
+
+so that the pages affected by a removed or renamed file are known without
+walking the content again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import posixpath
+import re
+from typing import TYPE_CHECKING, Iterable, Iterator
+from urllib.parse import unquote, urlsplit
+
+from collector import Collector
+
+if TYPE_CHECKING:
+    from htmlnode import HTMLNode
+
+# (tag, url): ("a", href) for a link, ("img", src) for an image.
+Link = tuple[str, str]
+
+DEPENDENCIES_VERSION = 1
+
+# The attribute holding the URL of each element that references another file.
+_LINK_ATTRIBUTES = {"a": "href", "img": "src"}
+
+# Links in raw HTML: blocks served by the block cache, and HTML written
+# directly in the markdown, which the browser follows just the same.
+_RAW_LINK_PATTERN = re.compile(
+    r"""<a\s[^>]*?\bhref\s*=\s*["']([^"']*)["']|<img\s[^>]*?\bsrc\s*=\s*["']([^"']*)["']""",
+    re.IGNORECASE,
+)
+
+
+def collect_links(node: HTMLNode, out: list[Link]) -> None:
+    """Append the ``(tag, url)`` of every link and image under *node* to *out*, in document order."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        attribute = _LINK_ATTRIBUTES.get(node.tag)
+        if attribute is not None and node.props and attribute in node.props:
+            out.append((node.tag, node.props[attribute]))
+        if node.children:
+            stack.extend(reversed(node.children))
+        elif node.value and "<" in node.value:
+            for match in _RAW_LINK_PATTERN.finditer(node.value):
+                href = match.group(1)
+                out.append(("a", href) if href is not None else ("img", match.group(2)))
+
+
+def link_candidates(url: str, page: str) -> list[str] | None:
+    """Return the output paths *url* on *page* may refer to, or None if it is external.
+
+    Args:
+        url: The ``href`` or ``src`` value.
+        page: Output path of the linking page, relative to the output root
+            with ``/`` separators (e.g. ``blog/tom/index.html``).
+
+    Returns:
+        Candidate paths relative to the output root, most specific first;
+        None for URLs with a scheme or host and for same-page references.
+    """
+    parts = urlsplit(url.strip())
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = unquote(parts.path)
+    if not path.startswith("/"):
+        path = posixpath.join(posixpath.dirname(f"/{page}"), path)
+    rel_path = posixpath.normpath(path).lstrip("/")
+    if not rel_path or path.endswith("/"):
+        return [posixpath.join(rel_path, "index.html")]
+    return [rel_path, f"{rel_path}/index.html", f"{rel_path}.html"]
+
+
+class LinkReport:
+    """Outcome of :meth:`LinkIndex.check`.
+
+    Attributes:
+        pages: Number of pages whose links were checked.
+        internal: Number of links and images resolved against the site.
+        external: Number of links and images not checked: those with a scheme or
+            host, and same-page references.
+        broken: ``(page, url)`` for each link to a missing page or file.
+        missing_images: ``(page, url)`` for each image whose file is missing.
+    """
+
+    def __init__(self) -> None:
+        self.pages = 0
+        self.internal = 0
+        self.external = 0
+        self.broken: list[tuple[str, str]] = []
+        self.missing_images: list[tuple[str, str]] = []
+
+    @property
+    def ok(self) -> bool:
+        """True if no link or image is broken."""
+        return not self.broken and not self.missing_images
+
+    def report(self) -> str:
+        """Return a summary line followed by one line per broken link or image."""
+        lines = [
+            f"Links: {self.pages} pages, {self.internal} internal and {self.external} external "
+            f"references, {len(self.broken)} broken links, {len(self.missing_images)} missing images"
+        ]
+        lines.extend(f"  broken link in {page}: {url}" for page, url in self.broken)
+        lines.extend(f"  missing image in {page}: {url}" for page, url in self.missing_images)
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"LinkReport(pages={self.pages}, broken={len(self.broken)}, "
+            f"missing_images={len(self.missing_images)})"
+        )
+
+
+class LinkIndex(Collector):
+    """The links and images of every page rendered by a build.
+
+    Attributes:
+        pages: Links of each page in document order, keyed by the page's
+            output path.
+    """
+
+    _drained = {"pages": dict}
+
+    def __init__(self) -> None:
+        self.pages: dict[str, list[Link]] = {}
+
+    def record(self, page: str, links: list[Link]) -> None:
+        """Set the links of output *page*, replacing any recorded before."""
+        self.pages[page] = links
+
+    def _resolved(
+        self, root: str, assets: Iterable[str]
+    ) -> Iterator[tuple[str, str, str, str | None, bool]]:
+        """Yield ``(page, tag, url, target, found)`` for every link, pages sorted.
+
+        *target* is the output path the link resolves to (its most specific
+        candidate when nothing exists there) and None for external links.
+        """
+        pages = {
+            os.path.relpath(page, root).replace(os.sep, "/"): links for page, links in self.pages.items()
+        }
+        targets = set(pages)
+        targets.update(asset.replace(os.sep, "/") for asset in assets)
+        for page in sorted(pages):
+            for tag, url in pages[page]:
+                candidates = link_candidates(url, page)
+                if candidates is None:
+                    yield page, tag, url, None, False
+                    continue
+                found = next((candidate for candidate in candidates if candidate in targets), None)
+                yield page, tag, url, found or candidates[0], found is not None
+
+    def check(self, root: str, assets: Iterable[str] = ()) -> LinkReport:
+        """Resolve every recorded link against the pages and *assets*.
+
+        Args:
+            root: The output directory the pages were written to.
+            assets: Static files copied into *root*, relative to it.
+
+        Returns:
+            A :class:`LinkReport`; its broken links and missing images are
+            sorted by page.
+        """
+        report = LinkReport()
+        report.pages = len(self.pages)
+        for page, tag, url, target, found in self._resolved(root, assets):
+            if target is None:
+                report.external += 1
+                continue
+            report.internal += 1
+            if not found:
+                (report.missing_images if tag == "img" else report.broken).append((page, url))
+        return report
+
+    def dependency_graph(self, root: str, assets: Iterable[str] = ()) -> DependencyGraph:
+        """Return the pages referencing each page and asset, resolved as in :meth:`check`.
+
+        Missing targets are included too, so the pages that would be fixed by
+        adding a file can be found as well as those broken by removing one.
+        """
+        dependents: dict[str, set[str]] = {}
+        for page, _, _, target, _ in self._resolved(root, assets):
+            if target is not None:
+                dependents.setdefault(target, set()).add(page)
+        return DependencyGraph({target: sorted(pages) for target, pages in dependents.items()})
+
+    def __repr__(self) -> str:
+        return f"LinkIndex(pages={len(self.pages)})"
+
+
+class DependencyGraph:
+    """Reverse dependencies: each page or asset mapped to the pages that reference it.
+
+    Paths are relative to the output root with ``/`` separators.
+
+    Args:
+        dependents: Referencing pages, sorted, keyed by referenced path.
+    """
+
+    def __init__(self, dependents: dict[str, list[str]] | None = None) -> None:
+        self.dependents = dependents if dependents is not None else {}
+
+    @classmethod
+    def load(cls, path: str) -> DependencyGraph:
+        """Load the graph saved at *path*; a missing or out-of-date file yields an empty one."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != DEPENDENCIES_VERSION:
+            return cls()
+        return cls(dict(data.get("dependents", {})))
+
+    def save(self, path: str) -> None:
+        """Atomically write the graph to *path*."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": DEPENDENCIES_VERSION, "dependents": self.dependents}, f, indent=1, sort_keys=True
+            )
+        os.replace(tmp_path, path)
+
+    def affected(self, paths: Iterable[str]) -> list[str]:
+        """Return the pages referencing any of *paths*, sorted.
+
+        Args:
+            paths: Changed, removed or added pages and assets, relative to
+                the output root (either separator).
+        """
+        pages: set[str] = set()
+        for path in paths:
+            pages.update(self.dependents.get(path.replace(os.sep, "/"), ()))
+        return sorted(pages)
+
+    def __len__(self) -> int:
+        return len(self.dependents)
+
+    def __repr__(self) -> str:
+        return f"DependencyGraph(targets={len(self.dependents)})"
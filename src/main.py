@@ -1,19 +1,352 @@
-import sys
+import argparse
+import os
+import threading
 
-from file_operations import copy_directory, generate_pages_recursive
+from block_cache import BlockCache
+from build import find_pages, generate_pages_incremental, generate_pages_parallel
+from catalog import DEFAULT_COLLECTION, PageCatalog, is_catalog_output
+from compression import available_encodings, compress_directory, is_compressed_variant
+from discovery import SYMLINK_POLICIES, Discovery
+from file_operations import (
+    STREAM_THRESHOLD,
+    generate_pages_recursive,
+    is_generated_page,
+    protect_any,
+    sync_directory,
+)
+from links import DependencyGraph, LinkIndex
+from manifest import OutputChanges
+from page_template import CompiledTemplate
+from profiling import BuildProfiler
+from search_index import SearchIndex, is_search_output
+from watch import SiteWatcher, start_server
 
+# Outputs of the stages after page generation, kept when static/ is synced.
+GENERATED_OUTPUTS = (is_compressed_variant, is_search_output, is_catalog_output)
 
-def main() -> None:
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options for a site build."""
+    parser = argparse.ArgumentParser(description="Generate the static site into docs/.")
+    parser.add_argument(
+        "basepath",
+        nargs="?",
+        default="/",
+        help="URL base path prefix for absolute links (default: /)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-render pages whose source, template or basepath changed",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=".build_manifest.json",
+        help="manifest file used by --incremental (default: .build_manifest.json)",
+    )
+    parser.add_argument(
+        "--asset-compare",
+        choices=("mtime", "hash"),
+        default="mtime",
+        help="how changed static assets are detected (default: mtime)",
+    )
+    parser.add_argument(
+        "--link-assets",
+        action="store_true",
+        help="hardlink static assets into docs/ instead of copying them",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="render pages across N worker processes (0 = one per CPU; default: 1)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="after an incremental build, serve docs/ and rebuild changed files as they are edited",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8888,
+        help="port for the --watch development server (default: 8888)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="build_profile.json",
+        metavar="TRACE",
+        help="time each build stage, print a report and write a per-page JSON "
+        "trace (default: build_profile.json)",
+    )
+    parser.add_argument(
+        "--block-cache",
+        nargs="?",
+        const=".block_cache.json",
+        metavar="PATH",
+        help="render each distinct markdown block once and keep the rendered "
+        "blocks on disk for the next build (default: .block_cache.json)",
+    )
+    parser.add_argument(
+        "--block-cache-size",
+        type=int,
+        default=4096,
+        metavar="N",
+        help="number of rendered blocks held in memory (default: 4096)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="overlap reading sources, rendering and writing outputs "
+        "(helps on slow or network filesystems)",
+    )
+    parser.add_argument(
+        "--ignore",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="skip content and static files or directories whose name or relative "
+        "path matches this glob (repeatable)",
+    )
+    parser.add_argument(
+        "--symlinks",
+        choices=SYMLINK_POLICIES,
+        default="follow",
+        help="follow symlinks in content/ and static/, or skip them (default: follow)",
+    )
+    parser.add_argument(
+        "--stream-threshold",
+        type=int,
+        default=STREAM_THRESHOLD,
+        metavar="BYTES",
+        help="render markdown files of at least this size block by block, keeping "
+        f"memory bounded by the largest block; 0 streams every page (default: {STREAM_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--changes",
+        nargs="?",
+        const=".build_changes.json",
+        default=None,
+        metavar="PATH",
+        help="write the outputs this build changed or removed, relative to docs/, as JSON "
+        "(default path: .build_changes.json)",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="write .gz (and .br, if the brotli module is installed) next to every HTML, "
+        "CSS and JS file in docs/, skipping files whose variants are up to date",
+    )
+    parser.add_argument(
+        "--check-links",
+        action="store_true",
+        help="collect every page's links while rendering and report links to missing "
+        "pages and images with missing files at the end of the build",
+    )
+    parser.add_argument(
+        "--dependencies",
+        nargs="?",
+        const=".build_dependencies.json",
+        default=None,
+        metavar="PATH",
+        help="save the reverse-dependency graph (each page and asset -> the pages linking to it) "
+        "and list the pages that reference outputs this build removed "
+        "(default path: .build_dependencies.json)",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="index the words of every page while rendering and write a lazily loadable "
+        "search index to docs/search/",
+    )
+    parser.add_argument(
+        "--site-url",
+        default=None,
+        metavar="URL",
+        help="absolute URL the site is served from (e.g. https://example.com); write "
+        "sitemap.xml, an Atom feed, paginated index pages and tag pages for the --collection",
+    )
+    parser.add_argument(
+        "--collection",
+        default=DEFAULT_COLLECTION,
+        metavar="DIR",
+        help=f"directory of the pages listed by the feed, index and tag pages (default: {DEFAULT_COLLECTION})",
+    )
+    parser.add_argument(
+        "--drafts",
+        action="store_true",
+        help="also build pages whose front matter sets 'draft: true' (skipped by default)",
+    )
+    args = parser.parse_args(argv)
+    if args.pipeline and args.profile:
+        parser.error("--profile cannot be combined with --pipeline")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
     """Entry point: copy static assets and generate all HTML pages."""
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+    args = parse_args(argv)
+    basepath = args.basepath
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    profiler = BuildProfiler() if args.profile else None
+    cache = BlockCache.load(args.block_cache, args.block_cache_size) if args.block_cache else None
+    discovery = Discovery(args.ignore, args.symlinks)
+    changes = OutputChanges() if args.changes else None
+    links = LinkIndex() if args.check_links or args.dependencies else None
+    search = None
+    if args.search_index:
+        search = SearchIndex.load("docs") if args.incremental or args.watch else SearchIndex()
+    catalog = PageCatalog() if args.site_url else None
+    incremental = args.incremental or args.watch
+    if incremental:
+        # Pages removed since the last build are found through the manifest.
+        protect = protect_any(is_generated_page, *GENERATED_OUTPUTS)
+    else:
+        # Every page is rendered again, so only the ones this build writes are kept.
+        pages = {
+            os.path.relpath(dest_path, "docs")
+            for _, dest_path in find_pages("content", "docs", discovery, args.drafts)
+        }
+        protect = protect_any(pages.__contains__, *GENERATED_OUTPUTS)
+    sync = sync_directory("static", "docs", args.asset_compare, args.link_assets, protect, discovery)
+    if changes is not None:
+        changes.absorb((sync.copied, sync.unchanged, sync.removed))
+    print(
+        f"Asset sync: {len(sync.copied)} copied, {len(sync.unchanged)} unchanged, "
+        f"{len(sync.removed)} removed"
+    )
+    removed = sync.removed
+
+    if incremental:
+        result = generate_pages_incremental(
+            "content", "template.html", "docs", basepath, args.manifest, jobs, profiler,
+            cache=cache, pipeline=args.pipeline, discovery=discovery,
+            stream_threshold=args.stream_threshold, changes=changes, links=links, search=search,
+            catalog=catalog, drafts=args.drafts,
+        )
+        print(
+            f"Incremental build: {len(result.rendered)} rendered, "
+            f"{len(result.skipped)} unchanged, {len(result.removed)} removed"
+        )
+        removed = sync.removed + result.removed
+    elif jobs > 1 or args.pipeline:
+        generate_pages_parallel(
+            "content", "template.html", "docs", basepath, jobs, profiler,
+            cache=cache, pipeline=args.pipeline, discovery=discovery,
+            stream_threshold=args.stream_threshold, changes=changes, links=links, search=search,
+            catalog=catalog, drafts=args.drafts,
+        )
+    else:
+        generate_pages_recursive(
+            "content", "template.html", "docs", basepath,
+            profiler=profiler, cache=cache, discovery=discovery,
+            stream_threshold=args.stream_threshold, changes=changes, links=links, search=search,
+            catalog=catalog, drafts=args.drafts,
+        )
+
+    if links is not None:
+        assets = discovery.scan("static").files
+        if args.check_links:
+            print(links.check("docs", assets).report())
+        if args.dependencies:
+            graph = links.dependency_graph("docs", assets)
+            if removed:
+                affected = DependencyGraph.load(args.dependencies).affected(
+                    os.path.relpath(path, "docs") for path in removed
+                )
+                print(f"Pages referencing removed outputs: {', '.join(affected) or 'none'}")
+            graph.save(args.dependencies)
+            print(f"Dependency graph: {len(graph)} referenced paths (saved to {args.dependencies})")
+
+    if search is not None:
+        stats = search.write("docs", basepath, changes)
+        print(
+            f"Search index: {stats['pages']} pages, {stats['tokens']} tokens in "
+            f"{stats['shards']} shards ({stats['bytes']:,} bytes)"
+        )
+
+    if catalog is not None:
+        stats = catalog.write(
+            "docs", CompiledTemplate.load("template.html", basepath), args.site_url, args.collection, changes
+        )
+        print(
+            f"Collections: {stats['urls']} URLs in {stats['sitemaps']} sitemap files, "
+            f"{stats['entries']} feed entries, {stats['index_pages']} index pages and "
+            f"{stats['tag_pages']} tag pages for {args.collection}/"
+        )
 
-    copy_directory("static", "docs")
-    generate_pages_recursive("content", "template.html", "docs", basepath)
+    if args.compress:
+        print(f"Compressing docs/ ({', '.join(available_encodings())})")
+        print(compress_directory("docs", jobs, changes=changes).report())
+
+    if changes is not None:
+        changes.save(args.changes, "docs")
+        print(
+            f"Changed outputs: {len(changes.written)} written, {len(changes.unchanged)} unchanged, "
+            f"{len(changes.removed)} removed (listed in {args.changes})"
+        )
+
+    if cache is not None:
+        cache.save()
+        stats = cache.stats()
+        print(
+            f"Block cache: {stats['hits']} hits ({stats['disk_hits']} from disk), "
+            f"{stats['misses']} misses, hit rate {stats['hit_rate']:.1%}"
+        )
+
+    if profiler is not None:
+        profiler.finish()
+        print("\n" + profiler.report())
+        profiler.write_trace(args.profile)
+        print(f"Profile trace written to {args.profile}")
 
     print("\n" + "=" * 50)
     print(f"Site generated successfully with basepath: {basepath}")
     print("=" * 50)
 
+    if args.watch:
+        watch(
+            basepath, args.port, discovery, args.drafts, args.manifest, cache, links, search, catalog,
+            args.site_url or "", args.collection,
+        )
+
+
+def watch(
+    basepath: str,
+    port: int,
+    discovery: Discovery | None = None,
+    drafts: bool = False,
+    manifest_path: str | None = None,
+    cache: BlockCache | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    catalog: PageCatalog | None = None,
+    site_url: str = "",
+    collection: str = DEFAULT_COLLECTION,
+) -> None:
+    """Serve docs/ and rebuild changed sources until interrupted.
+
+    Rebuilt pages are recorded in the manifest at *manifest_path*, and in
+    the block cache, indexes and catalog of the build that came before.
+    """
+    watcher = SiteWatcher(
+        "content", "static", "template.html", "docs", basepath, discovery, drafts,
+        manifest_path, cache, links, search, catalog, site_url, collection,
+    )
+    server = start_server("docs", port)
+    print(f"Serving docs/ at http://localhost:{port}{basepath} - watching for changes (Ctrl+C to stop)")
+    stop = threading.Event()
+    try:
+        watcher.run(stop=stop)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.shutdown()
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,386 @@
+"""Persistent build manifest used by incremental builds.
+
+The manifest maps every markdown source (relative to the content root) to the
+inputs it was last rendered from, its front matter (see :mod:`front_matter`),
+the output it produced and, when links were collected (see :mod:`links`), the
+links and images in its body, and when the site catalog was (see
+:mod:`catalog`), its title::
+
+    {
+        "version": 1,
+        "pages": {
+            "blog/tom/index.md": {
+                "source_hash": "…",
+                "source_mtime_ns": 1700000000000000000,
+                "source_size": 1234,
+                "front_matter": {"date": "2024-03-01", "tags": ["tolkien"]},
+                "template_hash": "…",
+                "basepath": "/",
+                "output": "blog/tom/index.html",
+                "output_hash": "…",
+                "output_mtime_ns": 1700000000000000000,
+                "output_size": 5678,
+                "links": [["a", "/blog/"], ["img", "/images/tom.png"]],
+                "title": "Tom"
+            }
+        }
+    }
+
+:class:`OutputChanges` is the other record kept here: the outputs one build
+actually wrote, left untouched or removed, for deploys that upload only the
+delta. Pages, sitemaps, feeds and search index files are written through
+:func:`atomic_output`, which records each one there. Incremental builds pass
+it the recorded hash of an output that is unchanged on disk, so the file is
+not read back to compare.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from typing import IO, TYPE_CHECKING, Iterator
+
+from collector import Collector
+from front_matter import FrontMatter
+
+if TYPE_CHECKING:
+    from links import Link
+
+MANIFEST_VERSION = 1
+CHANGES_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Hashing helpers
+# ---------------------------------------------------------------------------
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 digest of *data*."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the hex SHA-256 digest of the file at *path*, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Return the hex SHA-256 digest of *text* encoded as UTF-8."""
+    return hash_bytes(text.encode("utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+
+class BuildManifest:
+    """On-disk record of the inputs and outputs of every rendered page.
+
+    Args:
+        path: Location of the manifest JSON file.
+        pages: Initial page entries keyed by source path relative to the
+            content root.
+    """
+
+    def __init__(self, path: str, pages: dict[str, dict] | None = None) -> None:
+        self.path = path
+        self.pages = pages if pages is not None else {}
+
+    @classmethod
+    def load(cls, path: str) -> BuildManifest:
+        """Load the manifest at *path*.
+
+        A missing, unreadable or out-of-date manifest yields an empty one,
+        which simply makes the next build a full rebuild.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, dict(data.get("pages", {})))
+
+    def save(self) -> None:
+        """Atomically write the manifest back to :attr:`path`."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "pages": self.pages},
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.path)
+
+    def is_fresh(
+        self,
+        source: str,
+        source_hash: str,
+        template_hash: str,
+        basepath: str,
+        output_path: str,
+    ) -> bool:
+        """Return True if *source* was last rendered from exactly these inputs.
+
+        The recorded output must also still exist on disk; a wiped ``docs/``
+        therefore triggers a re-render even when no input changed.
+        """
+        entry = self.pages.get(source)
+        if entry is None:
+            return False
+        return (
+            entry.get("source_hash") == source_hash
+            and entry.get("template_hash") == template_hash
+            and entry.get("basepath") == basepath
+            and os.path.isfile(output_path)
+        )
+
+    def cached_source_hash(self, source: str, stat: os.stat_result) -> str | None:
+        """Return the recorded hash of *source* if its size and mtime are unchanged.
+
+        This lets unchanged sources skip being read and hashed altogether.
+        """
+        entry = self.pages.get(source)
+        if entry is None:
+            return None
+        if entry.get("source_mtime_ns") == stat.st_mtime_ns and entry.get("source_size") == stat.st_size:
+            return entry.get("source_hash")
+        return None
+
+    def record(
+        self,
+        source: str,
+        stat: os.stat_result,
+        source_hash: str,
+        template_hash: str,
+        basepath: str,
+        output: str,
+        output_hash: str,
+        links: list[Link] | None = None,
+        title: str | None = None,
+        front_matter: FrontMatter | None = None,
+        output_stat: os.stat_result | None = None,
+    ) -> None:
+        """Store the inputs and output of a freshly rendered page, and its links and title if collected.
+
+        *output_stat* is the output file's stat once written, which lets
+        :meth:`output_hash` vouch for it on the next build.
+        """
+        self.pages[source] = {
+            "source_hash": source_hash,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "source_size": stat.st_size,
+            "front_matter": front_matter.fields if front_matter is not None else {},
+            "template_hash": template_hash,
+            "basepath": basepath,
+            "output": output,
+            "output_hash": output_hash,
+        }
+        if output_stat is not None:
+            self.pages[source]["output_mtime_ns"] = output_stat.st_mtime_ns
+            self.pages[source]["output_size"] = output_stat.st_size
+        if links is not None:
+            self.pages[source]["links"] = [list(link) for link in links]
+        if title is not None:
+            self.pages[source]["title"] = title
+
+    def output_hash(self, source: str, output_path: str) -> str | None:
+        """Return the recorded hash of the output of *source* if the file at *output_path* is unchanged.
+
+        The file must still have the size and mtime recorded when it was
+        written; otherwise, or if they were not recorded, None.
+        """
+        entry = self.pages.get(source)
+        if entry is None or "output_mtime_ns" not in entry:
+            return None
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return None
+        if stat.st_mtime_ns != entry["output_mtime_ns"] or stat.st_size != entry.get("output_size"):
+            return None
+        return entry.get("output_hash")
+
+    def links(self, source: str) -> list[Link] | None:
+        """Return the recorded links of *source*, or None if they were not collected."""
+        links = self.pages.get(source, {}).get("links")
+        if links is None:
+            return None
+        return [(tag, url) for tag, url in links]
+
+    def front_matter(self, source: str, stat: os.stat_result) -> FrontMatter | None:
+        """Return the recorded front matter of *source* if its size and mtime are unchanged.
+
+        This lets incremental builds find drafts and template overrides
+        without opening unchanged sources.
+        """
+        entry = self.pages.get(source)
+        if (
+            entry is None
+            or "front_matter" not in entry
+            or entry.get("source_mtime_ns") != stat.st_mtime_ns
+            or entry.get("source_size") != stat.st_size
+        ):
+            return None
+        return FrontMatter(entry["front_matter"])
+
+    def title(self, source: str) -> str | None:
+        """Return the recorded title of *source*, or None if it was not collected."""
+        return self.pages.get(source, {}).get("title")
+
+    def touch(self, source: str, stat: os.stat_result) -> None:
+        """Refresh the recorded size and mtime of an unchanged *source*."""
+        entry = self.pages[source]
+        entry["source_mtime_ns"] = stat.st_mtime_ns
+        entry["source_size"] = stat.st_size
+
+
+# ---------------------------------------------------------------------------
+# Changed outputs
+# ---------------------------------------------------------------------------
+
+class OutputChanges(Collector):
+    """The output files a build wrote, left untouched or removed.
+
+    Pages are written only when their content differs from the file already
+    on disk, so :attr:`written` is exactly what a deploy has to upload and
+    :attr:`removed` what it has to delete. Saved as::
+
+        {
+            "version": 1,
+            "written": ["blog/tom/index.html", "index.css"],
+            "removed": ["old/index.html"],
+            "unchanged": 118
+        }
+
+    Attributes:
+        written: Output paths whose content changed (or that are new).
+        unchanged: Output paths whose existing content was already identical.
+        removed: Output paths deleted by the build.
+    """
+
+    _drained = {"written": list, "unchanged": list, "removed": list}
+
+    def __init__(self) -> None:
+        self.written: list[str] = []
+        self.unchanged: list[str] = []
+        self.removed: list[str] = []
+
+    def record(self, path: str, changed: bool) -> None:
+        """Note that output *path* was rendered and whether its content changed."""
+        (self.written if changed else self.unchanged).append(path)
+
+    def to_dict(self, root: str) -> dict:
+        """Return the saved form, with paths relative to *root* using ``/``."""
+
+        def relative(paths: list[str]) -> list[str]:
+            return sorted({os.path.relpath(path, root).replace(os.sep, "/") for path in paths})
+
+        return {
+            "version": CHANGES_VERSION,
+            "written": relative(self.written),
+            "removed": relative(self.removed),
+            "unchanged": len(self.unchanged),
+        }
+
+    def save(self, path: str, root: str) -> None:
+        """Atomically write the changes to *path*, relative to the output *root*."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(root), f, indent=1)
+        os.replace(tmp_path, path)
+
+    def __repr__(self) -> str:
+        return (
+            f"OutputChanges(written={len(self.written)}, unchanged={len(self.unchanged)}, "
+            f"removed={len(self.removed)})"
+        )
+
+
+class OutputFile:
+    """Binary file wrapper that encodes text once, hashing and counting the bytes.
+
+    Attributes:
+        digest: SHA-256 of the bytes written so far.
+        size: Number of bytes written so far.
+        changed: False once the output turned out identical to the existing file.
+    """
+
+    def __init__(self, f: IO[bytes]) -> None:
+        self._f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.changed = True
+
+    def write(self, fragment: str) -> None:
+        data = fragment.encode("utf-8")
+        self._f.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+
+@contextlib.contextmanager
+def atomic_output(
+    dest_path: str, changes: OutputChanges | None = None, known_hash: str | None = None
+) -> Iterator[OutputFile]:
+    """Write to a temporary file that replaces *dest_path* only if the content differs.
+
+    The output is hashed as it is written. When *dest_path* already holds
+    the same bytes (same size, then same SHA-256), the temporary file is
+    discarded and the existing file, with its modification time, is left
+    alone. Otherwise it atomically replaces *dest_path*, so readers (such as
+    the watch-mode server) never see a partial page. Either way the outcome
+    is recorded in *changes*.
+
+    *known_hash* is the SHA-256 *dest_path* is known to hold, such as the
+    hash a :class:`BuildManifest` recorded for it; it is compared instead
+    of reading the file back.
+    """
+    dest_dir = os.path.dirname(dest_path)
+    if dest_dir:
+        os.makedirs(dest_dir, exist_ok=True)
+    tmp_path = f"{dest_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            out = OutputFile(f)
+            yield out
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if _has_content(dest_path, out.size, out.digest.hexdigest(), known_hash):
+        os.remove(tmp_path)
+        out.changed = False
+    else:
+        os.replace(tmp_path, dest_path)
+    if changes is not None:
+        changes.record(dest_path, out.changed)
+
+
+def _has_content(path: str, size: int, digest: str, known_hash: str | None = None) -> bool:
+    """Return True if the file at *path* is *size* bytes with SHA-256 *digest*.
+
+    The file is only read when its hash is not *known_hash* already.
+    """
+    try:
+        if os.stat(path).st_size != size:
+            return False
+    except FileNotFoundError:
+        return False
+    if known_hash is not None:
+        return known_hash == digest
+    return hash_file(path) == digest
@@ -1,4 +1,4 @@
 # Re-export shim – implementation lives in block_markdown.py
-from block_markdown import markdown_to_blocks
+from block_markdown import Block, iter_blocks, markdown_to_blocks
 
-__all__ = ["markdown_to_blocks"]
\ No newline at end of file
+__all__ = ["Block", "iter_blocks", "markdown_to_blocks"]
\ No newline at end of file
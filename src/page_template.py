@@ -0,0 +1,202 @@
+"""Compiled HTML page templates with ``{{ Title }}``/``{{ Content }}`` slots."""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from typing import TextIO
+
+    from htmlnode import HTMLNode
+
+TITLE_SLOT = "title"
+CONTENT_SLOT = "content"
+
+_SLOT_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+_ABSOLUTE_URL_PATTERN = re.compile(r'(href|src)="/')
+
+
+def _basepath_replacement(basepath: str) -> str:
+    """Return the ``re.sub`` replacement template that inserts *basepath*."""
+    return r'\1="' + basepath.replace("\\", "\\\\")
+
+
+def make_basepath_rewriter(basepath: str):
+    """Return a function that prefixes absolute ``href``/``src`` URLs with *basepath*.
+
+    ``href="/x"`` becomes ``href="{basepath}x"`` (likewise for ``src``) in a
+    single scan. For the default basepath ``"/"`` the rewrite is the identity,
+    so ``None`` is returned and callers can skip it entirely.
+    """
+    if basepath == "/":
+        return None
+    replacement = _basepath_replacement(basepath)
+
+    def rewrite(text: str) -> str:
+        return _ABSOLUTE_URL_PATTERN.sub(replacement, text)
+
+    return rewrite
+
+
+class _BasepathWriter:
+    """Apply the basepath rewrite to a stream of HTML fragments.
+
+    A match may straddle two fragments, so the last few characters of each
+    write are held back until the next one (or :meth:`flush`) arrives. The
+    result is identical to rewriting the concatenated fragments.
+    """
+
+    # len('href="/') - 1: the longest proper prefix of a match.
+    _HOLD_BACK = 6
+
+    def __init__(self, write: Callable[[str], object], basepath: str) -> None:
+        self._write = write
+        self._replacement = _basepath_replacement(basepath)
+        self._carry = ""
+
+    def write(self, fragment: str) -> None:
+        text = self._carry + fragment
+        cut = len(text) - self._HOLD_BACK
+        if cut <= 0:
+            self._carry = text
+            return
+        out: list[str] = []
+        pos = 0
+        for match in _ABSOLUTE_URL_PATTERN.finditer(text):
+            if match.start() >= cut:
+                break
+            out.append(text[pos:match.start()])
+            out.append(match.expand(self._replacement))
+            pos = match.end()
+        cut = max(cut, pos)
+        out.append(text[pos:cut])
+        self._write("".join(out))
+        self._carry = text[cut:]
+
+    def flush(self) -> None:
+        if self._carry:
+            self._write(_ABSOLUTE_URL_PATTERN.sub(self._replacement, self._carry))
+            self._carry = ""
+
+
+class CompiledTemplate:
+    """An HTML template split into static segments and placeholder slots.
+
+    The basepath rewrite is applied to the static segments once at compile
+    time; only the per-page title and content are rewritten when rendering.
+
+    Args:
+        source: Raw template text.
+        basepath: URL base path prefix for absolute ``href``/``src`` values.
+        path: The file the template was read from, if any.
+
+    Attributes:
+        source: The raw template text (used for change detection).
+        basepath: The basepath the template was compiled for.
+        path: The file the template was read from; templates named by page
+            front matter are found relative to its directory.
+        parts: Alternating static strings and slot names; slot names are
+            :data:`TITLE_SLOT` or :data:`CONTENT_SLOT`.
+    """
+
+    def __init__(self, source: str, basepath: str = "/", path: str | None = None) -> None:
+        self.source = source
+        self.basepath = basepath
+        self.path = path
+        self._overrides: dict[str, CompiledTemplate] = {}
+        self._rewrite = make_basepath_rewriter(basepath)
+
+        parts: list[str] = []
+        slots: list[int] = []
+        pos = 0
+        for match in _SLOT_PATTERN.finditer(source):
+            parts.append(self._rewrite_text(source[pos:match.start()]))
+            slots.append(len(parts))
+            parts.append(TITLE_SLOT if match.group(1) == "Title" else CONTENT_SLOT)
+            pos = match.end()
+        parts.append(self._rewrite_text(source[pos:]))
+        self.parts = parts
+        self._slots = slots
+
+    @classmethod
+    def load(cls, template_path: str, basepath: str = "/") -> CompiledTemplate:
+        """Read and compile the template at *template_path*."""
+        with open(template_path, "r", encoding="utf-8") as f:
+            return cls(f.read(), basepath, template_path)
+
+    def for_page(self, name: str | None) -> CompiledTemplate:
+        """Return the template a page's front matter names, or this one if it names none.
+
+        *name* is relative to the directory of :attr:`path`. Each template
+        is read and compiled once, then reused for every page naming it.
+        """
+        if not name:
+            return self
+        template = self._overrides.get(name)
+        if template is None:
+            template = self._overrides[name] = CompiledTemplate.load(self.override_path(name), self.basepath)
+        return template
+
+    def override_path(self, name: str) -> str:
+        """Return the path of the template *name* that a page's front matter names."""
+        directory = os.path.dirname(self.path) if self.path else ""
+        return os.path.join(directory, name)
+
+    def clear_overrides(self) -> None:
+        """Forget the templates loaded by :meth:`for_page`, so edits to them are read again."""
+        self._overrides.clear()
+
+    def _rewrite_text(self, text: str) -> str:
+        return self._rewrite(text) if self._rewrite is not None else text
+
+    def render(self, title: str, content: str) -> str:
+        """Fill the slots with *title* and *content* and return the page HTML.
+
+        Args:
+            title: Page title text.
+            content: Rendered HTML body.
+
+        Returns:
+            The final HTML document, built with a single join.
+        """
+        values = {
+            TITLE_SLOT: self._rewrite_text(title),
+            CONTENT_SLOT: self._rewrite_text(content),
+        }
+        parts = list(self.parts)
+        for index in self._slots:
+            parts[index] = values[parts[index]]
+        return "".join(parts)
+
+    def render_to(self, writer: TextIO | list[str], title: str, content: HTMLNode) -> None:
+        """Stream the page to *writer*, rendering *content* between the static segments.
+
+        The body is never materialised as one string: fragments go straight
+        from :meth:`HTMLNode.render_to` to *writer*. Output is identical to
+        ``render(title, content.to_html())``.
+
+        Args:
+            writer: A text file-like object or a list of fragments.
+            title: Page title text.
+            content: Root node of the rendered markdown body, or any object
+                with a matching ``render_to(writer)`` method.
+        """
+        write = writer.append if isinstance(writer, list) else writer.write
+        slots = set(self._slots)
+        for index, part in enumerate(self.parts):
+            if index not in slots:
+                write(part)
+            elif part == TITLE_SLOT:
+                write(self._rewrite_text(title))
+            else:
+                if self._rewrite is None:
+                    content.render_to(writer)
+                else:
+                    stream = _BasepathWriter(write, self.basepath)
+                    content.render_to(stream)
+                    stream.flush()
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate(basepath={self.basepath!r}, parts={len(self.parts)})"
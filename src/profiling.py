@@ -0,0 +1,142 @@
+"""Per-stage build profiling: timers, counters, summary report and JSON trace.
+
+Profiling is opt-in. Every instrumented function takes an optional profile
+argument and only does extra work when it is not None, so the cost of the
+hooks when profiling is off is a single ``is None`` check.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+# Pipeline stages, in the order they run for a page.
+STAGES = ("read", "blocks", "classify", "inline", "tree", "render", "template", "write")
+
+
+class PageProfile:
+    """Timings and counters for a single page.
+
+    Attributes:
+        source: Path of the markdown source.
+        stages: Seconds spent in each of :data:`STAGES`.
+        bytes_in: Size of the markdown source (UTF-8).
+        bytes_out: Size of the written HTML (UTF-8).
+        text_nodes: Number of TextNode instances produced by inline parsing.
+        html_nodes: Number of HTMLNode instances in the page tree.
+        blocks: Block counts keyed by ``BlockType`` value.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.stages: dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.text_nodes = 0
+        self.html_nodes = 0
+        self.blocks: dict[str, int] = {}
+
+    @property
+    def total(self) -> float:
+        """Total seconds across all stages."""
+        return sum(self.stages.values())
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        self.stages[stage] += seconds
+
+    def count_block(self, block_type_value: str) -> None:
+        self.blocks[block_type_value] = self.blocks.get(block_type_value, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "total_s": self.total,
+            "stages_s": dict(self.stages),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "text_nodes": self.text_nodes,
+            "html_nodes": self.html_nodes,
+            "blocks": dict(self.blocks),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PageProfile:
+        profile = cls(data["source"])
+        profile.stages.update(data["stages_s"])
+        profile.bytes_in = data["bytes_in"]
+        profile.bytes_out = data["bytes_out"]
+        profile.text_nodes = data["text_nodes"]
+        profile.html_nodes = data["html_nodes"]
+        profile.blocks = dict(data["blocks"])
+        return profile
+
+    def __repr__(self) -> str:
+        return f"PageProfile({self.source!r}, total={self.total:.6f}s)"
+
+
+class BuildProfiler:
+    """Collects :class:`PageProfile` records for a whole build."""
+
+    def __init__(self) -> None:
+        self.pages: list[PageProfile] = []
+        self._started = time.perf_counter()
+        self.wall_time = 0.0
+
+    def add(self, profile: PageProfile) -> None:
+        self.pages.append(profile)
+
+    def finish(self) -> None:
+        """Record the wall-clock duration of the build."""
+        self.wall_time = time.perf_counter() - self._started
+
+    def summary(self) -> dict:
+        """Return build-wide totals for every stage and counter."""
+        stages = dict.fromkeys(STAGES, 0.0)
+        blocks: dict[str, int] = {}
+        for page in self.pages:
+            for stage, seconds in page.stages.items():
+                stages[stage] += seconds
+            for block_type, count in page.blocks.items():
+                blocks[block_type] = blocks.get(block_type, 0) + count
+        return {
+            "pages": len(self.pages),
+            "wall_s": self.wall_time,
+            "stages_s": stages,
+            "bytes_in": sum(page.bytes_in for page in self.pages),
+            "bytes_out": sum(page.bytes_out for page in self.pages),
+            "text_nodes": sum(page.text_nodes for page in self.pages),
+            "html_nodes": sum(page.html_nodes for page in self.pages),
+            "blocks": dict(sorted(blocks.items())),
+        }
+
+    def slowest(self, count: int = 10) -> list[PageProfile]:
+        """Return the *count* slowest pages, slowest first (ties by source)."""
+        return sorted(self.pages, key=lambda page: (-page.total, page.source))[:count]
+
+    def report(self, count: int = 10) -> str:
+        """Return a human-readable summary of the build."""
+        summary = self.summary()
+        staged = sum(summary["stages_s"].values()) or 1.0
+        lines = [
+            f"Profiled {summary['pages']} page(s) in {summary['wall_s']:.3f}s wall time",
+            f"  bytes in: {summary['bytes_in']:,}  bytes out: {summary['bytes_out']:,}",
+            f"  text nodes: {summary['text_nodes']:,}  html nodes: {summary['html_nodes']:,}",
+            "  blocks: " + ", ".join(f"{name}={n:,}" for name, n in summary["blocks"].items()),
+            "  stage          seconds      share",
+        ]
+        for stage, seconds in summary["stages_s"].items():
+            lines.append(f"  {stage:<12} {seconds:9.4f}  {seconds / staged:8.1%}")
+        lines.append(f"  slowest {count} page(s):")
+        for page in self.slowest(count):
+            lines.append(f"    {page.total * 1e3:9.2f} ms  {page.source}")
+        return "\n".join(lines)
+
+    def write_trace(self, path: str, count: int = 50) -> None:
+        """Write the summary and the *count* slowest pages to *path* as JSON."""
+        trace = {
+            "summary": self.summary(),
+            "slowest": [page.to_dict() for page in self.slowest(count)],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, indent=2)
+            f.write("\n")
@@ -0,0 +1,212 @@
+"""Site-wide full-text search index, built while pages render.
+
+Each rendered page contributes the words of its body, taken from the HTML
+node tree the page was rendered from, i.e. the text of the ``TextNode``
+stream produced by inline parsing (blocks served by the block cache carry
+the same text alongside their HTML). Parallel workers index their own pages
+and the parent merges them; nothing is re-read or re-parsed afterwards.
+
+The index is written under ``search/`` in the output directory as small
+JSON files that a browser can fetch lazily::
+
+    search/pages.json   {"version": 1,
+                         "pages": [[url, title, output path], …],
+                         "shards": ["a", "b", …, "_"]}
+    search/a.json       {"apple": [0, 2, 5, 10, 3, 1, 7], …}
+
+Tokens are lower-cased runs of word characters. Each token lives in the
+shard named after its first character (``a``-``z``, ``0``-``9``, else
+``_``). Its postings are one flat list per token, delta-encoded: for each
+page, the page id minus the previous page id, the number of positions,
+then the positions (word offsets in the page body) as deltas. Above, the
+token is at words 5 and 15 of page 0 and at word 7 of page 3.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import TYPE_CHECKING
+
+from collector import Collector
+from discovery import page_url
+from htmlnode import node_text
+from manifest import atomic_output
+
+if TYPE_CHECKING:
+    from htmlnode import HTMLNode
+    from manifest import OutputChanges
+
+SEARCH_VERSION = 1
+
+# Directory of the index inside the output root.
+SEARCH_DIRECTORY = "search"
+
+# Token -> word positions in one page, in order.
+Terms = dict[str, list[int]]
+
+_WORD_PATTERN = re.compile(r"\w+")
+_SHARD_CHARACTERS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+
+
+def shard_key(token: str) -> str:
+    """Return the name of the shard holding *token*."""
+    first = token[0]
+    return first if first in _SHARD_CHARACTERS else "_"
+
+
+def is_search_output(rel_path: str) -> bool:
+    """Return True if *rel_path*, relative to the output root, belongs to the search index."""
+    return rel_path.replace(os.sep, "/").startswith(f"{SEARCH_DIRECTORY}/")
+
+
+class PageText:
+    """The words of one page, collected from its HTML nodes as they are rendered.
+
+    Attributes:
+        title: The page title, set by the renderer.
+        terms: Word positions of each token.
+        words: Number of words seen so far.
+    """
+
+    def __init__(self, title: str = "") -> None:
+        self.title = title
+        self.terms: Terms = {}
+        self.words = 0
+
+    def add(self, node: HTMLNode) -> None:
+        """Index the text under *node*, continuing the page's word positions."""
+        terms = self.terms
+        position = self.words
+        for token in _WORD_PATTERN.findall(node_text(node).lower()):
+            positions = terms.get(token)
+            if positions is None:
+                terms[token] = [position]
+            else:
+                positions.append(position)
+            position += 1
+        self.words = position
+
+
+class SearchIndex(Collector):
+    """The indexed text of every page rendered by a build.
+
+    Attributes:
+        pages: ``(title, terms)`` of each page, keyed by the page's output path.
+    """
+
+    _drained = {"pages": dict}
+
+    def __init__(self) -> None:
+        self.pages: dict[str, tuple[str, Terms]] = {}
+
+    @classmethod
+    def load(cls, root: str) -> SearchIndex:
+        """Read back the index written to *root* by a previous build.
+
+        Incremental builds start from it so that unchanged pages, which are
+        not rendered, stay searchable. A missing or out-of-date index yields
+        an empty one.
+        """
+        index = cls()
+        directory = os.path.join(root, SEARCH_DIRECTORY)
+        try:
+            with open(os.path.join(directory, "pages.json"), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get("version") != SEARCH_VERSION:
+                return index
+            pages = [(os.path.join(root, output), title) for _, title, output in data["pages"]]
+            terms: list[Terms] = [{} for _ in pages]
+            for key in data["shards"]:
+                with open(os.path.join(directory, f"{key}.json"), "r", encoding="utf-8") as f:
+                    shard = json.load(f)
+                for token, postings in shard.items():
+                    _decode_postings(token, postings, terms)
+        except (OSError, ValueError, KeyError, TypeError):
+            return index
+        for (page, title), page_terms in zip(pages, terms):
+            index.pages[page] = (title, page_terms)
+        return index
+
+    def record(self, page: str, text: PageText) -> None:
+        """Set the indexed text of output *page*, replacing any recorded before."""
+        self.pages[page] = (text.title, text.terms)
+
+    def write(self, root: str, basepath: str = "/", changes: OutputChanges | None = None) -> dict:
+        """Write the index under *root*/``search``, replacing only files whose content changed.
+
+        Page ids follow the sorted output paths, so the same site always
+        produces the same files. Shards no longer needed are removed.
+
+        Args:
+            root: The output directory the pages were written to.
+            basepath: URL base path prefix of the page URLs.
+            changes: Optional record of written and removed index files.
+
+        Returns:
+            The number of pages, distinct tokens, shards and bytes written.
+        """
+        outputs = sorted(
+            (os.path.relpath(page, root).replace(os.sep, "/"), page) for page in self.pages
+        )
+        prefix = basepath.rstrip("/") + "/"
+        page_list = []
+        postings: dict[str, list[int]] = {}
+        last_page: dict[str, int] = {}
+        for page_id, (output, page) in enumerate(outputs):
+            title, terms = self.pages[page]
+            url = prefix + page_url(output)
+            page_list.append([url, title, output])
+            for token, positions in terms.items():
+                encoded = postings.get(token)
+                if encoded is None:
+                    encoded = postings[token] = []
+                encoded.append(page_id - last_page.get(token, 0))
+                last_page[token] = page_id
+                encoded.append(len(positions))
+                previous = 0
+                for position in positions:
+                    encoded.append(position - previous)
+                    previous = position
+
+        shards: dict[str, dict[str, list[int]]] = {}
+        for token in sorted(postings):
+            shards.setdefault(shard_key(token), {})[token] = postings[token]
+
+        directory = os.path.join(root, SEARCH_DIRECTORY)
+        files = {f"{key}.json": shard for key, shard in shards.items()}
+        files["pages.json"] = {"version": SEARCH_VERSION, "pages": page_list, "shards": sorted(shards)}
+        size = 0
+        for name, data in files.items():
+            text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+            with atomic_output(os.path.join(directory, name), changes) as out:
+                out.write(text)
+            size += out.size
+        for name in sorted(os.listdir(directory)):
+            if name not in files:
+                path = os.path.join(directory, name)
+                os.remove(path)
+                if changes is not None:
+                    changes.removed.append(path)
+        return {"pages": len(page_list), "tokens": len(postings), "shards": len(shards), "bytes": size}
+
+    def __repr__(self) -> str:
+        return f"SearchIndex(pages={len(self.pages)})"
+
+
+def _decode_postings(token: str, postings: list[int], terms: list[Terms]) -> None:
+    """Add the positions encoded in *postings* to the terms of each page."""
+    i = 0
+    page_id = 0
+    while i < len(postings):
+        page_id += postings[i]
+        count = postings[i + 1]
+        i += 2
+        positions = []
+        position = 0
+        for delta in postings[i:i + count]:
+            position += delta
+            positions.append(position)
+        i += count
+        terms[page_id][token] = positions
@@ -1,4 +1,4 @@
 # Re-export shim – implementation lives in inline_markdown.py
-from inline_markdown import split_nodes_image, split_nodes_link
+from inline_markdown import split_nodes_image, split_nodes_image_and_link, split_nodes_link
 
-__all__ = ["split_nodes_image", "split_nodes_link"]
\ No newline at end of file
+__all__ = ["split_nodes_image", "split_nodes_image_and_link", "split_nodes_link"]
\ No newline at end of file
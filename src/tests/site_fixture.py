@@ -0,0 +1,47 @@
+"""Shared fixture for tests that build a small site in a temporary directory."""
+
+import os
+import tempfile
+import unittest
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+
+class SiteTestCase(unittest.TestCase):
+    """A content tree, output directory and page template under a fresh root.
+
+    Subclasses list their pages in :attr:`PAGES`, which ``setUp`` writes
+    under :attr:`content`. Nothing is built; that is up to each test.
+
+    Attributes:
+        root: The temporary directory, removed after the test.
+        content: Markdown source directory.
+        docs: Output directory (not created).
+        template: Path of the page template, holding :data:`TEMPLATE`.
+        manifest: Path for an incremental build manifest (not created).
+    """
+
+    # Markdown text by path relative to the content directory.
+    PAGES: dict[str, str] = {}
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.docs = os.path.join(self.root, "docs")
+        self.template = os.path.join(self.root, "template.html")
+        self.manifest = os.path.join(self.root, "manifest.json")
+        self._write(self.template, TEMPLATE)
+        for rel_path, text in self.PAGES.items():
+            self._write(os.path.join(self.content, rel_path), text)
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _read(self, *parts):
+        """Return the text of the file at *parts*, relative to :attr:`docs` unless absolute."""
+        with open(os.path.join(self.docs, *parts), encoding="utf-8") as f:
+            return f.read()
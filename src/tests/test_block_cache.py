@@ -0,0 +1,208 @@
+import os
+import pickle
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from block_cache import BlockCache
+from block_markdown import BlockType, markdown_to_html_node
+from build import generate_pages_incremental, generate_pages_parallel
+from profiling import PageProfile
+
+DISCLAIMER = "This page is **not** legal advice."
+
+DOCUMENT = f"""# Title
+
+{DISCLAIMER}
+
+- one
+- _two_
+
+```
+code here
+```
+"""
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_miss_then_hit(self):
+        cache = BlockCache()
+        self.assertIsNone(cache.get("text", BlockType.PARAGRAPH))
+        cache.put("text", BlockType.PARAGRAPH, "<p>text</p>")
+        self.assertEqual(cache.get("text", BlockType.PARAGRAPH), ("<p>text</p>", ""))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_block_type_is_part_of_the_key(self):
+        cache = BlockCache()
+        cache.put("text", BlockType.PARAGRAPH, "<p>text</p>")
+        self.assertIsNone(cache.get("text", BlockType.QUOTE))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = BlockCache(maxsize=2)
+        cache.put("a", BlockType.PARAGRAPH, "<p>a</p>")
+        cache.put("b", BlockType.PARAGRAPH, "<p>b</p>")
+        cache.get("a", BlockType.PARAGRAPH)
+        cache.put("c", BlockType.PARAGRAPH, "<p>c</p>")
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b", BlockType.PARAGRAPH))
+        self.assertEqual(cache.get("a", BlockType.PARAGRAPH), ("<p>a</p>", ""))
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            BlockCache(maxsize=0)
+
+    def test_stats(self):
+        cache = BlockCache()
+        cache.get("a", BlockType.PARAGRAPH)
+        cache.put("a", BlockType.PARAGRAPH, "<p>a</p>")
+        cache.get("a", BlockType.PARAGRAPH)
+        cache.get("a", BlockType.PARAGRAPH)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (2, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+    def test_copies_start_with_fresh_counters(self):
+        cache = BlockCache()
+        cache.put("a", BlockType.PARAGRAPH, "<p>a</p>")
+        cache.get("a", BlockType.PARAGRAPH)
+        copy = pickle.loads(pickle.dumps(cache))
+        self.assertEqual((copy.hits, copy.misses), (0, 0))
+        self.assertEqual(copy.get("a", BlockType.PARAGRAPH), ("<p>a</p>", ""))
+
+
+class TestBlockCacheStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "cache.json")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        cache = BlockCache.load(self.path)
+        cache.put("a", BlockType.PARAGRAPH, "<p>a</p>")
+        cache.save()
+        reloaded = BlockCache.load(self.path)
+        self.assertEqual(reloaded.get("a", BlockType.PARAGRAPH), ("<p>a</p>", ""))
+        self.assertEqual(reloaded.disk_hits, 1)
+
+    def test_save_keeps_blocks_from_earlier_builds(self):
+        cache = BlockCache.load(self.path)
+        cache.put("a", BlockType.PARAGRAPH, "<p>a</p>")
+        cache.put("b", BlockType.PARAGRAPH, "<p>b</p>")
+        cache.save()
+        second = BlockCache.load(self.path)
+        second.get("a", BlockType.PARAGRAPH)
+        second.save()
+        third = BlockCache.load(self.path)
+        self.assertEqual(third.build, 2)
+        self.assertEqual(third.get("a", BlockType.PARAGRAPH), ("<p>a</p>", ""))
+        self.assertEqual(third.get("b", BlockType.PARAGRAPH), ("<p>b</p>", ""))
+
+    def test_store_drops_the_least_recently_used_blocks(self):
+        cache = BlockCache.load(self.path, store_size=2)
+        cache.put("a", BlockType.PARAGRAPH, "<p>a</p>")
+        cache.put("b", BlockType.PARAGRAPH, "<p>b</p>")
+        cache.save()
+        second = BlockCache.load(self.path, store_size=2)
+        second.put("c", BlockType.PARAGRAPH, "<p>c</p>")
+        second.get("a", BlockType.PARAGRAPH)
+        second.save()
+        third = BlockCache.load(self.path, store_size=2)
+        self.assertIsNone(third.get("b", BlockType.PARAGRAPH))
+        self.assertIsNotNone(third.get("a", BlockType.PARAGRAPH))
+        self.assertIsNotNone(third.get("c", BlockType.PARAGRAPH))
+
+    def test_blocks_used_by_a_build_are_bounded(self):
+        cache = BlockCache.load(self.path, store_size=2)
+        for text in ("a", "b", "c"):
+            cache.put(text, BlockType.PARAGRAPH, f"<p>{text}</p>")
+        cache.save()
+        reloaded = BlockCache.load(self.path)
+        self.assertIsNone(reloaded.get("a", BlockType.PARAGRAPH))
+        self.assertEqual(reloaded.get("c", BlockType.PARAGRAPH), ("<p>c</p>", ""))
+
+    def test_incremental_builds_keep_the_blocks_of_unchanged_pages(self):
+        content = os.path.join(self._tmp.name, "content")
+        os.makedirs(content)
+        for n in range(2):
+            with open(os.path.join(content, f"page{n}.md"), "w", encoding="utf-8") as f:
+                f.write(f"# Page {n}\n\nBody {n}")
+        template = os.path.join(self._tmp.name, "template.html")
+        with open(template, "w", encoding="utf-8") as f:
+            f.write("{{ Title }}{{ Content }}")
+        manifest = os.path.join(self._tmp.name, "manifest.json")
+        for edit in ("Body 0", "Edited"):
+            with open(os.path.join(content, "page0.md"), "w", encoding="utf-8") as f:
+                f.write(f"# Page 0\n\n{edit}")
+            cache = BlockCache.load(self.path)
+            with redirect_stdout(StringIO()):
+                generate_pages_incremental(
+                    content, template, os.path.join(self._tmp.name, "docs"), manifest_path=manifest, cache=cache
+                )
+            cache.save()
+        # The second build only rendered page0; page1's blocks are still stored.
+        warm = BlockCache.load(self.path)
+        self.assertEqual(warm.get("Body 1", BlockType.PARAGRAPH), ("<p>Body 1</p>", "Body 1"))
+        self.assertEqual(warm.get("Edited", BlockType.PARAGRAPH), ("<p>Edited</p>", "Edited"))
+
+    def test_corrupt_store_is_ignored(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertEqual(len(BlockCache.load(self.path)), 0)
+
+    def test_in_memory_cache_does_not_save(self):
+        cache = BlockCache()
+        cache.put("a", BlockType.PARAGRAPH, "<p>a</p>")
+        cache.save()
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestCachedRendering(unittest.TestCase):
+    def test_output_is_identical(self):
+        cache = BlockCache()
+        expected = markdown_to_html_node(DOCUMENT).to_html()
+        self.assertEqual(markdown_to_html_node(DOCUMENT, cache=cache).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(DOCUMENT, cache=cache).to_html(), expected)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_shared_block_is_rendered_once(self):
+        cache = BlockCache()
+        for title in ("One", "Two", "Three"):
+            markdown_to_html_node(f"# {title}\n\n{DISCLAIMER}", cache=cache)
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(cache.hits, 2)
+
+    def test_profiled_output_is_identical(self):
+        cache = BlockCache()
+        markdown_to_html_node(DOCUMENT, cache=cache)
+        profile = PageProfile("doc.md")
+        html = markdown_to_html_node(DOCUMENT, profile, cache).to_html()
+        self.assertEqual(html, markdown_to_html_node(DOCUMENT).to_html())
+        self.assertEqual(profile.text_nodes, 0)
+
+    def test_parallel_build_merges_worker_stats(self):
+        with tempfile.TemporaryDirectory() as root:
+            content = os.path.join(root, "content")
+            os.makedirs(content)
+            for n in range(6):
+                with open(os.path.join(content, f"page{n}.md"), "w", encoding="utf-8") as f:
+                    f.write(f"# Page {n}\n\n{DISCLAIMER}")
+            template = os.path.join(root, "template.html")
+            with open(template, "w", encoding="utf-8") as f:
+                f.write("{{ Title }}{{ Content }}")
+            cache = BlockCache.load(os.path.join(root, "cache.json"))
+            with redirect_stdout(StringIO()):
+                generate_pages_parallel(content, template, os.path.join(root, "docs"), jobs=2, cache=cache)
+            self.assertEqual(cache.hits + cache.misses, 12)
+            cache.save()
+            warm = BlockCache.load(cache.path)
+            self.assertEqual(
+                warm.get(DISCLAIMER, BlockType.PARAGRAPH),
+                ("<p>This page is <b>not</b> legal advice.</p>", "This page is  not  legal advice."),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
+import random
 import unittest
 from blocktype import block_to_block_type, BlockType
+from block_markdown import classify_block
 
 class TestBlockToBlockType(unittest.TestCase):
     def test_heading_h1(self):
@@ -62,5 +64,54 @@ class TestBlockToBlockType(unittest.TestCase):
         block = "This is a paragraph\nwith multiple lines\nbut no special syntax"
         self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
 
+    def test_long_ordered_list(self):
+        lines = [f"{i}. item" for i in range(1, 3001)]
+        self.assertEqual(block_to_block_type("\n".join(lines)), BlockType.ORDERED_LIST)
+        lines[2500] = "2501 item"
+        self.assertEqual(block_to_block_type("\n".join(lines)), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("\n".join(lines[:10])), BlockType.ORDERED_LIST)
+
+
+class TestClassifyBlock(unittest.TestCase):
+    def test_returns_lines(self):
+        self.assertEqual(classify_block("- a\n- b"), (BlockType.UNORDERED_LIST, ["- a", "- b"]))
+        self.assertEqual(classify_block("> a\nb"), (BlockType.PARAGRAPH, ["> a", "b"]))
+
+    def test_heading_and_code_are_not_split(self):
+        self.assertEqual(classify_block("## Title"), (BlockType.HEADING, None))
+        self.assertEqual(classify_block("```\ncode\n```"), (BlockType.CODE, None))
+
+    def test_matches_per_type_scans(self):
+        def reference(block):
+            lines = block.split("\n")
+            if all(line.startswith(">") for line in lines):
+                return BlockType.QUOTE
+            if all(line.startswith("- ") for line in lines):
+                return BlockType.UNORDERED_LIST
+            if all(line.startswith(f"{i}. ") for i, line in enumerate(lines, start=1)):
+                return BlockType.ORDERED_LIST
+            return BlockType.PARAGRAPH
+
+        rng = random.Random(17)
+        starts = ["> ", ">", "- ", "-", "1. ", "2. ", "10. ", "text ", ""]
+        for _ in range(2000):
+            count = rng.randint(1, 12)
+            kind = rng.choice(["quote", "ul", "ol", "mixed"])
+            lines = []
+            for i in range(1, count + 1):
+                if kind == "quote":
+                    lines.append("> x")
+                elif kind == "ul":
+                    lines.append("- x")
+                elif kind == "ol":
+                    lines.append(f"{i}. x")
+                else:
+                    lines.append(rng.choice(starts) + "x")
+            if rng.random() < 0.3:
+                lines[rng.randrange(count)] = rng.choice(starts) + "y"
+            block = "\n".join(lines)
+            self.assertEqual(classify_block(block)[0], reference(block), block)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,215 @@
+import os
+import pickle
+import unittest
+import xml.etree.ElementTree as ET
+from contextlib import redirect_stdout
+from io import StringIO
+
+from build import generate_pages_incremental, generate_pages_parallel
+from catalog import (
+    PageCatalog,
+    PageInfo,
+    is_catalog_output,
+    tag_slug,
+    write_index_pages,
+    write_sitemap,
+    write_tag_pages,
+)
+from file_operations import generate_pages_recursive
+from manifest import OutputChanges
+from page_template import CompiledTemplate
+from tests.site_fixture import TEMPLATE, SiteTestCase
+
+SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+# Output path relative to content/ -> (markdown, source mtime).
+DATED_PAGES = {
+    "index.md": ("# Home\n\nWelcome", 1_700_000_000),
+    os.path.join("blog", "index.md"): ("# The Blog\n\nPosts", 1_700_000_100),
+    os.path.join("blog", "tom", "index.md"): ("# Tom & Co\n\nOld Tom", 1_700_000_300),
+    os.path.join("blog", "elves.md"): ("# Elves\n\nFair folk", 1_700_000_200),
+    os.path.join("contact", "index.md"): ("# Contact\n\nWrite", 1_700_000_400),
+}
+
+
+class TestPageCatalog(SiteTestCase):
+    PAGES = {rel_path: text for rel_path, (text, _) in DATED_PAGES.items()}
+
+    def setUp(self):
+        super().setUp()
+        for rel_path, (_, mtime) in DATED_PAGES.items():
+            os.utime(os.path.join(self.content, rel_path), (mtime, mtime))
+
+    def _expected(self):
+        return {
+            os.path.join(self.docs, "index.html"): PageInfo(1_700_000_000, "Home"),
+            os.path.join(self.docs, "blog", "index.html"): PageInfo(1_700_000_100, "The Blog"),
+            os.path.join(self.docs, "blog", "tom", "index.html"): PageInfo(1_700_000_300, "Tom & Co"),
+            os.path.join(self.docs, "blog", "elves.html"): PageInfo(1_700_000_200, "Elves"),
+            os.path.join(self.docs, "contact", "index.html"): PageInfo(1_700_000_400, "Contact"),
+        }
+
+    def _build_serial(self):
+        catalog = PageCatalog()
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, self.docs, catalog=catalog)
+        return catalog
+
+    def test_serial_build_records_titles_and_mtimes(self):
+        self.assertEqual(self._build_serial().pages, self._expected())
+
+    def test_parallel_and_pipelined_builds_match(self):
+        for jobs in (1, 2):
+            for pipeline in (False, True):
+                for stream_threshold in (None, 0):
+                    catalog = PageCatalog()
+                    with redirect_stdout(StringIO()):
+                        generate_pages_parallel(
+                            self.content, self.template, self.docs, jobs=jobs, pipeline=pipeline,
+                            stream_threshold=stream_threshold, catalog=catalog,
+                        )
+                    self.assertEqual(catalog.pages, self._expected())
+
+    def test_written_outputs(self):
+        catalog = self._build_serial()
+        template = CompiledTemplate(TEMPLATE, "/base/")
+        changes = OutputChanges()
+        stats = catalog.write(self.docs, template, "https://example.com/", changes=changes)
+        self.assertEqual(stats, {"urls": 6, "sitemaps": 1, "entries": 2, "index_pages": 1, "tag_pages": 0})
+
+        urlset = ET.fromstring(self._read("sitemap.xml"))
+        self.assertEqual(
+            [url.find(f"{SITEMAP}loc").text for url in urlset],
+            [
+                "https://example.com/base/blog/elves.html",
+                "https://example.com/base/blog/",
+                "https://example.com/base/blog/tom/",
+                "https://example.com/base/contact/",
+                "https://example.com/base/",
+                "https://example.com/base/blog/page/1/",
+            ],
+        )
+        self.assertEqual(urlset[0].find(f"{SITEMAP}lastmod").text, "2023-11-14T22:16:40Z")
+
+        feed = ET.fromstring(self._read("blog", "feed.xml"))
+        self.assertEqual(feed.find(f"{ATOM}title").text, "The Blog")
+        self.assertEqual(feed.find(f"{ATOM}updated").text, "2023-11-14T22:18:20Z")
+        entries = feed.findall(f"{ATOM}entry")
+        # Newest first; the collection's own index page is not an entry.
+        self.assertEqual([entry.find(f"{ATOM}title").text for entry in entries], ["Tom & Co", "Elves"])
+        self.assertEqual(entries[0].find(f"{ATOM}id").text, "https://example.com/base/blog/tom/")
+
+        index = self._read("blog", "page", "1", "index.html")
+        self.assertIn('<a href="/base/blog/tom/">Tom &amp; Co</a>', index)
+        self.assertLess(index.index("Tom"), index.index("Elves"))
+        self.assertEqual(len(changes.written), 3)
+
+        changes = OutputChanges()
+        catalog.write(self.docs, template, "https://example.com", changes=changes)
+        self.assertEqual((len(changes.written), len(changes.unchanged)), (0, 3))
+
+    def test_sitemap_is_sharded(self):
+        pages = [(f"p{i}.html", PageInfo(1_700_000_000 + i)) for i in range(5)]
+        changes = OutputChanges()
+        self.assertEqual(write_sitemap(self.docs, "https://example.com/", pages, changes, limit=2), 3)
+        index = ET.fromstring(self._read("sitemap.xml"))
+        self.assertEqual(index.tag, f"{SITEMAP}sitemapindex")
+        self.assertEqual(
+            [sitemap.find(f"{SITEMAP}loc").text for sitemap in index],
+            [f"https://example.com/sitemap-{n}.xml" for n in (1, 2, 3)],
+        )
+        self.assertEqual(len(ET.fromstring(self._read("sitemap-3.xml"))), 1)
+
+        self.assertEqual(write_sitemap(self.docs, "https://example.com/", pages, changes), 1)
+        self.assertEqual(len(ET.fromstring(self._read("sitemap.xml"))), 5)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "sitemap-1.xml")))
+        self.assertEqual(len(changes.removed), 3)
+
+    def test_index_pages_are_paginated(self):
+        template = CompiledTemplate(TEMPLATE)
+        pages = [(f"blog/p{i}.html", PageInfo(1_700_000_000 - i, f"Post {i}")) for i in range(5)]
+        written = write_index_pages(self.docs, template, "blog", "Blog", pages, page_size=2)
+        self.assertEqual([output for output, _ in written], [f"blog/page/{n}/index.html" for n in (1, 2, 3)])
+        self.assertEqual(written[1][1].updated, 1_700_000_000 - 2)
+        second = self._read("blog", "page", "2", "index.html")
+        self.assertIn("<title>Blog (page 2 of 3)</title>", second)
+        self.assertIn("Post 2", second)
+        self.assertIn('<a href="/blog/page/1/" rel="prev">', second)
+        self.assertIn('<a href="/blog/page/3/" rel="next">', second)
+
+        self.assertEqual(len(write_index_pages(self.docs, template, "blog", "Blog", pages[:2], page_size=2)), 1)
+        self.assertEqual(os.listdir(os.path.join(self.docs, "blog", "page")), ["1"])
+        self.assertEqual(write_index_pages(self.docs, template, "blog", "Blog", [], page_size=2), [])
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "page")))
+
+    def test_tag_pages(self):
+        template = CompiledTemplate(TEMPLATE, "/base/")
+        pages = [
+            ("blog/tom.html", PageInfo(1_700_000_300, "Tom", tags=["Old Forest", "tolkien"])),
+            ("blog/elves.html", PageInfo(1_700_000_200, "Elves", tags=["tolkien", "old-forest", "!"])),
+        ]
+        changes = OutputChanges()
+        written = write_tag_pages(self.docs, template, "blog", "Blog", pages, changes)
+        self.assertEqual(
+            [(output, info.title) for output, info in written],
+            [
+                ("blog/tags/old-forest/index.html", "Blog: Old Forest"),
+                ("blog/tags/tolkien/index.html", "Blog: tolkien"),
+            ],
+        )
+        self.assertEqual(written[1][1].updated, 1_700_000_300)
+        tolkien = self._read("blog", "tags", "tolkien", "index.html")
+        self.assertLess(tolkien.index("Tom"), tolkien.index("Elves"))
+        self.assertIn('<a href="/base/blog/tags/old-forest/" rel="tag">Old Forest</a>', tolkien)
+
+        written = write_tag_pages(self.docs, template, "blog", "Blog", pages[1:], changes)
+        self.assertEqual(len(written), 2)
+        self.assertNotIn("Tom", self._read("blog", "tags", "tolkien", "index.html"))
+        self.assertEqual(write_tag_pages(self.docs, template, "blog", "Blog", [], changes), [])
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "tags")))
+        self.assertEqual(len(changes.removed), 2)
+        self.assertEqual([tag_slug(tag) for tag in ("Old  Forest!", "C++", "über")], ["old-forest", "c", "über"])
+
+    def test_catalog_lists_tag_pages_in_the_sitemap(self):
+        self._write(os.path.join(self.content, "blog", "elves.md"), "---\ntags: [elves]\n---\n# Elves")
+        stats = self._build_serial().write(self.docs, CompiledTemplate(TEMPLATE), "https://example.com")
+        self.assertEqual((stats["urls"], stats["tag_pages"]), (7, 1))
+        self.assertIn("<loc>https://example.com/blog/tags/elves/</loc>", self._read("sitemap.xml"))
+
+    def test_incremental_build_keeps_unchanged_pages(self):
+        with redirect_stdout(StringIO()):
+            # Built once without the catalog: the next build must render everything.
+            generate_pages_incremental(self.content, self.template, self.docs, manifest_path=self.manifest)
+            catalog = PageCatalog()
+            result = generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=self.manifest, catalog=catalog
+            )
+            self.assertEqual(len(result.rendered), 5)
+
+            path = os.path.join(self.content, "index.md")
+            self._write(path, "# New Home")
+            os.utime(path, (1_700_000_500, 1_700_000_500))
+            catalog = PageCatalog()
+            result = generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=self.manifest, catalog=catalog
+            )
+        self.assertEqual(len(result.rendered), 1)
+        expected = self._expected()
+        expected[os.path.join(self.docs, "index.html")] = PageInfo(1_700_000_500, "New Home")
+        self.assertEqual(catalog.pages, expected)
+
+    def test_asset_sync_keeps_the_outputs(self):
+        for rel_path in ("sitemap.xml", "sitemap-12.xml", os.path.join("blog", "feed.xml")):
+            self.assertTrue(is_catalog_output(rel_path), rel_path)
+        self.assertFalse(is_catalog_output(os.path.join("images", "sitemap.xml")))
+        self.assertFalse(is_catalog_output("feed.json"))
+
+    def test_copies_start_empty(self):
+        catalog = PageCatalog()
+        catalog.record("a.html", PageInfo(0, "A"))
+        self.assertEqual(pickle.loads(pickle.dumps(catalog)).pages, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
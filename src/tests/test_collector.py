@@ -0,0 +1,49 @@
+import pickle
+import unittest
+from collections import OrderedDict
+
+from collector import Collector, absorb_all, drain_all
+
+
+class Tally(Collector):
+    _drained = {"count": int, "seen": list, "pages": OrderedDict}
+
+    def __init__(self):
+        self.name = "tally"
+        self.count = 0
+        self.seen = []
+        self.pages = OrderedDict()
+
+    def record(self, page):
+        self.count += 1
+        self.seen.append(page)
+        self.pages[page] = len(self.seen)
+
+
+class TestCollector(unittest.TestCase):
+    def test_drain_resets_and_absorb_merges(self):
+        parent = Tally()
+        parent.record("a")
+        worker = pickle.loads(pickle.dumps(parent))
+        # Copies keep their settings but start empty.
+        self.assertEqual((worker.name, worker.count, worker.seen, worker.pages), ("tally", 0, [], {}))
+        worker.record("b")
+        worker.record("c")
+        delta = worker.drain()
+        self.assertEqual((worker.count, worker.seen, worker.pages), (0, [], {}))
+        parent.absorb(delta)
+        self.assertEqual(parent.count, 3)
+        self.assertEqual(parent.seen, ["a", "b", "c"])
+        self.assertEqual(list(parent.pages), ["a", "b", "c"])
+
+    def test_collectors_a_build_does_not_keep_are_skipped(self):
+        parent, worker = Tally(), Tally()
+        worker.record("a")
+        deltas = drain_all((worker, None))
+        self.assertIsNone(deltas[1])
+        absorb_all((parent, None), deltas)
+        self.assertEqual(parent.seen, ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import gzip
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+import compression
+from compression import compress_directory, is_compressed_variant
+from file_operations import is_generated_page, protect_any, sync_directory
+from manifest import OutputChanges
+
+
+class TestCompressDirectory(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, "docs")
+        self.files = {
+            "index.html": "<p>" + "hello world " * 200 + "</p>",
+            os.path.join("blog", "index.html"): "<p>blog</p>" * 100,
+            "index.css": "body { margin: 0; }\n" * 50,
+            "app.js": "console.log('hi');\n" * 50,
+            "logo.png": "not compressed",
+        }
+        for rel_path, text in self.files.items():
+            self._write(rel_path, text)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, rel_path, text):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _gunzip(self, rel_path):
+        with gzip.open(os.path.join(self.root, rel_path + ".gz"), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def test_writes_gzip_variants(self):
+        result = compress_directory(self.root, encodings=["gzip"])
+        self.assertEqual(len(result.written), 4)
+        for rel_path, text in self.files.items():
+            if rel_path.endswith(".png"):
+                self.assertFalse(os.path.exists(os.path.join(self.root, rel_path + ".gz")))
+            else:
+                self.assertEqual(self._gunzip(rel_path), text)
+        self.assertLess(result.ratio("gzip"), 0.5)
+        self.assertIn("gzip", result.report())
+
+    def test_up_to_date_variants_are_skipped(self):
+        compress_directory(self.root, encodings=["gzip"])
+        self.assertEqual(compress_directory(self.root, encodings=["gzip"]).written, [])
+        self._write("index.css", "a { color: red; }")
+        result = compress_directory(self.root, encodings=["gzip"])
+        self.assertEqual(result.written, [os.path.join(self.root, "index.css.gz")])
+        self.assertEqual(self._gunzip("index.css"), "a { color: red; }")
+
+    def test_output_is_deterministic(self):
+        compress_directory(self.root, encodings=["gzip"])
+        path = os.path.join(self.root, "index.html.gz")
+        with open(path, "rb") as f:
+            first = f.read()
+        os.remove(path)
+        compress_directory(self.root, encodings=["gzip"])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), first)
+
+    def test_orphaned_variants_are_removed(self):
+        compress_directory(self.root, encodings=["gzip"])
+        os.remove(os.path.join(self.root, "app.js"))
+        changes = OutputChanges()
+        result = compress_directory(self.root, encodings=["gzip"], changes=changes)
+        self.assertEqual(result.removed, [os.path.join(self.root, "app.js.gz")])
+        self.assertEqual(changes.removed, result.removed)
+
+    def test_worker_pool_matches_in_process(self):
+        serial = compress_directory(self.root, encodings=["gzip"])
+        for rel_path in list(self.files):
+            if not rel_path.endswith(".png"):
+                os.remove(os.path.join(self.root, rel_path + ".gz"))
+        parallel = compress_directory(self.root, jobs=2, encodings=["gzip"])
+        self.assertEqual(sorted(parallel.written), sorted(serial.written))
+        self.assertEqual(parallel.bytes_out, serial.bytes_out)
+
+    def test_unavailable_encoding(self):
+        with self.assertRaises(ValueError):
+            compress_directory(self.root, encodings=["zstd"])
+        if compression.brotli is None:
+            with self.assertRaises(ValueError):
+                compress_directory(self.root, encodings=["br"])
+            self.assertEqual(compression.available_encodings(), ("gzip",))
+
+    def test_asset_sync_keeps_variants(self):
+        static = os.path.join(self._tmp.name, "static")
+        os.makedirs(static)
+        with open(os.path.join(static, "index.css"), "w", encoding="utf-8") as f:
+            f.write("body {}")
+        compress_directory(self.root, encodings=["gzip"])
+        with redirect_stdout(StringIO()):
+            sync_directory(static, self.root, protect=protect_any(is_generated_page, is_compressed_variant))
+        self.assertTrue(os.path.exists(os.path.join(self.root, "index.html.gz")))
+        self.assertTrue(os.path.exists(os.path.join(self.root, "index.css.gz")))
+
+
+class TestIsCompressedVariant(unittest.TestCase):
+    def test_variants(self):
+        self.assertTrue(is_compressed_variant("a/index.html.gz"))
+        self.assertTrue(is_compressed_variant("app.js.br"))
+        self.assertFalse(is_compressed_variant("archive.tar.gz"))
+        self.assertFalse(is_compressed_variant("index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
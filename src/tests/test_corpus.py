@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.corpus import CorpusConfig, generate_markdown, page_path, write_corpus
+from block_markdown import markdown_to_html_node
+from file_operations import extract_title
+
+
+class TestCorpus(unittest.TestCase):
+    def test_generation_is_deterministic(self):
+        config = CorpusConfig(pages=3, seed=7)
+        self.assertEqual(generate_markdown(config, 2), generate_markdown(CorpusConfig(pages=3, seed=7), 2))
+        self.assertNotEqual(generate_markdown(config, 2), generate_markdown(CorpusConfig(seed=8), 2))
+
+    def test_pages_render(self):
+        config = CorpusConfig(blocks_per_page=50, inline_density=0.5, link_density=0.2, image_density=0.2)
+        for index in range(5):
+            markdown = generate_markdown(config, index)
+            self.assertTrue(extract_title(markdown).startswith(f"Page {index}:"))
+            markdown_to_html_node(markdown).to_html()
+
+    def test_block_mix_restricts_kinds(self):
+        config = CorpusConfig(blocks_per_page=30, block_mix={"code": 1})
+        html = markdown_to_html_node(generate_markdown(config, 0)).to_html()
+        self.assertEqual(html.count("<pre>"), 30)
+
+    def test_write_corpus_layout(self):
+        config = CorpusConfig(pages=4, depth=3, fanout=2)
+        with tempfile.TemporaryDirectory() as root:
+            content, template = write_corpus(root, config)
+            self.assertTrue(os.path.isfile(template))
+            for index in range(4):
+                path = page_path(config, index)
+                self.assertEqual(len(path.split(os.sep)), 5)
+                self.assertTrue(os.path.isfile(os.path.join(content, path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
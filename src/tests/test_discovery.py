@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+from discovery import Discovery, page_destination, page_url
+
+
+class TestDiscovery(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, "content")
+        for rel_path in (
+            "index.md",
+            "blog/tom/index.md",
+            "blog/tom/notes.txt",
+            "blog/a-b/index.md",
+            "drafts/wip.md",
+            ".git/config",
+            "empty/.keep",
+        ):
+            self._write(rel_path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, rel_path):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# Title")
+
+    def _rel(self, *parts):
+        return os.path.join(*parts)
+
+    def test_scan_is_flat_and_sorted(self):
+        scan = Discovery().scan(self.root)
+        self.assertEqual(scan.files, sorted(scan.files))
+        self.assertIn(self._rel("blog", "tom", "notes.txt"), scan.files)
+        self.assertEqual(
+            scan.dirs,
+            sorted([".git", "blog", self._rel("blog", "a-b"), self._rel("blog", "tom"), "drafts", "empty"]),
+        )
+
+    def test_pages(self):
+        dest = os.path.join(self._tmp.name, "docs")
+        pages = Discovery(ignore=[".*"]).pages(self.root, dest)
+        self.assertEqual(
+            pages,
+            [
+                (os.path.join(self.root, "blog", "a-b", "index.md"), os.path.join(dest, "blog", "a-b", "index.html")),
+                (os.path.join(self.root, "blog", "tom", "index.md"), os.path.join(dest, "blog", "tom", "index.html")),
+                (os.path.join(self.root, "drafts", "wip.md"), os.path.join(dest, "drafts", "wip.html")),
+                (os.path.join(self.root, "index.md"), os.path.join(dest, "index.html")),
+            ],
+        )
+        for src_path, dest_path in pages:
+            self.assertEqual(page_destination(src_path, self.root, dest), dest_path)
+
+    def test_page_url(self):
+        for output, url in (
+            ("index.html", ""),
+            ("blog/index.html", "blog/"),
+            ("blog/myindex.html", "blog/myindex.html"),
+            ("myindex.html", "myindex.html"),
+            ("blog/tom.html", "blog/tom.html"),
+        ):
+            self.assertEqual(page_url(output), url, output)
+
+    def test_ignore_by_name_prunes_directories(self):
+        scan = Discovery(ignore=[".*", "*.txt"]).scan(self.root)
+        self.assertNotIn(".git", scan.dirs)
+        self.assertNotIn(self._rel(".git", "config"), scan.files)
+        self.assertNotIn(self._rel("empty", ".keep"), scan.files)
+        self.assertNotIn(self._rel("blog", "tom", "notes.txt"), scan.files)
+
+    def test_ignore_by_relative_path(self):
+        discovery = Discovery(ignore=["drafts/*", "blog/tom"])
+        scan = discovery.scan(self.root)
+        self.assertNotIn(self._rel("drafts", "wip.md"), scan.files)
+        self.assertNotIn(self._rel("blog", "tom", "index.md"), scan.files)
+        self.assertIn(self._rel("blog", "a-b", "index.md"), scan.files)
+        self.assertTrue(discovery.is_ignored(self._rel("blog", "tom", "index.md")))
+        self.assertFalse(discovery.is_ignored("index.md"))
+
+    def test_unknown_symlink_policy(self):
+        with self.assertRaises(ValueError):
+            Discovery(symlinks="copy")
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_symlink_policies(self):
+        os.symlink(os.path.join(self.root, "blog", "tom"), os.path.join(self.root, "linked"))
+        os.symlink(os.path.join(self.root, "index.md"), os.path.join(self.root, "alias.md"))
+        followed = Discovery().scan(self.root)
+        self.assertIn(self._rel("linked", "index.md"), followed.files)
+        self.assertIn("alias.md", followed.files)
+        skipped = Discovery(symlinks="skip").scan(self.root)
+        self.assertNotIn("linked", skipped.dirs)
+        self.assertNotIn("alias.md", skipped.files)
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_symlink_loop_is_not_followed(self):
+        os.symlink(self.root, os.path.join(self.root, "blog", "loop"))
+        scan = Discovery().scan(self.root)
+        self.assertNotIn(self._rel("blog", "loop"), scan.dirs)
+        self.assertIn("index.md", scan.files)
+
+
+if __name__ == "__main__":
+    unittest.main()
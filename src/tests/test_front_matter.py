@@ -0,0 +1,212 @@
+import io
+import os
+import unittest
+import xml.etree.ElementTree as ET
+from contextlib import redirect_stdout
+from io import StringIO
+
+from block_markdown import BlockError
+from build import BuildError, generate_pages_incremental, generate_pages_parallel
+from catalog import PageCatalog
+from file_operations import generate_pages_recursive, render_page, stream_page_file
+from front_matter import (
+    MAX_HEADER_BYTES,
+    FrontMatter,
+    FrontMatterError,
+    read_front_matter,
+    split_front_matter,
+    split_front_matter_lines,
+)
+from page_template import CompiledTemplate
+from tests.site_fixture import TEMPLATE, SiteTestCase
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+HEADER = """---
+title: "Tom: a mistake?" # quoted
+date: 2024-03-01
+tags: [tolkien, "old forest"]
+draft: false
+aliases:
+  - /tom
+  - /bombadil
+---
+"""
+
+
+class TestParse(unittest.TestCase):
+    def test_fields(self):
+        front_matter, body = split_front_matter(HEADER + "# Tom\n\nBody\n")
+        self.assertEqual(front_matter.title, "Tom: a mistake?")
+        self.assertEqual(front_matter.published, 1709251200.0)
+        self.assertEqual(front_matter.tags, ["tolkien", "old forest"])
+        self.assertFalse(front_matter.draft)
+        self.assertIsNone(front_matter.template)
+        self.assertEqual(front_matter.fields["aliases"], ["/tom", "/bombadil"])
+        # The header becomes blank lines, so the body keeps its line numbers.
+        self.assertEqual(front_matter.lines, 9)
+        self.assertEqual(body, "\n" * 9 + "# Tom\n\nBody\n")
+
+    def test_lines_match_text(self):
+        text = HEADER + "# Tom\n\nBody\n"
+        front_matter, lines = split_front_matter_lines(io.StringIO(text))
+        expected, body = split_front_matter(text)
+        self.assertEqual(front_matter, expected)
+        self.assertEqual("".join(lines), body)
+
+    def test_documents_without_front_matter_are_unchanged(self):
+        for text in ("# Tom\n", "", "---", "--- x\na: b\n---\n", "---\nnever closed\n\n# Tom\n"):
+            front_matter, body = split_front_matter(text)
+            self.assertEqual((front_matter, body), (FrontMatter(), text), text)
+            front_matter, lines = split_front_matter_lines(io.StringIO(text))
+            self.assertEqual((front_matter, "".join(lines)), (FrontMatter(), text), text)
+
+    def test_lines_end_at_newlines_only(self):
+        text = "---\ntitle: a\x0cb\u2028c\n---\n# T\n"
+        front_matter, body = split_front_matter(text)
+        self.assertEqual((front_matter.title, front_matter.lines, body), ("a\x0cb\u2028c", 3, "\n\n\n# T\n"))
+        self.assertEqual(split_front_matter_lines(io.StringIO(text))[0], front_matter)
+
+    def test_header_limit_counts_bytes(self):
+        # Two bytes per character: within the limit in characters, not in bytes.
+        for count, fits in ((MAX_HEADER_BYTES // 2 - 20, True), (MAX_HEADER_BYTES // 2 + 20, False)):
+            text = f"---\ntitle: {'é' * count}\n---\n# T\n"
+            expected = "é" * count if fits else None
+            self.assertEqual(split_front_matter(text)[0].title, expected)
+            self.assertEqual(split_front_matter_lines(io.StringIO(text))[0].title, expected)
+
+    def test_other_values(self):
+        front_matter, _ = split_front_matter(
+            "---\ndate: 2024-03-01T12:00:00+02:00\ntags: a, b\ndraft: true\ntemplate: post.html\n---\n"
+        )
+        self.assertEqual(front_matter.published, 1709287200.0)
+        self.assertEqual(front_matter.tags, ["a", "b"])
+        self.assertTrue(front_matter.draft)
+        self.assertEqual(front_matter.template, "post.html")
+
+    def test_errors_name_the_line(self):
+        for header, line in (
+            ("a: b\nno colon here\n", 3),
+            ("draft: maybe\n", 2),
+            ("title: [a, b]\n", 2),
+            ("date: yesterday\n", 2),
+            ("- orphan\n", 2),
+            ("tags: [a, b\n", 2),
+            # Block lists are checked once their items are in.
+            ("title:\n  - a\n", 2),
+            ("draft: false\ntemplate:\n  - post.html\n", 3),
+            ("date:\n  - 2024-03-01\n", 2),
+            ("draft:\n  - true\n", 2),
+        ):
+            with self.assertRaises(FrontMatterError) as cm:
+                split_front_matter(f"---\n{header}---\n# T\n")
+            self.assertEqual(cm.exception.line, line, header)
+
+
+class TestRendering(SiteTestCase):
+    PAGES = {
+        "index.md": "# Home\n\nWelcome",
+        os.path.join("blog", "tom.md"): (
+            "---\ntitle: Tom\ndate: 2024-03-01\ntags: [tolkien]\ntemplate: post.html\n---\n\nOld Tom"
+        ),
+        os.path.join("blog", "draft.md"): "---\ndraft: true\n---\n# Unfinished",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self._write(os.path.join(self.root, "post.html"), "<article>{{ Title }}|{{ Content }}</article>")
+
+    def _outputs(self):
+        return sorted(
+            os.path.relpath(os.path.join(directory, name), self.docs)
+            for directory, _, names in os.walk(self.docs)
+            for name in names
+        )
+
+    def test_read_front_matter_stops_at_the_header(self):
+        path = os.path.join(self.root, "huge.md")
+        with open(path, "wb") as f:
+            f.write(b"---\ntitle: Huge\n---\n" + b"x" * 200_000 + b"\n\xff\xfe not UTF-8\n")
+        self.assertEqual(read_front_matter(path).title, "Huge")
+        self.assertEqual(read_front_matter(os.path.join(self.content, "index.md")), FrontMatter())
+
+    def test_title_template_and_body(self):
+        template = CompiledTemplate.load(self.template)
+        with open(os.path.join(self.content, "blog", "tom.md"), encoding="utf-8") as f:
+            html = render_page(f.read(), template)
+        self.assertEqual(html, "<article>Tom|<div><p>Old Tom</p></div></article>")
+
+        dest_path = os.path.join(self.docs, "tom.html")
+        stream_page_file(os.path.join(self.content, "blog", "tom.md"), template, dest_path)
+        self.assertEqual(self._read("tom.html"), html)
+
+    def test_block_errors_keep_file_line_numbers(self):
+        template = CompiledTemplate(TEMPLATE)
+        with self.assertRaises(BlockError) as cm:
+            render_page("---\ntitle: T\n---\n\nfine\n\nthis is **unclosed\n", template)
+        self.assertEqual(cm.exception.block.start_line, 7)
+
+    def test_list_for_a_scalar_key_is_reported(self):
+        template = CompiledTemplate(TEMPLATE, "/base/")
+        with self.assertRaises(FrontMatterError):
+            render_page("---\ntitle:\n  - a\n---\n# T\n", template)
+        self._write(os.path.join(self.content, "index.md"), "---\ntemplate:\n  - post.html\n---\n# Home")
+        # Reported as the page's failure instead of stopping the build.
+        with self.assertRaisesRegex(BuildError, "'template' must be a string"):
+            self._incremental()
+
+    def test_drafts_are_skipped(self):
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, self.docs)
+        self.assertEqual(self._outputs(), [os.path.join("blog", "tom.html"), "index.html"])
+        with redirect_stdout(StringIO()):
+            generate_pages_parallel(self.content, self.template, self.docs, jobs=2, drafts=True)
+        self.assertIn(os.path.join("blog", "draft.html"), self._outputs())
+
+    def test_catalog_gets_date_and_tags(self):
+        catalog = PageCatalog()
+        with redirect_stdout(StringIO()):
+            generate_pages_parallel(self.content, self.template, self.docs, jobs=1, catalog=catalog)
+        info = catalog.pages[os.path.join(self.docs, "blog", "tom.html")]
+        self.assertEqual((info.title, info.published, info.tags), ("Tom", 1709251200.0, ["tolkien"]))
+
+        catalog.write(self.docs, CompiledTemplate(TEMPLATE), "https://example.com/")
+        feed = ET.fromstring(self._read("blog", "feed.xml"))
+        entry = feed.find(f"{ATOM}entry")
+        self.assertEqual(entry.find(f"{ATOM}published").text, "2024-03-01T00:00:00Z")
+        self.assertEqual(entry.find(f"{ATOM}category").get("term"), "tolkien")
+
+    def _incremental(self, **kwargs):
+        with redirect_stdout(StringIO()):
+            return generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=self.manifest, **kwargs
+            )
+
+    def test_incremental_builds(self):
+        result = self._incremental()
+        self.assertEqual(len(result.rendered), 2)
+        self.assertNotIn(os.path.join("blog", "draft.html"), self._outputs())
+
+        # Editing the template a page names re-renders that page only.
+        self._write(os.path.join(self.root, "post.html"), "<main>{{ Title }}|{{ Content }}</main>")
+        result = self._incremental()
+        self.assertEqual(result.rendered, [os.path.join(self.content, "blog", "tom.md")])
+        self.assertTrue(self._read("blog", "tom.html").startswith("<main>Tom|"))
+
+        # Unchanged pages keep their front matter from the manifest.
+        catalog = PageCatalog()
+        result = self._incremental(catalog=catalog)
+        self.assertEqual(len(result.rendered), 2)
+        result = self._incremental(catalog=catalog)
+        self.assertEqual(result.rendered, [])
+        self.assertEqual(catalog.pages[os.path.join(self.docs, "blog", "tom.html")].tags, ["tolkien"])
+
+        # A page turned into a draft has its output removed.
+        self._write(os.path.join(self.content, "blog", "tom.md"), "---\ndraft: true\n---\n# Tom")
+        result = self._incremental()
+        self.assertEqual(result.removed, [os.path.join(self.docs, "blog", "tom.html")])
+        self.assertEqual(self._outputs(), ["index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
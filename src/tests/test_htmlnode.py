@@ -1,5 +1,5 @@
 import unittest
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, LeafNode, ParentNode, RawHTMLNode, node_text
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -61,5 +61,15 @@ class TestHTMLNode(unittest.TestCase):
         self.assertEqual(node.props["class"], "container")
 
 
+class TestNodeText(unittest.TestCase):
+    def test_leaves_are_read_as_written(self):
+        node = ParentNode("p", [LeafNode(None, "x "), LeafNode("code", "a<b>c"), LeafNode("b", "1 < 2")])
+        self.assertEqual(node_text(node), "x  a<b>c 1 < 2")
+
+    def test_raw_nodes(self):
+        self.assertEqual(node_text(RawHTMLNode("<p>a<b>c</b></p>", "a<b>c")), "a<b>c")
+        self.assertEqual(node_text(RawHTMLNode("<p>a<b>c</b></p>")), " a c  ")
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
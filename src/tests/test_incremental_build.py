@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from build import find_pages, generate_pages_incremental
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = self._tmp.name
+        self.content = os.path.join(root, "content")
+        self.docs = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        self.manifest = os.path.join(root, "manifest.json")
+        self._write(self.template, TEMPLATE)
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nHello [tom](/blog/tom)")
+        self._write(os.path.join(self.content, "blog", "tom", "index.md"), "# Tom\n\nBombadil")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _build(self, basepath="/"):
+        with redirect_stdout(StringIO()):
+            return generate_pages_incremental(
+                self.content, self.template, self.docs, basepath, self.manifest
+            )
+
+    def test_find_pages_sorted(self):
+        pages = find_pages(self.content, self.docs)
+        self.assertEqual(
+            pages,
+            [
+                (
+                    os.path.join(self.content, "blog", "tom", "index.md"),
+                    os.path.join(self.docs, "blog", "tom", "index.html"),
+                ),
+                (os.path.join(self.content, "index.md"), os.path.join(self.docs, "index.html")),
+            ],
+        )
+
+    def test_first_build_renders_everything(self):
+        result = self._build()
+        self.assertEqual(len(result.rendered), 2)
+        self.assertEqual(result.skipped, [])
+        self.assertEqual(
+            self._read(os.path.join(self.docs, "index.html")),
+            '<title>Home</title><body><div><h1>Home</h1><p>Hello <a href="/blog/tom">tom</a></p></div></body>',
+        )
+
+    def test_second_build_skips_unchanged(self):
+        self._build()
+        result = self._build()
+        self.assertEqual(result.rendered, [])
+        self.assertEqual(len(result.skipped), 2)
+
+    def test_changed_source_rerenders_only_that_page(self):
+        self._build()
+        tom = os.path.join(self.content, "blog", "tom", "index.md")
+        self._write(tom, "# Tom\n\nWas a mistake")
+        result = self._build()
+        self.assertEqual(result.rendered, [tom])
+        self.assertIn("Was a mistake", self._read(os.path.join(self.docs, "blog", "tom", "index.html")))
+
+    def test_touched_but_identical_source_is_skipped(self):
+        self._build()
+        tom = os.path.join(self.content, "blog", "tom", "index.md")
+        stat = os.stat(tom)
+        os.utime(tom, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        result = self._build()
+        self.assertEqual(result.rendered, [])
+
+    def test_template_change_invalidates_every_page(self):
+        self._build()
+        self._write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        result = self._build()
+        self.assertEqual(len(result.rendered), 2)
+
+    def test_basepath_change_invalidates_every_page(self):
+        self._build()
+        result = self._build("/site/")
+        self.assertEqual(len(result.rendered), 2)
+        self.assertIn('href="/site/blog/tom"', self._read(os.path.join(self.docs, "index.html")))
+
+    def test_missing_output_is_regenerated(self):
+        self._build()
+        os.remove(os.path.join(self.docs, "index.html"))
+        result = self._build()
+        self.assertEqual(result.rendered, [os.path.join(self.content, "index.md")])
+
+    def test_deleted_source_removes_output(self):
+        self._build()
+        os.remove(os.path.join(self.content, "blog", "tom", "index.md"))
+        result = self._build()
+        self.assertEqual(result.removed, [os.path.join(self.docs, "blog", "tom", "index.html")])
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
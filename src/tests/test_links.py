@@ -0,0 +1,141 @@
+import os
+import pickle
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from block_cache import BlockCache
+from block_markdown import markdown_to_html_node
+from build import generate_pages_incremental, generate_pages_parallel
+from file_operations import generate_pages_recursive
+from links import DependencyGraph, LinkIndex, collect_links, link_candidates
+from tests.site_fixture import SiteTestCase
+
+PAGES = {
+    "index.md": "# Home\n\n[Blog](/blog/) and [tom](/blog/tom) and [gone](/blog/gone)\n\n![logo](/images/logo.png)",
+    os.path.join("blog", "index.md"): "# Blog\n\n[Tom](tom/) and [back](../) and [top](#top)",
+    os.path.join("blog", "tom", "index.md"): (
+        "# Tom\n\n![missing](/images/tom.png) [ext](https://example.com) [mail](mailto:a@b.c)\n\n"
+        "```\n[not a link](/nowhere)\n```"
+    ),
+}
+
+
+class TestCollectLinks(unittest.TestCase):
+    def test_links_and_images_in_document_order(self):
+        md = "# [T](/t)\n\n- [a](/a)\n- ![b](/b.png)\n\n> **x** [c](c.html)\n\n```\n[d](/d)\n```"
+        links = []
+        collect_links(markdown_to_html_node(md), links)
+        self.assertEqual(links, [("a", "/t"), ("a", "/a"), ("img", "/b.png"), ("a", "c.html")])
+
+    def test_cached_blocks_give_the_same_links(self):
+        md = "[a](/a) and ![b](/b.png)\n\nraw <a href='/raw'>html</a>"
+        expected = []
+        collect_links(markdown_to_html_node(md), expected)
+        cache = BlockCache()
+        for _ in range(2):
+            links = []
+            collect_links(markdown_to_html_node(md, cache=cache), links)
+            self.assertEqual(links, expected)
+        self.assertEqual(expected, [("a", "/a"), ("img", "/b.png"), ("a", "/raw")])
+
+
+class TestLinkCandidates(unittest.TestCase):
+    def test_resolution(self):
+        page = "blog/tom/index.html"
+        self.assertEqual(link_candidates("/", page), ["index.html"])
+        self.assertEqual(link_candidates("/blog/", page), ["blog/index.html"])
+        self.assertEqual(
+            link_candidates("/contact", page), ["contact", "contact/index.html", "contact.html"]
+        )
+        self.assertEqual(link_candidates("../majesty/?x=1#y", page), ["blog/majesty/index.html"])
+        self.assertEqual(link_candidates("/images/a%20b.png", page)[0], "images/a b.png")
+        for url in ("https://example.com/", "//cdn.example.com/x.js", "mailto:a@b.c", "#top", "?q=1"):
+            self.assertIsNone(link_candidates(url, page), url)
+
+
+class TestLinkIndex(SiteTestCase):
+    PAGES = PAGES
+
+    def setUp(self):
+        super().setUp()
+        self.assets = [os.path.join("images", "logo.png")]
+
+    def _check(self, links):
+        report = links.check(self.docs, self.assets)
+        self.assertEqual(report.broken, [("index.html", "/blog/gone")])
+        self.assertEqual(report.missing_images, [("blog/tom/index.html", "/images/tom.png")])
+        self.assertEqual((report.pages, report.internal, report.external), (3, 7, 3))
+        self.assertFalse(report.ok)
+        self.assertIn("broken link in index.html: /blog/gone", report.report())
+        return report
+
+    def test_serial_build(self):
+        links = LinkIndex()
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, self.docs, links=links)
+        self._check(links)
+
+    def test_parallel_and_pipelined_builds_match(self):
+        for jobs in (1, 2):
+            for pipeline in (False, True):
+                for stream_threshold in (None, 0):
+                    links = LinkIndex()
+                    with redirect_stdout(StringIO()):
+                        generate_pages_parallel(
+                            self.content, self.template, self.docs, jobs=jobs, pipeline=pipeline,
+                            stream_threshold=stream_threshold, links=links,
+                        )
+                    self._check(links)
+
+    def test_incremental_build_reuses_recorded_links(self):
+        with redirect_stdout(StringIO()):
+            # Built once without links: the next checked build must render everything.
+            generate_pages_incremental(self.content, self.template, self.docs, manifest_path=self.manifest)
+            links = LinkIndex()
+            result = generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=self.manifest, links=links
+            )
+            self.assertEqual(len(result.rendered), 3)
+            self._check(links)
+
+            self._write(os.path.join(self.content, "index.md"), "# Home\n\n[Blog](/blog/)")
+            links = LinkIndex()
+            result = generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=self.manifest, links=links
+            )
+        self.assertEqual(len(result.rendered), 1)
+        report = links.check(self.docs, self.assets)
+        self.assertEqual(report.broken, [])
+        self.assertEqual(report.pages, 3)
+        self.assertEqual(len(report.missing_images), 1)
+
+    def test_dependency_graph(self):
+        links = LinkIndex()
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, self.docs, links=links)
+        graph = links.dependency_graph(self.docs, self.assets)
+        self.assertEqual(graph.dependents["blog/index.html"], ["index.html"])
+        self.assertEqual(graph.dependents["blog/tom/index.html"], ["blog/index.html", "index.html"])
+        self.assertEqual(graph.dependents["index.html"], ["blog/index.html"])
+        # Missing targets are kept, keyed by their most specific candidate.
+        self.assertEqual(graph.dependents["blog/gone"], ["index.html"])
+        self.assertNotIn("nowhere", " ".join(graph.dependents))
+        self.assertEqual(
+            graph.affected(["images/logo.png", os.path.join("images", "tom.png"), "unknown.css"]),
+            ["blog/tom/index.html", "index.html"],
+        )
+
+        path = os.path.join(self.root, "state", "dependencies.json")
+        graph.save(path)
+        self.assertEqual(DependencyGraph.load(path).dependents, graph.dependents)
+        self.assertEqual(len(DependencyGraph.load(os.path.join(self.root, "missing.json"))), 0)
+
+    def test_copies_start_empty(self):
+        links = LinkIndex()
+        links.record("a.html", [("a", "/")])
+        self.assertEqual(pickle.loads(pickle.dumps(links)).pages, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
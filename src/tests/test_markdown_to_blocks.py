@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from block_markdown import Block, BlockError, iter_blocks, markdown_to_blocks, markdown_to_html_node
+
+
+class TestMarkdownToBlocks(unittest.TestCase):
+    def test_blocks(self):
+        md = """
+This is **bolded** paragraph
+
+This is another paragraph with _italic_ text and `code` here
+This is the same paragraph on a new line
+
+- This is a list
+- with items
+"""
+        self.assertEqual(
+            markdown_to_blocks(md),
+            [
+                "This is **bolded** paragraph",
+                "This is another paragraph with _italic_ text and `code` here\n"
+                "This is the same paragraph on a new line",
+                "- This is a list\n- with items",
+            ],
+        )
+
+    def test_extra_blank_lines_are_dropped(self):
+        self.assertEqual(markdown_to_blocks("\n\n\n# One\n\n\n\n\nTwo\n\n   \n\n"), ["# One", "Two"])
+
+    def test_fenced_code_keeps_blank_lines(self):
+        md = "Intro\n\n```\ndef f():\n\n    return 1\n```\n\nOutro"
+        self.assertEqual(markdown_to_blocks(md), ["Intro", "```\ndef f():\n\n    return 1\n```", "Outro"])
+
+    def test_inline_triple_backticks_are_not_a_fence(self):
+        md = "```inline```\n\nnext"
+        self.assertEqual(markdown_to_blocks(md), ["```inline```", "next"])
+
+    def test_fast_path_matches_scanner(self):
+        rng = random.Random(16)
+        pieces = ["text", "# head", "- item", "> quote", "", " ", "\n", "\n\n", "\n\n\n", "ü", "日本"]
+        for _ in range(500):
+            md = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+            expected = [block.strip() for block in md.split("\n\n") if block.strip()]
+            self.assertEqual(markdown_to_blocks(md), expected)
+            self.assertEqual([block.text for block in iter_blocks(md)], expected)
+
+
+class TestIterBlocks(unittest.TestCase):
+    def test_positions(self):
+        md = "\n# Title\n\n  para one\nline two  \n\n\n- a\n- b\n"
+        self.assertEqual(
+            list(iter_blocks(md)),
+            [
+                Block("# Title", 2, 2, 1, 8),
+                Block("para one\nline two", 4, 5, 12, 29),
+                Block("- a\n- b", 8, 9, 34, 41),
+            ],
+        )
+
+    def test_byte_offsets_are_utf8(self):
+        md = "héllo wörld\n\n日本語\n\nend"
+        encoded = md.encode("utf-8")
+        for block in iter_blocks(md):
+            self.assertEqual(encoded[block.start_byte:block.end_byte].decode("utf-8"), block.text)
+
+    def test_fence_positions(self):
+        md = "a\n\n```\nx\n\n\ny\n```\n\nb"
+        blocks = list(iter_blocks(md))
+        self.assertEqual([(b.start_line, b.end_line) for b in blocks], [(1, 1), (3, 8), (10, 10)])
+
+    def test_unclosed_fence_runs_to_the_end(self):
+        self.assertEqual([b.text for b in iter_blocks("a\n\n```\ncode\n\nmore")], ["a", "```\ncode\n\nmore"])
+
+    def test_is_lazy(self):
+        blocks = iter_blocks("one\n\ntwo\n\nthree")
+        self.assertEqual(next(blocks).text, "one")
+        self.assertEqual(next(blocks).text, "two")
+
+
+class TestBlockError(unittest.TestCase):
+    def test_error_names_block_lines(self):
+        md = "# Title\n\nfine\n\n- ok\n- **broken"
+        with self.assertRaises(BlockError) as ctx:
+            markdown_to_html_node(md)
+        self.assertEqual((ctx.exception.block.start_line, ctx.exception.block.end_line), (5, 6))
+        self.assertTrue(str(ctx.exception).endswith("(lines 5-6)"))
+        self.assertIsInstance(ctx.exception, ValueError)
+
+    def test_single_line_block(self):
+        with self.assertRaises(BlockError) as ctx:
+            markdown_to_html_node("```\n\n```\n\nbad _italic")
+        self.assertTrue(str(ctx.exception).endswith("(line 5)"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from build import generate_pages_incremental, generate_pages_parallel
+from file_operations import write_page
+from manifest import OutputChanges
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+
+class TestWritePage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "out", "page.html")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _age(self):
+        os.utime(self.path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+    def test_identical_content_keeps_the_file(self):
+        changes = OutputChanges()
+        first = write_page(self.path, "<p>ünïcode</p>", changes)
+        self._age()
+        self.assertEqual(write_page(self.path, "<p>ünïcode</p>", changes), first)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, OLD_MTIME_NS)
+        self.assertEqual((changes.written, changes.unchanged), ([self.path], [self.path]))
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["page.html"])
+
+    def test_changed_content_replaces_the_file(self):
+        for html in ("<p>a</p>", "<p>b</p>", "<p>bb</p>"):
+            changes = OutputChanges()
+            write_page(self.path, html, changes)
+            self._age()
+            with open(self.path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), html)
+            self.assertEqual(changes.written, [self.path])
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["page.html"])
+
+    def test_known_hash_is_compared_instead_of_the_file(self):
+        first = write_page(self.path, "<p>a</p>")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("<p>b</p>")
+        changes = OutputChanges()
+        write_page(self.path, "<p>a</p>", changes, known_hash=first)
+        self.assertEqual(changes.unchanged, [self.path])
+        write_page(self.path, "<p>a</p>", changes)
+        self.assertEqual(changes.written, [self.path])
+
+
+class TestOutputChanges(unittest.TestCase):
+    def test_saved_paths_are_relative_and_sorted(self):
+        with tempfile.TemporaryDirectory() as root:
+            docs = os.path.join(root, "docs")
+            changes = OutputChanges()
+            changes.record(os.path.join(docs, "b", "index.html"), True)
+            changes.record(os.path.join(docs, "a.html"), True)
+            changes.record(os.path.join(docs, "c.html"), False)
+            changes.removed.append(os.path.join(docs, "gone.html"))
+            path = os.path.join(root, "changes.json")
+            changes.save(path, docs)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.assertEqual(
+            data, {"version": 1, "written": ["a.html", "b/index.html"], "removed": ["gone.html"], "unchanged": 1}
+        )
+
+    def test_copies_start_empty(self):
+        changes = OutputChanges()
+        changes.record("a.html", True)
+        copy = pickle.loads(pickle.dumps(changes))
+        self.assertEqual((copy.written, copy.unchanged, copy.removed), ([], [], []))
+
+
+class TestBuildChanges(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = self._tmp.name
+        self.content = os.path.join(root, "content")
+        self.docs = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        self._write(self.template, TEMPLATE)
+        for i in range(6):
+            self._write(os.path.join(self.content, f"p{i}", "index.md"), f"# Page {i}\n\nBody {i}")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _build(self, jobs, pipeline=False):
+        changes = OutputChanges()
+        with redirect_stdout(StringIO()):
+            generate_pages_parallel(
+                self.content, self.template, self.docs, jobs=jobs, pipeline=pipeline, changes=changes
+            )
+        return changes
+
+    def test_rebuild_only_writes_changed_pages(self):
+        for jobs in (1, 2):
+            for pipeline in (False, True):
+                self._build(jobs, pipeline)
+                self._write(os.path.join(self.content, "p3", "index.md"), f"# Page 3\n\nEdited {jobs}{pipeline}")
+                changes = self._build(jobs, pipeline)
+                self.assertEqual(changes.written, [os.path.join(self.docs, "p3", "index.html")])
+                self.assertEqual(len(changes.unchanged), 5)
+
+    def test_incremental_build_records_removed_pages(self):
+        manifest = os.path.join(self._tmp.name, "manifest.json")
+        with redirect_stdout(StringIO()):
+            generate_pages_incremental(self.content, self.template, self.docs, manifest_path=manifest)
+            os.remove(os.path.join(self.content, "p0", "index.md"))
+            changes = OutputChanges()
+            generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=manifest, changes=changes
+            )
+        self.assertEqual(changes.removed, [os.path.join(self.docs, "p0", "index.html")])
+        self.assertEqual(changes.written, [])
+
+    def test_incremental_build_trusts_recorded_hashes_of_untouched_outputs(self):
+        manifest = os.path.join(self._tmp.name, "manifest.json")
+        source = os.path.join(self.content, "p1", "index.md")
+        output = os.path.join(self.docs, "p1", "index.html")
+        with redirect_stdout(StringIO()):
+            generate_pages_incremental(self.content, self.template, self.docs, manifest_path=manifest)
+            # A trailing newline renders the same page.
+            self._write(source, "# Page 1\n\nBody 1\n")
+            changes = OutputChanges()
+            generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=manifest, changes=changes
+            )
+            self.assertEqual((changes.written, changes.unchanged), ([], [output]))
+
+            # An output edited since it was recorded is read back, and restored.
+            with open(output, encoding="utf-8") as f:
+                html = f.read()
+            self._write(output, html.replace("Body", "Edit"))
+            os.utime(output, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+            self._write(source, "# Page 1\n\nBody 1\n\n")
+            changes = OutputChanges()
+            generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=manifest, changes=changes
+            )
+        self.assertEqual(changes.written, [output])
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(f.read(), html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from page_template import CompiledTemplate
+
+TEMPLATE = (
+    '<title>{{ Title }}</title><link href="/index.css" />'
+    '<img src="/logo.png"><article>{{ Content }}</article>'
+)
+
+
+def legacy_render(template, title, content, basepath):
+    html = template.replace("{{ Title }}", title)
+    html = html.replace("{{ Content }}", content)
+    html = html.replace('href="/', f'href="{basepath}')
+    return html.replace('src="/', f'src="{basepath}')
+
+
+class TestCompiledTemplate(unittest.TestCase):
+    def test_default_basepath(self):
+        template = CompiledTemplate(TEMPLATE)
+        self.assertEqual(
+            template.render("Home", '<a href="/blog">x</a>'),
+            '<title>Home</title><link href="/index.css" /><img src="/logo.png">'
+            '<article><a href="/blog">x</a></article>',
+        )
+
+    def test_basepath_applied_to_template_and_content(self):
+        template = CompiledTemplate(TEMPLATE, "/site/")
+        content = '<p><a href="/blog">b</a><img src="/a.png" alt=""></img><a href="https://x">x</a></p>'
+        self.assertEqual(
+            template.render("Home", content),
+            legacy_render(TEMPLATE, "Home", content, "/site/"),
+        )
+        self.assertIn('href="/site/index.css"', template.parts[2])
+
+    def test_repeated_slots(self):
+        source = "{{ Title }}|{{ Content }}|{{ Title }}"
+        template = CompiledTemplate(source)
+        self.assertEqual(template.render("T", "C"), "T|C|T")
+
+    def test_template_without_slots(self):
+        template = CompiledTemplate('<a href="/">static</a>', "/b/")
+        self.assertEqual(template.render("T", "C"), '<a href="/b/">static</a>')
+
+    def test_basepath_with_backslash_is_literal(self):
+        template = CompiledTemplate('<a href="/x">', "/a\\1/")
+        self.assertEqual(template.render("", ""), '<a href="/a\\1/x">')
+
+
+class TestCompiledTemplateStreaming(unittest.TestCase):
+    def _content(self):
+        # Leaf text that splits 'href="/' across fragments must still be rewritten.
+        return ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode("a", "x", {"href": "/blog"})]),
+                ParentNode("p", [LeafNode(None, 'h'), LeafNode(None, 'ref="'), LeafNode(None, "/raw")]),
+                ParentNode("p", [LeafNode("img", "", {"src": "/a.png", "alt": "a"})]),
+            ],
+        )
+
+    def test_render_to_matches_render(self):
+        for basepath in ("/", "/site/", "/a\\1/"):
+            with self.subTest(basepath=basepath):
+                template = CompiledTemplate(TEMPLATE, basepath)
+                content = self._content()
+                out = io.StringIO()
+                template.render_to(out, "Home", content)
+                self.assertEqual(out.getvalue(), template.render("Home", content.to_html()))
+
+    def test_render_to_list(self):
+        template = CompiledTemplate("{{ Title }}:{{ Content }}", "/b/")
+        buffer = []
+        template.render_to(buffer, "T", LeafNode("a", "x", {"href": "/"}))
+        self.assertEqual("".join(buffer), 'T:<a href="/b/">x</a>')
+
+
+if __name__ == "__main__":
+    unittest.main()
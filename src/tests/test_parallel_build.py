@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from build import BuildError, find_pages, generate_pages_parallel, render_pages_pipelined
+from file_operations import generate_pages_recursive
+from page_template import CompiledTemplate
+from profiling import BuildProfiler
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css">{{ Content }}'
+
+
+class TestParallelBuild(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = self._tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        self._write(self.template, TEMPLATE)
+        for i in range(12):
+            self._write(
+                os.path.join(self.content, f"section{i % 3}", f"page{i}", "index.md"),
+                f"# Page {i}\n\nSee [home](/) and ![pic](/images/{i}.png)\n\n- **item** {i}",
+            )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _snapshot(self, root):
+        files = {}
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    def test_parallel_output_matches_serial(self):
+        serial = os.path.join(self._tmp.name, "serial")
+        parallel = os.path.join(self._tmp.name, "parallel")
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, serial, "/base/")
+            generate_pages_parallel(self.content, self.template, parallel, "/base/", jobs=3)
+        self.assertEqual(len(self._snapshot(serial)), 12)
+        self.assertEqual(self._snapshot(serial), self._snapshot(parallel))
+
+    def test_failures_are_reported_in_source_order(self):
+        self._write(os.path.join(self.content, "z", "index.md"), "no title here")
+        self._write(os.path.join(self.content, "a", "index.md"), "# Title\n\nbad **bold")
+        dest = os.path.join(self._tmp.name, "docs")
+        with redirect_stdout(StringIO()), self.assertRaises(BuildError) as ctx:
+            generate_pages_parallel(self.content, self.template, dest, jobs=4)
+        failed = [src for src, _ in ctx.exception.failures]
+        self.assertEqual(
+            failed,
+            [os.path.join(self.content, "a", "index.md"), os.path.join(self.content, "z", "index.md")],
+        )
+        self.assertEqual(len(ctx.exception.rendered), 12)
+
+    def test_pipelined_output_matches_serial(self):
+        serial = os.path.join(self._tmp.name, "serial")
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, serial, "/base/")
+        for jobs in (1, 3):
+            pipelined = os.path.join(self._tmp.name, f"pipelined{jobs}")
+            with redirect_stdout(StringIO()):
+                generate_pages_parallel(
+                    self.content, self.template, pipelined, "/base/", jobs=jobs, pipeline=True
+                )
+            self.assertEqual(self._snapshot(serial), self._snapshot(pipelined))
+
+    def test_pipelined_depth_smaller_than_site(self):
+        template = CompiledTemplate.load(self.template)
+        pages = find_pages(self.content, os.path.join(self._tmp.name, "docs"))
+        out = StringIO()
+        with redirect_stdout(out):
+            hashes = render_pages_pipelined(pages, template, readers=2, writers=2, depth=1)
+        self.assertEqual(sorted(hashes), [src for src, _ in pages])
+        printed = [line.split()[3] for line in out.getvalue().splitlines()]
+        self.assertEqual(printed, [src for src, _ in pages])
+
+    def test_pipelined_failures(self):
+        self._write(os.path.join(self.content, "a", "index.md"), "# Title\n\nbad **bold")
+        template = CompiledTemplate.load(self.template)
+        pages = find_pages(self.content, os.path.join(self._tmp.name, "docs"))
+        pages.append((os.path.join(self.content, "missing.md"), os.path.join(self._tmp.name, "missing.html")))
+        for jobs in (1, 2):
+            with redirect_stdout(StringIO()), self.assertRaises(BuildError) as ctx:
+                render_pages_pipelined(pages, template, jobs=jobs)
+            failed = [src for src, _ in ctx.exception.failures]
+            self.assertEqual(
+                failed, [os.path.join(self.content, "a", "index.md"), os.path.join(self.content, "missing.md")]
+            )
+            self.assertIn("FileNotFoundError", ctx.exception.failures[1][1])
+            self.assertEqual(len(ctx.exception.rendered), 12)
+
+    def test_pipeline_rejects_profiler(self):
+        with self.assertRaises(ValueError):
+            generate_pages_parallel(
+                self.content, self.template, self._tmp.name, pipeline=True, profiler=BuildProfiler()
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
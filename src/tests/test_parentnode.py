@@ -1,3 +1,5 @@
+import io
+import sys
 import unittest
 from htmlnode import ParentNode, LeafNode
 
@@ -104,6 +106,55 @@ class TestParentNode(unittest.TestCase):
         expected = "<div><h1>Title</h1><p><b>Bold</b> text</p><p>Another paragraph</p></div>"
         self.assertEqual(node.to_html(), expected)
 
+    def test_render_to_list_buffer(self):
+        node = ParentNode(
+            "div",
+            [ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")])],
+            {"class": "x"},
+        )
+        buffer = []
+        node.render_to(buffer)
+        self.assertGreater(len(buffer), 1)
+        self.assertEqual("".join(buffer), node.to_html())
+
+    def test_render_to_text_stream(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode("a", "x", {"href": "/y"})])])
+        out = io.StringIO()
+        node.render_to(out)
+        self.assertEqual(out.getvalue(), '<ul><li><a href="/y">x</a></li></ul>')
+
+    def test_render_to_missing_children_raises(self):
+        node = ParentNode("div", [ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+            node.render_to([])
+
+
+    def test_to_html_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 20
+        node = LeafNode("span", "leaf")
+        for _ in range(depth):
+            node = ParentNode("div", [node])
+        expected = "<div>" * depth + "<span>leaf</span>" + "</div>" * depth
+        self.assertEqual(node.to_html(), expected)
+
+    def test_iterative_matches_recursive(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("ul", [ParentNode("li", [LeafNode("b", str(i))]) for i in range(5)]),
+                LeafNode(None, "text"),
+                ParentNode("p", [ParentNode("span", [LeafNode("i", "x")], {"class": "c"})]),
+            ],
+        )
+        buffer = []
+        node._render_recursive(buffer.append)
+        self.assertEqual(node.to_html(), "".join(buffer))
+
+    def test_invalid_nested_child_raises(self):
+        node = ParentNode("div", [LeafNode(None, "ok"), ParentNode(None, [LeafNode("b", "x")])])
+        with self.assertRaises(ValueError):
+            node.to_html()
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
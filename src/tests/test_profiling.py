@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from block_markdown import markdown_to_html_node
+from file_operations import generate_pages_recursive
+from profiling import STAGES, BuildProfiler, PageProfile
+
+MARKDOWN = """# Title
+
+A **bold** paragraph with a [link](/x).
+
+- one
+- two
+
+```
+code
+```
+"""
+
+
+class TestPageProfile(unittest.TestCase):
+    def test_profiled_tree_matches_unprofiled(self):
+        profile = PageProfile("page.md")
+        profiled = markdown_to_html_node(MARKDOWN, profile)
+        self.assertEqual(profiled.to_html(), markdown_to_html_node(MARKDOWN).to_html())
+        self.assertEqual(profile.blocks, {"heading": 1, "paragraph": 1, "unordered_list": 1, "code": 1})
+        self.assertEqual(profile.text_nodes, 8)
+        # div, h1 + leaf, p + 5 leaves, ul + 2 li + 2 leaves, pre + code
+        self.assertEqual(profile.html_nodes, 16)
+
+    def test_round_trip(self):
+        profile = PageProfile("page.md")
+        profile.add_time("read", 0.5)
+        profile.count_block("paragraph")
+        restored = PageProfile.from_dict(profile.to_dict())
+        self.assertEqual(restored.to_dict(), profile.to_dict())
+
+
+class TestBuildProfiler(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = self._tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        with open(self.template, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        for name in ("a", "b", "c"):
+            os.makedirs(os.path.join(self.content, name))
+            with open(os.path.join(self.content, name, "index.md"), "w", encoding="utf-8") as f:
+                f.write(MARKDOWN)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _build(self, dest, profiler=None):
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, dest, "/b/", profiler=profiler)
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_profiled_build_output_is_identical(self):
+        plain = os.path.join(self._tmp.name, "plain")
+        profiled = os.path.join(self._tmp.name, "profiled")
+        profiler = BuildProfiler()
+        self._build(plain)
+        self._build(profiled, profiler)
+        for name in ("a", "b", "c"):
+            path = os.path.join(name, "index.html")
+            self.assertEqual(self._read(os.path.join(plain, path)), self._read(os.path.join(profiled, path)))
+
+        summary = profiler.summary()
+        self.assertEqual(summary["pages"], 3)
+        self.assertEqual(list(summary["stages_s"]), list(STAGES))
+        self.assertEqual(summary["bytes_in"], 3 * len(MARKDOWN.encode("utf-8")))
+        self.assertEqual(summary["bytes_out"], 3 * len(self._read(os.path.join(plain, "a", "index.html"))))
+        self.assertEqual(summary["blocks"]["paragraph"], 3)
+
+    def test_report_and_trace(self):
+        profiler = BuildProfiler()
+        self._build(os.path.join(self._tmp.name, "docs"), profiler)
+        profiler.finish()
+        self.assertIn("Profiled 3 page(s)", profiler.report())
+        trace_path = os.path.join(self._tmp.name, "trace.json")
+        profiler.write_trace(trace_path, count=2)
+        with open(trace_path, encoding="utf-8") as f:
+            trace = json.load(f)
+        self.assertEqual(len(trace["slowest"]), 2)
+        self.assertGreaterEqual(trace["slowest"][0]["total_s"], trace["slowest"][1]["total_s"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import json
+import os
+import pickle
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from block_cache import BlockCache
+from block_markdown import markdown_to_html_node
+from build import generate_pages_incremental, generate_pages_parallel
+from file_operations import generate_pages_recursive
+from search_index import PageText, SearchIndex, is_search_output, shard_key
+from tests.site_fixture import SiteTestCase
+
+PAGES = {
+    "index.md": "# Home Page\n\nWelcome **home**, wanderer. [Blog](/blog/) of the _home_ page.",
+    os.path.join("blog", "index.md"): "# Blog\n\n- Ents\n- Elves and `code`\n\n```\nhome sweet home\n```",
+    os.path.join("blog", "tom", "index.md"): "# Tom\n\n> Old Tom Bombadil\n\n![alt text](/tom.png) 42 Ünïcode",
+}
+
+
+class TestPageText(unittest.TestCase):
+    def test_words_and_positions(self):
+        text = PageText()
+        text.add(markdown_to_html_node("# A title\n\nThe **cat** and the cat2dog. [The](/x) end"))
+        self.assertEqual(text.terms["the"], [2, 5, 7])
+        self.assertEqual(text.terms["cat"], [3])
+        self.assertEqual(text.terms["cat2dog"], [6])
+        self.assertEqual(text.words, 9)
+
+    def test_cached_blocks_give_the_same_words(self):
+        md = "# T\n\nwo**rd** and `a<b>c` code\n\n- a [link](/l)\n- ![img](/i.png) b"
+        expected = PageText()
+        expected.add(markdown_to_html_node(md))
+        cache = BlockCache()
+        for _ in range(2):
+            text = PageText()
+            text.add(markdown_to_html_node(md, cache=cache))
+            self.assertEqual(text.terms, expected.terms)
+        # Text that looks like a tag is still text.
+        self.assertEqual((expected.terms["b"], expected.terms["c"]), ([5, 10], [6]))
+        self.assertNotIn("img", expected.terms)
+
+    def test_shard_key(self):
+        self.assertEqual([shard_key(t) for t in ("apple", "42", "über", "_x")], ["a", "4", "_", "_"])
+
+
+class TestSearchIndex(SiteTestCase):
+    PAGES = PAGES
+
+    def _files(self):
+        directory = os.path.join(self.docs, "search")
+        files = {}
+        for name in os.listdir(directory):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                files[name] = json.load(f)
+        return files
+
+    def _build_serial(self):
+        search = SearchIndex()
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, self.docs, search=search)
+        search.write(self.docs, "/base/")
+        return self._files()
+
+    def test_written_files(self):
+        files = self._build_serial()
+        pages = files["pages.json"]
+        self.assertEqual(
+            pages["pages"],
+            [
+                ["/base/blog/", "Blog", "blog/index.html"],
+                ["/base/blog/tom/", "Tom", "blog/tom/index.html"],
+                ["/base/", "Home Page", "index.html"],
+            ],
+        )
+        self.assertEqual(pages["shards"], sorted(name[:-5] for name in files if name != "pages.json"))
+        # "home" is at words 5 and 7 of page 0 (the code block), and 0, 3 and 8 of page 2.
+        self.assertEqual(files["h.json"]["home"], [0, 2, 5, 2, 2, 3, 0, 3, 5])
+        self.assertIn("42", files["4.json"])
+        self.assertIn("ünïcode", files["_.json"])
+
+    def test_parallel_and_pipelined_builds_match(self):
+        expected = self._build_serial()
+        for jobs in (1, 2):
+            for pipeline in (False, True):
+                for stream_threshold in (None, 0):
+                    search = SearchIndex()
+                    with redirect_stdout(StringIO()):
+                        generate_pages_parallel(
+                            self.content, self.template, self.docs, jobs=jobs, pipeline=pipeline,
+                            stream_threshold=stream_threshold, search=search,
+                        )
+                    search.write(self.docs, "/base/")
+                    self.assertEqual(self._files(), expected)
+
+    def test_block_cache_builds_match(self):
+        # Literal "<" in text must not be read as the start of a tag.
+        self._write(os.path.join(self.content, "back.md"), "# Back\n\n[< Back Home](/) 1 < 2 > 0\n\n[< Back Home](/)")
+        expected = self._build_serial()
+        self.assertIn("back", expected["b.json"])
+        cache_path = os.path.join(self.root, "cache.json")
+        for jobs in (1, 2):
+            # A cold cache, then the blocks it saved read back from disk.
+            cache = BlockCache.load(cache_path)
+            search = SearchIndex()
+            with redirect_stdout(StringIO()):
+                generate_pages_parallel(self.content, self.template, self.docs, jobs=jobs, cache=cache, search=search)
+            cache.save()
+            search.write(self.docs, "/base/")
+            self.assertEqual(self._files(), expected)
+        self.assertGreater(cache.disk_hits, 0)
+
+    def test_load_round_trips(self):
+        search = SearchIndex()
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, self.docs, search=search)
+        search.write(self.docs)
+        self.assertEqual(SearchIndex.load(self.docs).pages, search.pages)
+        self.assertEqual(SearchIndex.load(os.path.join(self.root, "missing")).pages, {})
+
+    def test_incremental_build_keeps_unchanged_pages(self):
+        with redirect_stdout(StringIO()):
+            generate_pages_incremental(self.content, self.template, self.docs, manifest_path=self.manifest)
+            # Pages missing from the index are rendered even though they are fresh.
+            search = SearchIndex.load(self.docs)
+            result = generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=self.manifest, search=search
+            )
+            self.assertEqual(len(result.rendered), 3)
+            search.write(self.docs)
+
+            self._write(os.path.join(self.content, "index.md"), "# Home Page\n\nRewritten")
+            os.remove(os.path.join(self.content, "blog", "tom", "index.md"))
+            search = SearchIndex.load(self.docs)
+            result = generate_pages_incremental(
+                self.content, self.template, self.docs, manifest_path=self.manifest, search=search
+            )
+            search.write(self.docs)
+        self.assertEqual(len(result.rendered), 1)
+        files = self._files()
+        self.assertEqual([page[2] for page in files["pages.json"]["pages"]], ["blog/index.html", "index.html"])
+        self.assertIn("rewritten", files["r.json"])
+        self.assertIn("ents", files["e.json"])
+        # The shard that only held words of the removed page is gone.
+        self.assertNotIn("o.json", files)
+
+    def test_asset_sync_keeps_the_index(self):
+        self.assertTrue(is_search_output(os.path.join("search", "a.json")))
+        self.assertFalse(is_search_output("a.json"))
+
+    def test_copies_start_empty(self):
+        search = SearchIndex()
+        search.record("a.html", PageText("A"))
+        self.assertEqual(pickle.loads(pickle.dumps(search)).pages, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+import random
 import unittest
 from textnode import TextNode, TextType
-from split_images_and_links import split_nodes_image, split_nodes_link
+from split_images_and_links import split_nodes_image, split_nodes_image_and_link, split_nodes_link
 
 class TestSplitNodes(unittest.TestCase):
     def test_split_images(self):
@@ -58,5 +59,41 @@ class TestSplitNodes(unittest.TestCase):
         # The BOLD node should pass through unchanged
         self.assertEqual(new_nodes[1].text_type, TextType.BOLD)
 
+    def test_split_links_cuts_at_the_matched_link(self):
+        # The same markdown inside an image must not be mistaken for the link.
+        node = TextNode("![a](b) then [a](b)", TextType.TEXT)
+        self.assertListEqual(
+            [TextNode("![a](b) then ", TextType.TEXT), TextNode("a", TextType.LINK, "b")],
+            split_nodes_link([node]),
+        )
+
+    def test_split_image_and_link_single_pass(self):
+        nodes = [
+            TextNode("see ![pic](/a.png) and [home](/) or ![x](y)", TextType.TEXT),
+            TextNode("[not](split)", TextType.CODE),
+        ]
+        self.assertListEqual(
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("pic", TextType.IMAGE, "/a.png"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("home", TextType.LINK, "/"),
+                TextNode(" or ", TextType.TEXT),
+                TextNode("x", TextType.IMAGE, "y"),
+                TextNode("[not](split)", TextType.CODE),
+            ],
+            split_nodes_image_and_link(nodes),
+        )
+
+    def test_split_image_and_link_matches_two_pass(self):
+        rng = random.Random(15)
+        pieces = ["!", "[", "]", "(", ")", "a", " ", "![i](u)", "[l](v)", "x"]
+        for _ in range(3000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            nodes = [TextNode(text, TextType.TEXT)]
+            self.assertListEqual(
+                split_nodes_link(split_nodes_image(nodes)), split_nodes_image_and_link(nodes), msg=text
+            )
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,156 @@
+import io
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from block_cache import BlockCache
+from block_markdown import BlockError, iter_blocks, iter_line_blocks
+from build import generate_pages_parallel
+from file_operations import generate_pages_recursive, render_page_file, stream_page, stream_page_file
+from page_template import CompiledTemplate
+
+TEMPLATE = '<title>{{ Title }}</title><a href="/">home</a>{{ Content }}<footer>{{ Title }}</footer>'
+
+DOCUMENT = """Intro before the title
+
+# The Title
+
+A paragraph with **bold**, a [link](/docs/) and ![img](/images/a.png).
+
+```
+def f():
+
+    return "ünïcode"
+```
+
+- one
+- two
+
+1. first
+2. second
+
+> quoted
+> text
+"""
+
+
+class TestIterLineBlocks(unittest.TestCase):
+    def test_matches_iter_blocks(self):
+        rng = random.Random(18)
+        pieces = ["text", "# h", "```", "```x```", "  ```", "\n", "\n\n", "\n\n\n", " ", "ü", "- item"]
+        for _ in range(2000):
+            md = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 25)))
+            self.assertEqual(list(iter_line_blocks(io.StringIO(md, newline=""))), list(iter_blocks(md)), md)
+
+    def test_document(self):
+        self.assertEqual(list(iter_line_blocks(io.StringIO(DOCUMENT))), list(iter_blocks(DOCUMENT)))
+
+
+class TestStreamPageFile(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.src = self._path("page.md", DOCUMENT)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _path(self, name, text=None):
+        path = os.path.join(self._tmp.name, name)
+        if text is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return path
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_output_matches_stream_page(self):
+        for basepath in ("/", "/base/"):
+            template = CompiledTemplate(TEMPLATE, basepath)
+            expected, streamed = self._path("expected.html"), self._path("streamed.html")
+            expected_hash = stream_page(DOCUMENT, template, expected)
+            self.assertEqual(stream_page_file(self.src, template, streamed), expected_hash)
+            self.assertEqual(self._read(streamed), self._read(expected))
+
+    def test_cached_output_matches(self):
+        template = CompiledTemplate(TEMPLATE)
+        cache = BlockCache()
+        expected = stream_page(DOCUMENT, template, self._path("expected.html"))
+        self.assertEqual(stream_page_file(self.src, template, self._path("a.html"), cache), expected)
+        self.assertEqual(stream_page_file(self.src, template, self._path("b.html"), cache), expected)
+        self.assertGreater(cache.hits, 0)
+
+    def test_threshold_selects_the_same_output(self):
+        template = CompiledTemplate(TEMPLATE)
+        hashes = {
+            render_page_file(self.src, template, self._path(f"{threshold}.html"), stream_threshold=threshold)
+            for threshold in (0, None, len(DOCUMENT) * 2)
+        }
+        self.assertEqual(len(hashes), 1)
+
+    def test_error_names_block_lines(self):
+        src = self._path("bad.md", "# Title\n\nok\n\n\nbad _italic\nline")
+        dest = self._path("bad.html")
+        with self.assertRaises(BlockError) as ctx:
+            stream_page_file(src, CompiledTemplate(TEMPLATE), dest)
+        self.assertTrue(str(ctx.exception).endswith("(lines 6-7)"))
+        self.assertFalse(os.path.exists(dest))
+
+    def _peak_memory(self, blocks):
+        block = "A paragraph of **bold** and _italic_ words with a [link](/x).\n" * 5
+        src = self._path("big.md", "# Big\n\n" + "\n\n".join(block for _ in range(blocks)))
+        template = CompiledTemplate(TEMPLATE)
+        tracemalloc.start()
+        try:
+            stream_page_file(src, template, self._path("big.html"))
+            return tracemalloc.get_traced_memory()[1], os.path.getsize(src)
+        finally:
+            tracemalloc.stop()
+
+    def test_memory_does_not_grow_with_the_document(self):
+        small_peak, _ = self._peak_memory(100)
+        large_peak, large_size = self._peak_memory(1500)
+        self.assertLess(large_peak, small_peak * 2)
+        self.assertLess(large_peak, large_size // 2)
+
+
+class TestStreamedBuilds(unittest.TestCase):
+    def test_builds_match_unstreamed(self):
+        with tempfile.TemporaryDirectory() as root:
+            content = os.path.join(root, "content")
+            for i in range(4):
+                os.makedirs(os.path.join(content, f"p{i}"))
+                with open(os.path.join(content, f"p{i}", "index.md"), "w", encoding="utf-8") as f:
+                    f.write(DOCUMENT.replace("The Title", f"Page {i}"))
+            template = os.path.join(root, "template.html")
+            with open(template, "w", encoding="utf-8") as f:
+                f.write(TEMPLATE)
+
+            with redirect_stdout(StringIO()):
+                expected = generate_pages_parallel(
+                    content, template, os.path.join(root, "whole"), jobs=1, stream_threshold=None
+                )
+                generate_pages_recursive(content, template, os.path.join(root, "serial"), stream_threshold=0)
+                for jobs in (1, 2):
+                    for pipeline in (False, True):
+                        hashes = generate_pages_parallel(
+                            content, template, os.path.join(root, f"out{jobs}{pipeline}"),
+                            jobs=jobs, pipeline=pipeline, stream_threshold=0,
+                        )
+                        self.assertEqual(hashes, expected)
+            for i in range(4):
+                rel = os.path.join(f"p{i}", "index.html")
+                outputs = []
+                for build in ("whole", "serial"):
+                    with open(os.path.join(root, build, rel), "rb") as f:
+                        outputs.append(f.read())
+                self.assertEqual(outputs[0], outputs[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
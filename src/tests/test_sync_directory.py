@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from discovery import Discovery
+from file_operations import copy_directory, sync_directory
+
+
+class TestSyncDirectory(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self._tmp.name, "static")
+        self.dst = os.path.join(self._tmp.name, "docs")
+        self._write(os.path.join(self.src, "index.css"), "body {}")
+        self._write(os.path.join(self.src, "images", "tom.png"), "png-bytes")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _sync(self, **kwargs):
+        with redirect_stdout(StringIO()):
+            return sync_directory(self.src, self.dst, **kwargs)
+
+    def test_first_sync_copies_everything(self):
+        result = self._sync()
+        self.assertEqual(len(result.copied), 2)
+        self.assertEqual(self._read(os.path.join(self.dst, "images", "tom.png")), "png-bytes")
+        src_stat = os.stat(os.path.join(self.src, "index.css"))
+        dst_stat = os.stat(os.path.join(self.dst, "index.css"))
+        self.assertEqual(src_stat.st_mtime_ns, dst_stat.st_mtime_ns)
+
+    def test_second_sync_copies_nothing(self):
+        self._sync()
+        result = self._sync()
+        self.assertEqual(result.copied, [])
+        self.assertEqual(len(result.unchanged), 2)
+
+    def test_changed_file_is_copied(self):
+        self._sync()
+        css = os.path.join(self.src, "index.css")
+        self._write(css, "body { color: red }")
+        result = self._sync()
+        self.assertEqual(result.copied, [os.path.join(self.dst, "index.css")])
+        self.assertEqual(self._read(os.path.join(self.dst, "index.css")), "body { color: red }")
+
+    def test_hash_mode_ignores_touched_files(self):
+        self._sync()
+        css = os.path.join(self.src, "index.css")
+        stat = os.stat(css)
+        os.utime(css, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(self._sync(compare="hash").copied, [])
+        self.assertEqual(self._sync(compare="mtime").copied, [os.path.join(self.dst, "index.css")])
+
+    def test_orphans_removed_but_generated_html_kept(self):
+        self._sync()
+        self._write(os.path.join(self.dst, "blog", "index.html"), "<html></html>")
+        os.remove(os.path.join(self.src, "images", "tom.png"))
+        result = self._sync()
+        self.assertEqual(result.removed, [os.path.join(self.dst, "images", "tom.png")])
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "blog", "index.html")))
+
+    def test_link_mode_hardlinks(self):
+        self._sync(link=True)
+        src_stat = os.stat(os.path.join(self.src, "index.css"))
+        dst_stat = os.stat(os.path.join(self.dst, "index.css"))
+        self.assertEqual(src_stat.st_ino, dst_stat.st_ino)
+
+    def test_ignored_assets_are_not_synced(self):
+        self._write(os.path.join(self.src, "images", ".DS_Store"), "junk")
+        result = self._sync(discovery=Discovery(ignore=[".DS_Store"]))
+        self.assertEqual(len(result.copied), 2)
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "images", ".DS_Store")))
+
+    def test_copy_directory_uses_discovery(self):
+        self._write(os.path.join(self.src, "images", "raw", "tom.psd"), "psd")
+        with redirect_stdout(StringIO()):
+            copy_directory(self.src, self.dst, discovery=Discovery(ignore=["raw"]))
+        self.assertEqual(self._read(os.path.join(self.dst, "images", "tom.png")), "png-bytes")
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "images", "raw")))
+
+    def test_unknown_compare_mode(self):
+        with self.assertRaises(ValueError):
+            sync_directory(self.src, self.dst, compare="size")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 from textnode import TextNode, TextType
 from text_to_textnodes import text_to_textnodes  # or wherever you put it
@@ -94,5 +95,38 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertListEqual(nodes, expected)
 
+
+class TestSinglePassMatchesLegacy(unittest.TestCase):
+    FRAGMENTS = [
+        "a", "b ", " ", "*", "**", "_", "`", "!", "[", "]", "(", ")",
+        "![a](u)", "[l](v)", "![](x_y.png)", "[a*b](c)", "![",
+    ]
+
+    def _parse(self, text, legacy):
+        try:
+            return text_to_textnodes(text, legacy=legacy), None
+        except ValueError as e:
+            return None, str(e)
+
+    def test_random_inputs_match_legacy(self):
+        rng = random.Random(1234)
+        for _ in range(5000):
+            text = "".join(rng.choice(self.FRAGMENTS) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(self._parse(text, False), self._parse(text, True), msg=repr(text))
+
+    def test_delimiters_inside_bold_are_literal(self):
+        text = "**a_b `c` [d](e)** f"
+        self.assertListEqual(text_to_textnodes(text), text_to_textnodes(text, legacy=True))
+        self.assertEqual(text_to_textnodes(text)[0], TextNode("a_b `c` [d](e)", TextType.BOLD))
+
+    def test_unclosed_delimiter_error_matches_legacy(self):
+        text = "**bold** then *unclosed"
+        with self.assertRaises(ValueError) as fast:
+            text_to_textnodes(text)
+        with self.assertRaises(ValueError) as legacy:
+            text_to_textnodes(text, legacy=True)
+        self.assertEqual(str(fast.exception), str(legacy.exception))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
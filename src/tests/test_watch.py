@@ -0,0 +1,182 @@
+import os
+import tempfile
+import unittest
+import urllib.request
+from contextlib import redirect_stdout
+from io import StringIO
+
+from build import generate_pages_incremental
+from catalog import PageCatalog
+from discovery import Discovery
+from file_operations import generate_pages_recursive
+from search_index import SearchIndex
+from watch import SiteWatcher, diff_snapshots, snapshot_tree, start_server
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+class TestDiffSnapshots(unittest.TestCase):
+    def test_changed_and_deleted(self):
+        old = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+        new = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+        self.assertEqual(diff_snapshots(old, new), (["b", "d"], ["c"]))
+
+
+class TestSnapshotTree(unittest.TestCase):
+    def test_uses_the_discovery_rules(self):
+        with tempfile.TemporaryDirectory() as root:
+            for rel_path in ("index.md", os.path.join("node_modules", "x", "a.js")):
+                os.makedirs(os.path.dirname(os.path.join(root, "site", rel_path)), exist_ok=True)
+                with open(os.path.join(root, "site", rel_path), "w", encoding="utf-8") as f:
+                    f.write("x")
+            os.makedirs(os.path.join(root, "shared"))
+            with open(os.path.join(root, "shared", "b.md"), "w", encoding="utf-8") as f:
+                f.write("b")
+            os.symlink(os.path.join(root, "shared"), os.path.join(root, "site", "linked"))
+            site = os.path.join(root, "site")
+
+            snap = snapshot_tree(site, Discovery(ignore=["node_modules"]))
+            self.assertEqual(
+                sorted(snap), [os.path.join(site, "index.md"), os.path.join(site, "linked", "b.md")]
+            )
+            self.assertEqual(snap[os.path.join(site, "index.md")][1], 1)
+            snap = snapshot_tree(site, Discovery(ignore=["node_modules"], symlinks="skip"))
+            self.assertEqual(sorted(snap), [os.path.join(site, "index.md")])
+            self.assertEqual(snapshot_tree(os.path.join(root, "missing")), {})
+
+
+class TestSiteWatcher(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = self._tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.dest = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        self._write(self.template, TEMPLATE)
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self._write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nBody")
+        self._write(os.path.join(self.static, "index.css"), "body {}")
+        os.makedirs(self.dest)
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, self.dest)
+        self.watcher = SiteWatcher(self.content, self.static, self.template, self.dest)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_no_changes(self):
+        self.assertIsNone(self.watcher.poll())
+
+    def test_page_edit_rebuilds_only_that_page(self):
+        self._write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nEdited body")
+        result = self.watcher.poll()
+        self.assertEqual(result.pages, [os.path.join(self.dest, "blog", "post.html")])
+        self.assertIn("Edited body", self._read(os.path.join(self.dest, "blog", "post.html")))
+        self.assertIsNone(self.watcher.poll())
+
+    def test_new_page_is_rendered(self):
+        self._write(os.path.join(self.content, "about.md"), "# About\n\nUs")
+        result = self.watcher.poll()
+        self.assertEqual(result.pages, [os.path.join(self.dest, "about.html")])
+
+    def test_template_edit_rebuilds_every_page(self):
+        self._write(self.template, "<main>{{ Title }}|{{ Content }}</main>")
+        result = self.watcher.poll()
+        self.assertEqual(len(result.pages), 2)
+        self.assertTrue(self._read(os.path.join(self.dest, "index.html")).startswith("<main>Home|"))
+
+    def test_deleted_page_removes_output(self):
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        result = self.watcher.poll()
+        self.assertEqual(result.removed, [os.path.join(self.dest, "blog", "post.html")])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "post.html")))
+
+    def test_asset_edit_is_copied(self):
+        self._write(os.path.join(self.static, "index.css"), "body { color: red }")
+        result = self.watcher.poll()
+        self.assertEqual(result.assets, [os.path.join(self.dest, "index.css")])
+        self.assertEqual(result.pages, [])
+        self.assertEqual(self._read(os.path.join(self.dest, "index.css")), "body { color: red }")
+
+    def test_front_matter_template_edit_rebuilds_its_pages(self):
+        post = os.path.join(self.content, "blog", "post.md")
+        post_template = os.path.join(self._tmp.name, "post.html")
+        self._write(post_template, "<article>{{ Content }}</article>")
+        self._write(post, "---\ntemplate: post.html\n---\n# Post\n\nBody")
+        watcher = SiteWatcher(self.content, self.static, self.template, self.dest)
+        output = os.path.join(self.dest, "blog", "post.html")
+        # Each edit is picked up, not just the first one after the template was loaded.
+        for markup in ("main", "section"):
+            self._write(post_template, f"<{markup}>{{{{ Content }}}}</{markup}>")
+            result = watcher.poll()
+            self.assertEqual(result.pages, [output])
+            self.assertTrue(self._read(output).startswith(f"<{markup}>"))
+
+    def test_template_named_while_watching_is_watched(self):
+        post_template = os.path.join(self._tmp.name, "post.html")
+        self._write(post_template, "<article>{{ Content }}</article>")
+        self._write(os.path.join(self.content, "index.md"), "---\ntemplate: post.html\n---\n# Home")
+        self.watcher.poll()
+        self.assertIsNone(self.watcher.poll())
+        self._write(post_template, "<main>{{ Content }}</main>")
+        result = self.watcher.poll()
+        self.assertEqual(result.pages, [os.path.join(self.dest, "index.html")])
+        self.assertTrue(self._read(os.path.join(self.dest, "index.html")).startswith("<main>"))
+
+    def test_render_error_is_reported(self):
+        self._write(os.path.join(self.content, "index.md"), "No title here")
+        result = self.watcher.poll()
+        self.assertEqual(result.pages, [])
+        self.assertEqual(result.errors[0][0], os.path.join(self.content, "index.md"))
+
+    def test_rebuilds_are_recorded_for_the_next_build(self):
+        manifest = os.path.join(self._tmp.name, "manifest.json")
+        search, catalog = SearchIndex(), PageCatalog()
+        with redirect_stdout(StringIO()):
+            generate_pages_incremental(
+                self.content, self.template, self.dest, manifest_path=manifest, search=search, catalog=catalog
+            )
+        watcher = SiteWatcher(
+            self.content, self.static, self.template, self.dest, manifest_path=manifest,
+            search=search, catalog=catalog, site_url="https://example.com",
+        )
+        self._write(os.path.join(self.content, "blog", "post.md"), "# Edited Post\n\nNew words")
+        os.remove(os.path.join(self.content, "index.md"))
+        with redirect_stdout(StringIO()):
+            watcher.poll()
+        self.assertIn("Edited Post", self._read(os.path.join(self.dest, "blog", "feed.xml")))
+        self.assertIn("words", self._read(os.path.join(self.dest, "search", "w.json")))
+        self.assertEqual(list(catalog.pages), [os.path.join(self.dest, "blog", "post.html")])
+
+        # The next incremental build finds nothing left to do.
+        search, catalog = SearchIndex.load(self.dest), PageCatalog()
+        with redirect_stdout(StringIO()):
+            result = generate_pages_incremental(
+                self.content, self.template, self.dest, manifest_path=manifest, search=search, catalog=catalog
+            )
+        self.assertEqual((result.rendered, result.removed), ([], []))
+        self.assertEqual(catalog.pages[os.path.join(self.dest, "blog", "post.html")].title, "Edited Post")
+
+    def test_server_serves_rebuilt_page(self):
+        server = start_server(self.dest, 0, "127.0.0.1")
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nServed fresh")
+        self.watcher.poll()
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+        with urllib.request.urlopen(url) as response:
+            self.assertIn(b"Served fresh", response.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,6 +23,10 @@ class TextNode:
         url: Optional URL for LINK and IMAGE nodes.
     """
 
+    # Builds create huge numbers of short-lived nodes; slots drop the
+    # per-instance __dict__.
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text: str, text_type: TextType, url: str | None = None) -> None:
         self.text = text
         self.text_type = text_type
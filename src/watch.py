@@ -0,0 +1,335 @@
+"""Watch mode: poll sources, rebuild only what changed, and serve ``docs/``.
+
+Given the manifest of the build that came before, rebuilt pages are
+recorded in it as in an incremental build, together with the block cache,
+link index, search index and catalog, and the search index and collection
+outputs are written again after each rebuild. The next ``--incremental``
+build then starts from what watch mode left.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+
+from build import BuildError, find_pages, rerender_pages
+from catalog import DEFAULT_COLLECTION
+from discovery import DEFAULT_DISCOVERY, Discovery, page_destination
+from file_operations import render_page_file, sync_file
+from front_matter import published_pages, read_front_matter
+from manifest import BuildManifest
+from page_template import CompiledTemplate
+
+if TYPE_CHECKING:
+    from block_cache import BlockCache
+    from catalog import PageCatalog
+    from links import LinkIndex
+    from search_index import SearchIndex
+
+# path -> (mtime_ns, size)
+Snapshot = dict[str, tuple[int, int]]
+
+
+def snapshot_tree(root: str, discovery: Discovery = DEFAULT_DISCOVERY) -> Snapshot:
+    """Return the modification time and size of every file under *root*.
+
+    The walk is :meth:`Discovery.scan`'s, so ignored trees are never entered
+    and symlinks are handled as in a build. A missing *root* has no files.
+    """
+    try:
+        scan = discovery.scan(root, stats=True)
+    except FileNotFoundError:
+        return {}
+    return {os.path.join(root, rel_path): stat for rel_path, stat in scan.stats.items()}
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> tuple[list[str], list[str]]:
+    """Return ``(changed, deleted)`` paths between two snapshots, sorted."""
+    changed = sorted(path for path, sig in new.items() if old.get(path) != sig)
+    deleted = sorted(path for path in old if path not in new)
+    return changed, deleted
+
+
+class RebuildResult:
+    """What a single :meth:`SiteWatcher.poll` rebuilt.
+
+    Attributes:
+        pages: Output pages that were rendered.
+        assets: Static assets that were copied.
+        removed: Outputs deleted because their source disappeared or
+            became a draft.
+        errors: ``(source_path, message)`` for pages that failed to render.
+        seconds: Time spent rebuilding.
+        latency: Seconds from the newest source modification to the end of
+            the rebuild, i.e. edit-to-served latency.
+    """
+
+    def __init__(self) -> None:
+        self.pages: list[str] = []
+        self.assets: list[str] = []
+        self.removed: list[str] = []
+        self.errors: list[tuple[str, str]] = []
+        self.seconds = 0.0
+        self.latency = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"RebuildResult(pages={len(self.pages)}, assets={len(self.assets)}, "
+            f"removed={len(self.removed)}, errors={len(self.errors)})"
+        )
+
+
+class SiteWatcher:
+    """Detect source changes and rebuild only the affected outputs.
+
+    A page edit re-renders that page, an asset edit re-copies that asset,
+    and a template edit re-renders every page. An edit to a template named
+    in front matter re-renders the pages naming it. Deleted sources, and
+    pages edited into drafts, have their outputs removed.
+
+    Args:
+        content_dir: Root directory of markdown sources.
+        static_dir: Root directory of static assets.
+        template_path: Path to the HTML template.
+        dest_dir: Output directory.
+        basepath: URL base path prefix.
+        discovery: Ignore patterns and symlink policy, applied by the same
+            walk as a build; ignored trees are not watched at all.
+        drafts: Also render pages whose front matter marks them as drafts.
+        manifest_path: Manifest of the build of *dest_dir*. Without one,
+            pages are rendered on their own and nothing else is updated.
+        cache: Optional block cache, saved after each rebuild.
+        links: Optional link index covering every page.
+        search: Optional search index covering every page, written to
+            *dest_dir* after each rebuild.
+        catalog: Optional site catalog covering every page, written to
+            *dest_dir* with *site_url* and *collection* after each rebuild.
+        site_url: Scheme and host the site is served from, for the catalog.
+        collection: Directory of the collection, for the catalog.
+    """
+
+    def __init__(
+        self,
+        content_dir: str,
+        static_dir: str,
+        template_path: str,
+        dest_dir: str,
+        basepath: str = "/",
+        discovery: Discovery | None = None,
+        drafts: bool = False,
+        manifest_path: str | None = None,
+        cache: BlockCache | None = None,
+        links: LinkIndex | None = None,
+        search: SearchIndex | None = None,
+        catalog: PageCatalog | None = None,
+        site_url: str = "",
+        collection: str = DEFAULT_COLLECTION,
+    ) -> None:
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.discovery = discovery or DEFAULT_DISCOVERY
+        self.drafts = drafts
+        self.manifest = BuildManifest.load(manifest_path) if manifest_path is not None else None
+        self.cache = cache
+        self.links = links
+        self.search = search
+        self.catalog = catalog
+        self.site_url = site_url
+        self.collection = collection
+        self.template = CompiledTemplate.load(template_path, basepath)
+        # Page source -> the template its front matter names, for pages naming one.
+        self._page_templates: dict[str, str] = {}
+        self._note_templates(find_pages(content_dir, dest_dir, self.discovery))
+        self._snapshot = self.snapshot()
+
+    def snapshot(self) -> Snapshot:
+        snap = snapshot_tree(self.content_dir, self.discovery)
+        snap.update(snapshot_tree(self.static_dir, self.discovery))
+        self._stat_into(snap, [self.template_path, *self._override_paths()])
+        return snap
+
+    def _override_paths(self) -> set[str]:
+        """Return the paths of the templates named in front matter."""
+        return {self.template.override_path(name) for name in self._page_templates.values()}
+
+    def _note_templates(self, pages: list[tuple[str, str]]) -> None:
+        """Record which template each of *pages* names, reading their headers only."""
+        for src_path, _ in pages:
+            try:
+                name = read_front_matter(src_path).template
+            except (OSError, ValueError):
+                name = None
+            if name:
+                self._page_templates[src_path] = name
+            else:
+                self._page_templates.pop(src_path, None)
+
+    @staticmethod
+    def _stat_into(snap: Snapshot, paths: list[str]) -> None:
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snap[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self) -> RebuildResult | None:
+        """Rebuild whatever changed since the last poll; None if nothing did."""
+        new = self.snapshot()
+        changed, deleted = diff_snapshots(self._snapshot, new)
+        self._snapshot = new
+        if not changed and not deleted:
+            return None
+        newest_edit = max((new[path][0] for path in changed), default=time.time_ns())
+        result = self.rebuild(changed, deleted, newest_edit)
+        # Templates first named by the pages just rebuilt are watched from now on.
+        unwatched = [path for path in self._override_paths() if path not in self._snapshot]
+        self._stat_into(self._snapshot, unwatched)
+        return result
+
+    def rebuild(
+        self, changed: list[str], deleted: list[str], newest_edit_ns: int | None = None
+    ) -> RebuildResult:
+        """Rebuild the outputs affected by *changed* and *deleted* source paths."""
+        start = time.perf_counter()
+        result = RebuildResult()
+        pages: list[tuple[str, str]] = []
+
+        if self.template_path in changed:
+            self.template = CompiledTemplate.load(self.template_path, self.basepath)
+            pages = find_pages(self.content_dir, self.dest_dir, self.discovery)
+        else:
+            for path in changed:
+                if self._under(path, self.content_dir) and path.endswith(".md"):
+                    pages.append((path, page_destination(path, self.content_dir, self.dest_dir)))
+            edited = set(changed).union(deleted) & self._override_paths()
+            if edited:
+                self.template.clear_overrides()
+                for src_path, name in sorted(self._page_templates.items()):
+                    if (
+                        self.template.override_path(name) in edited
+                        and src_path not in changed
+                        and src_path not in deleted
+                    ):
+                        pages.append((src_path, page_destination(src_path, self.content_dir, self.dest_dir)))
+        self._note_templates(pages)
+
+        if not self.drafts:
+            published = set(published_pages(pages))
+            for src_path, dest_path in pages:
+                if (src_path, dest_path) not in published:
+                    self._forget(src_path, dest_path)
+                    if os.path.isfile(dest_path):
+                        os.remove(dest_path)
+                        result.removed.append(dest_path)
+            pages = [page for page in pages if page in published]
+
+        for path in changed:
+            if self._under(path, self.static_dir):
+                dst_path = os.path.join(self.dest_dir, os.path.relpath(path, self.static_dir))
+                sync_file(path, dst_path)
+                result.assets.append(dst_path)
+
+        if self.manifest is not None:
+            self._render_recorded(pages, result)
+        else:
+            for src_path, dest_path in pages:
+                try:
+                    render_page_file(src_path, self.template, dest_path)
+                except Exception as e:
+                    result.errors.append((src_path, f"{type(e).__name__}: {e}"))
+                    continue
+                result.pages.append(dest_path)
+
+        pages_deleted = False
+        for path in deleted:
+            if self._under(path, self.content_dir) and path.endswith(".md"):
+                self._page_templates.pop(path, None)
+                output = page_destination(path, self.content_dir, self.dest_dir)
+                self._forget(path, output)
+                pages_deleted = True
+            elif self._under(path, self.static_dir):
+                output = os.path.join(self.dest_dir, os.path.relpath(path, self.static_dir))
+            else:
+                continue
+            if os.path.isfile(output):
+                os.remove(output)
+                result.removed.append(output)
+
+        if self.manifest is not None and (pages or pages_deleted or result.removed):
+            self._write_outputs()
+        result.seconds = time.perf_counter() - start
+        if newest_edit_ns is not None:
+            result.latency = max(0.0, time.time() - newest_edit_ns / 1e9)
+        return result
+
+    def _render_recorded(self, pages: list[tuple[str, str]], result: RebuildResult) -> None:
+        """Render *pages* through :func:`build.rerender_pages`, recording them in the manifest."""
+        try:
+            rerender_pages(
+                pages, self.manifest, self.template, self.content_dir, self.dest_dir, self.basepath,
+                self.cache, self.links, self.search, self.catalog,
+            )
+        except BuildError as e:
+            result.errors.extend(e.failures)
+        failed = {src_path for src_path, _ in result.errors}
+        result.pages.extend(dest_path for src_path, dest_path in pages if src_path not in failed)
+
+    def _forget(self, src_path: str, dest_path: str) -> None:
+        """Drop a page that is no longer built from the manifest, indexes and catalog."""
+        if self.manifest is None:
+            return
+        self.manifest.pages.pop(os.path.relpath(src_path, self.content_dir), None)
+        for collector in (self.links, self.search, self.catalog):
+            if collector is not None:
+                collector.pages.pop(dest_path, None)
+
+    def _write_outputs(self) -> None:
+        """Save the manifest and block cache, and write the search index and catalog outputs."""
+        self.manifest.save()
+        if self.cache is not None:
+            self.cache.save()
+        if self.search is not None:
+            self.search.write(self.dest_dir, self.basepath)
+        if self.catalog is not None:
+            self.catalog.write(self.dest_dir, self.template, self.site_url, self.collection)
+
+    @staticmethod
+    def _under(path: str, root: str) -> bool:
+        return os.path.commonpath([os.path.abspath(path), os.path.abspath(root)]) == os.path.abspath(root)
+
+    def run(self, interval: float = 0.1, stop: threading.Event | None = None) -> None:
+        """Poll every *interval* seconds until *stop* is set, reporting each rebuild."""
+        stop = stop or threading.Event()
+        while not stop.wait(interval):
+            result = self.poll()
+            if result is None:
+                continue
+            for src_path, message in result.errors:
+                print(f"Error rendering {src_path}: {message}")
+            print(
+                f"Rebuilt {len(result.pages)} page(s), {len(result.assets)} asset(s), "
+                f"removed {len(result.removed)} in {result.seconds * 1e3:.1f} ms "
+                f"(edit-to-served {result.latency * 1e3:.0f} ms)"
+            )
+
+
+def start_server(directory: str, port: int = 8888, host: str = "") -> ThreadingHTTPServer:
+    """Serve *directory* over HTTP from a daemon thread and return the server."""
+    handler = functools.partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: object) -> None:
+        pass